@@ -1,59 +1,336 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, TimeoutError
+
 from flask import Flask, request, jsonify
-from flask_cors import CORS 
+from flask_cors import CORS
 from linear_programing_solver import LinearProgrammingSolver
 from goal_programing import PreemptiveGoalProgramming
+from request_schema import (INTEGER_RESTRICTIONS, GoalRequest, SchemaError, parse_pareto_request, parse_request,
+                            parse_stochastic_request)
+from response_encoding import encode_response
+
+# Serving limits, overridable from the environment (see gunicorn.conf.py)
+MAX_REQUEST_BYTES = int(os.environ.get('LP_MAX_REQUEST_BYTES', 10 * 1024 * 1024))
+SOLVE_TIMEOUT = float(os.environ.get('LP_SOLVE_TIMEOUT', 30))
+SOLVE_WORKERS = int(os.environ.get('LP_SOLVE_WORKERS', 0))
+SOLVE_EXECUTOR = os.environ.get('LP_SOLVE_EXECUTOR', 'process')
+RESULT_CACHE_SIZE = int(os.environ.get('LP_RESULT_CACHE_SIZE', 32))
+WARM_UP = os.environ.get('LP_WARM_UP', '0') == '1'
+# With LP_TRACE_DIR set, plain LP solves taking at least LP_TRACE_MIN_MS are saved there for trace_replay.py
+TRACE_DIR = os.environ.get('LP_TRACE_DIR')
+TRACE_MIN_MS = float(os.environ.get('LP_TRACE_MIN_MS', 0))
+
 
-import numpy as np
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "level": record.levelname, "message": record.getMessage()}
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry)
+
+
+logger = logging.getLogger('lp_backend')
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonLogFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(os.environ.get('LP_LOG_LEVEL', 'INFO'))
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
 CORS(app)
 
+# CPU-bound solves run in a process pool so a slow model can be timed out without blocking the
+# serving thread; with LP_SOLVE_WORKERS=0 (the default for the dev server) they run inline.
+# Solvers keep no state between calls, so LP_SOLVE_EXECUTOR=thread runs them on a thread pool
+# instead (NumPy releases the GIL while pivoting); a timed-out solve then keeps its thread busy.
+# A process pool whose solve times out is killed and replaced, so a runaway solve cannot hold
+# the pool's processes. The pool is created on first use, so an app preloaded by gunicorn forks
+# before any pool exists.
+executor = None
+executor_lock = threading.Lock()
 
-@app.route('/solve', methods=['GET','POST'])
-def solve():
-    data = request.json
-    if data['method']=='goal':
-            goal_coeffs = np.array(data['goals_coeffs'])
-            goal_values = data['goals_values']
-            constraint_coeffs = data['constraints_coeffs']
-            constraint_values = data['constraints_values']
-            goal_directions = data['goals_directions']
-            unrestricted_vars = []
-            for val in data['goals_coeffs'][0]:
-                unrestricted_vars.append(0)
+
+def solve_executor():
+    global executor
+    if SOLVE_WORKERS <= 0:
+        return None
+    with executor_lock:
+        if executor is None:
+            if SOLVE_EXECUTOR == 'thread':
+                from concurrent.futures import ThreadPoolExecutor as pool_class
+            else:
+                from concurrent.futures import ProcessPoolExecutor as pool_class
+            executor = pool_class(max_workers=SOLVE_WORKERS)
+        return executor
+
+
+def recycle_executor(stale):
+    """Kill the processes of a process pool whose solve timed out; the next solve_executor() starts a new pool."""
+    global executor
+    with executor_lock:
+        if executor is stale:
+            executor = None
+    # Solves still running in the stale pool fail with BrokenProcessPool and are retried by run_solve
+    for process in list((getattr(stale, '_processes', None) or {}).values()):
+        process.terminate()
+    stale.shutdown(wait=False, cancel_futures=True)
+
+
+# Recent results keyed by request body, so paging through the steps of one model does not re-solve it
+result_cache = OrderedDict()
+result_cache_lock = threading.Lock()
+
+
+def cached_result(key):
+    with result_cache_lock:
+        if key not in result_cache:
+            return None
+        result_cache.move_to_end(key)
+        return result_cache[key]
+
+
+def store_result(key, solution):
+    with result_cache_lock:
+        result_cache[key] = solution
+        while len(result_cache) > RESULT_CACHE_SIZE:
+            result_cache.popitem(last=False)
+
+
+def solve_request(model):
+    if isinstance(model, GoalRequest):
             solver = PreemptiveGoalProgramming(
-                goal_coeffs, goal_values, constraint_coeffs, constraint_values,
-                unrestricted_vars, goal_directions
+                model.goals_coeffs, model.goals_values, model.constraints_coeffs, model.constraints_values,
+                model.unrestricted_vars, model.goals_directions, dtype=model.dtype
             )
-            solver.create_initial_tableau()
-            solver.setup_goal_objective_functions()
-            solver.handle_unrestricted_variables()
-            solver.setup_variable_names()
-            solution = solver.solve()
-            k = {"optimal_solution": solution.tolist(), 
-                "steps":solver.tableau_steps
-            }
-            return jsonify(k)
+            return solver.solve()
     else:
-        if ">=" in data['constraint_types']:
-            method = data['method']
-        elif "=" in data['constraint_types']:
-            method = data['method']
+        if ">=" in model.constraint_types:
+            method = model.method
+        elif "=" in model.constraint_types:
+            method = model.method
         else:
             method = 'simplex'
-        print(request.json)
-        objective = data['objective'] 
-        constraints = data['constraints']
-        rhs = data['rhs']
-        constraint_types = data['constraint_types']
-        var_restrictions = data['var_restrictions']
-        type = data['optimization']
-        
-        solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions, method=method, type=type)
-        solution = solver.solve()
-        return jsonify(solution)
+
+        # Branch-and-bound, racing, decomposition and IIS pull in multiprocessing, so they are imported on first use
+        if any(res in INTEGER_RESTRICTIONS for res in model.var_restrictions):
+            from branch_and_bound import BranchAndBoundSolver
+            solver = BranchAndBoundSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                          model.var_restrictions, method=model.method, type=model.optimization,
+                                          node_selection=model.node_selection, node_limit=model.node_limit,
+                                          workers=model.workers)
+            return solver.solve()
+
+        if model.method == 'auto-race':
+            from concurrent_optimizer import race_solve
+            result = race_solve(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                model.var_restrictions, type=model.optimization, timeout=SOLVE_TIMEOUT)
+            # A race whose processes all hung or died is answered like any other timed-out solve (504)
+            return None if result.get('error') == "Solve timed out" else result
+
+        if model.method == 'decomposition':
+            from decomposition import DecompositionSolver
+            solver = DecompositionSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                         model.var_restrictions, type=model.optimization, workers=model.workers)
+            return solver.solve()
+
+        solver = LinearProgrammingSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                         model.var_restrictions, method=method, type=model.optimization,
+                                         out_of_core=model.out_of_core, precision=model.precision,
+                                         dtype=model.dtype, trace=TRACE_DIR is not None)
+        result = solver.solve()
+        if model.iis and result.get('error') == "Infeasible solution":
+            from infeasibility import find_iis
+            result['iis'] = find_iis(model.constraints, model.rhs, model.constraint_types,
+                                     model.var_restrictions)['rows']
+        return result
+
+
+def pareto_request(model):
+    # Imported on first use like decomposition, since it starts its own process pool
+    from pareto_front import ParetoFront
+    return ParetoFront(model.objectives, model.constraints, model.rhs, model.constraint_types, model.var_restrictions,
+                       type=model.optimization, method=model.method, points=model.points,
+                       workers=model.workers).solve()
+
+
+def stochastic_request(model):
+    from stochastic import StochasticSolver
+    return StochasticSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                            model.var_restrictions, model.first_stage, model.rhs_deltas,
+                            cost_deltas=model.cost_deltas, probabilities=model.probabilities,
+                            type=model.optimization, method=model.method, workers=model.workers).solve()
+
+
+def run_solve(function, model, method, retry=True):
+    """Run function(model) inline or on the solve pool; returns None when it timed out."""
+    executor = solve_executor()
+    if executor is None:
+        return function(model)
+    try:
+        future = executor.submit(function, model)
+        return future.result(timeout=SOLVE_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        if SOLVE_EXECUTOR != 'thread':
+            recycle_executor(executor)
+        logger.warning("solve timed out", extra={"fields": {"method": method, "timeout_s": SOLVE_TIMEOUT}})
+        return None
+    except BrokenExecutor:
+        # The pool was recycled after another request's timeout; run this solve once more on the new pool
+        recycle_executor(executor)
+        if not retry:
+            raise
+        return run_solve(function, model, method, retry=False)
+
+
+def save_trace(key, trace):
+    from solve_trace import write_trace
+    path = os.path.join(TRACE_DIR, f"{key[:16]}.lptrace.npz")
+    try:
+        write_trace(path, request.get_data(), trace)
+    except OSError as error:
+        logger.warning("trace not saved", extra={"fields": {"path": path, "error": str(error)}})
+        return
+    logger.info("trace saved", extra={"fields": {"path": path, "pivots": len(trace['pivots'])}})
+
+
+@app.route('/solve', methods=['GET','POST'])
+def solve():
+    try:
+        model = parse_request(request.get_json(silent=True))
+    except SchemaError as error:
+        return jsonify({"solution": None, "optimal_value": None, "error": str(error), "steps": []}), 400
+    method = 'goal' if isinstance(model, GoalRequest) else model.method
+    start = time.perf_counter()
+    key = hashlib.sha256(request.get_data()).hexdigest()
+    solution = cached_result(key)
+    if solution is not None:
+        logger.info("solve cached", extra={"fields": {"method": method}})
+        return encode_response(solution, request)
+    solution = run_solve(solve_request, model, method)
+    if solution is None:
+        return jsonify({"solution": None, "optimal_value": None, "error": "Solve timed out", "steps": []}), 504
+    duration_ms = round((time.perf_counter() - start) * 1000, 3)
+    logger.info("solve finished", extra={"fields": {
+        "method": method,
+        "duration_ms": duration_ms,
+        "error": solution.get('error'),
+    }})
+    trace = solution.pop('trace', None)
+    if trace is not None and duration_ms >= TRACE_MIN_MS:
+        save_trace(key, trace)
+    store_result(key, solution)
+    return encode_response(solution, request)
+
+
+@app.route('/pareto', methods=['POST'])
+def pareto():
+    try:
+        model = parse_pareto_request(request.get_json(silent=True))
+    except SchemaError as error:
+        return jsonify({"points": [], "error": str(error)}), 400
+    method = f"pareto-{model.method}"
+    start = time.perf_counter()
+    key = hashlib.sha256(b"pareto:" + request.get_data()).hexdigest()
+    front = cached_result(key)
+    if front is not None:
+        logger.info("solve cached", extra={"fields": {"method": method}})
+        return encode_response(front, request)
+    front = run_solve(pareto_request, model, method)
+    if front is None:
+        return jsonify({"points": [], "error": "Solve timed out"}), 504
+    logger.info("solve finished", extra={"fields": {
+        "method": method,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "points": len(front['points']),
+        "error": front.get('error'),
+    }})
+    store_result(key, front)
+    return encode_response(front, request)
+
+
+@app.route('/stochastic', methods=['POST'])
+def stochastic():
+    try:
+        model = parse_stochastic_request(request.get_json(silent=True))
+    except SchemaError as error:
+        return jsonify({"solution": None, "optimal_value": None, "error": str(error), "steps": []}), 400
+    method = f"stochastic-{model.method}"
+    start = time.perf_counter()
+    key = hashlib.sha256(b"stochastic:" + request.get_data()).hexdigest()
+    solution = cached_result(key)
+    if solution is not None:
+        logger.info("solve cached", extra={"fields": {"method": method}})
+        return encode_response(solution, request)
+    solution = run_solve(stochastic_request, model, method)
+    if solution is None:
+        return jsonify({"solution": None, "optimal_value": None, "error": "Solve timed out", "steps": []}), 504
+    logger.info("solve finished", extra={"fields": {
+        "method": method,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "scenarios": len(model.rhs_deltas),
+        "error": solution.get('error'),
+    }})
+    store_result(key, solution)
+    return encode_response(solution, request)
+
+
+@app.route('/healthz', methods=['GET'])
+def health():
+    return jsonify({"status": "ok"})
+
+
+@app.route('/readyz', methods=['GET'])
+def ready():
+    # Ready once a trivial model solves end to end through the same path as /solve
+    probe = parse_request({"method": "simplex", "objective": [1], "constraints": [[1]], "rhs": [1],
+                           "constraint_types": ["<="], "var_restrictions": [">=0"], "optimization": "max"})
+    executor = solve_executor()
+    try:
+        if executor is None:
+            solve_request(probe)
+        else:
+            executor.submit(solve_request, probe).result(timeout=SOLVE_TIMEOUT)
+    except Exception as error:
+        return jsonify({"status": "unavailable", "error": str(error)}), 503
+    return jsonify({"status": "ready"})
+
+
+def warm_up_solve():
+    """Solve a tiny LP and goal model so NumPy's kernels, tabulate and the solver code paths are loaded."""
+    solve_request(parse_request({"method": "two-phase", "objective": [3, 5], "constraints": [[1, 2], [1, -1]],
+                                 "rhs": [6, 1], "constraint_types": ["<=", ">="], "var_restrictions": [">=0", ">=0"],
+                                 "optimization": "max"}))
+    solve_request(parse_request({"method": "goal", "goals_coeffs": [[1, 1]], "goals_values": [2],
+                                 "constraints_coeffs": [[1, 0]], "constraints_values": [1],
+                                 "goals_directions": [">="]}))
+
+
+def warm_up(start_pool=True):
+    """
+    Warm this process before it takes traffic: run the dummy solve here and, with start_pool
+    and solves going to a pool, start the pool's workers by running it there too. Called from
+    gunicorn's post_fork hook, and at import time with LP_WARM_UP=1.
+    """
+    start = time.perf_counter()
+    warm_up_solve()
+    executor = solve_executor() if start_pool else None
+    if executor is not None:
+        futures = [executor.submit(warm_up_solve) for _ in range(SOLVE_WORKERS)]
+        for future in futures:
+            future.result(timeout=SOLVE_TIMEOUT)
+    logger.info("warm up finished", extra={"fields": {"duration_ms": round((time.perf_counter() - start) * 1000, 3)}})
 
 
+# Pool workers unpickle their task by importing app, which cannot happen while app is still importing
+if WARM_UP:
+    warm_up(start_pool=False)
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,279 @@
+import copy
+import heapq
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from linear_programing_solver import LinearProgrammingSolver
+from lp_model import LinearProgrammingModel
+from request_schema import INTEGER_RESTRICTIONS, NODE_SELECTIONS
+from shared_model import SharedModel, attach_model
+
+
+def build_node_model(constraints, rhs, constraint_types, bounds):
+    """Return (constraints, rhs, constraint_types) for the base model plus a node's bound rows."""
+    bound_rows = np.zeros((len(bounds), constraints.shape[1]))
+    bound_rhs = np.zeros(len(bounds))
+    bound_types = []
+    for k, (var, direction, value) in enumerate(bounds):
+        bound_rows[k, var] = 1
+        bound_rhs[k] = value
+        bound_types.append(direction)
+    return np.vstack((constraints, bound_rows)), np.concatenate((rhs, bound_rhs)), list(constraint_types) + bound_types
+
+
+def node_method(method, rhs, constraint_types):
+    """Pick the LP method for a node: plain simplex is only valid for all '<=' rows with rhs >= 0."""
+    if all(c_type == "<=" for c_type in constraint_types) and np.all(rhs >= 0):
+        return "simplex"
+    if method in ("big-m", "two-phase"):
+        return method
+    # Plain simplex cannot start from '>=' or '=' rows, and auto-race or decomposition do not pivot a tableau
+    return "big-m" if method == "simplex" else "two-phase"
+
+
+def node_model(parent, bound, root):
+    """
+    LP relaxation of a node as a LinearProgrammingModel, solved warm from its parent's basis.
+
+    The child is a copy of the parent's solved model with one bound row added, which
+    add_constraint expresses in the parent's basis; solve() then re-optimizes with dual simplex
+    instead of starting from scratch. The root (parent None) is built by `root()` and solved cold.
+    """
+    if parent is None:
+        model = root()
+    else:
+        model = copy.deepcopy(parent)
+        var, direction, value = bound
+        row = np.zeros(len(model.objective))
+        row[var] = 1.0
+        model.add_constraint(row, direction, value)
+    return model, model.solve()
+
+
+def solve_node(handle, bounds, basis, constraint_types, var_restrictions, type):
+    """
+    Solve the LP relaxation of a single node in a worker process.
+
+    The base model is read from shared memory through `handle`; only the node's bound rows and
+    its parent's basis indices travel with the task. The node model is rebuilt from them and
+    re-optimized with dual simplex from the parent's basis, the new bound row starting with its
+    slack basic. The root (basis None) is solved cold. Returns the node's basis indices and result.
+    """
+    model = attach_model(handle)
+    constraints, rhs, node_types = build_node_model(model["constraints"], model["rhs"], constraint_types, bounds)
+    lp = LinearProgrammingModel(model["objective"], constraints, rhs, node_types, var_restrictions, type=type)
+    if basis is not None:
+        lp.warm_start(basis)
+    result = lp.solve()
+    return lp.basis_indices(), result
+
+
+class BranchAndBoundSolver:
+    """
+    Branch-and-bound for linear programs where some variables must take integer values.
+
+    Variables marked "integer" or "binary" in var_restrictions are relaxed to ">=0" and
+    branched on with x_j <= floor(v) / x_j >= ceil(v) bound rows. Each node keeps its relaxation
+    in a LinearProgrammingModel; a child copies its parent's solved model, adds its bound row and
+    re-optimizes with dual simplex from the parent's basis. With workers > 1 the base model is
+    in shared memory and a task carries only the node's bounds and its parent's basis indices.
+    The steps of the best integer node are produced by one cold LinearProgrammingSolver solve
+    at the end.
+    """
+
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, method="big-m",
+                 type="max", node_selection="best-bound", node_limit=1000, workers=1, tolerance=1e-6):
+        """
+        Initialize the branch-and-bound solver.
+
+        Args:
+            objective, constraints, rhs, constraint_types, var_restrictions, type:
+                Same as LinearProgrammingSolver; var_restrictions may also contain
+                "integer" or "binary".
+            method: LP method used to produce the steps of the best node when it carries '>=' or '='
+                rows ("big-m" or "two-phase")
+            node_selection: "best-bound" or "depth-first"
+            node_limit: Maximum number of nodes to evaluate
+            workers: Number of processes used to evaluate open nodes in parallel
+            tolerance: Integrality and feasibility tolerance
+        """
+        self.objective = np.array(objective, dtype=float)
+        self.constraints = np.array(constraints, dtype=float).reshape(-1, len(self.objective))
+        self.rhs = np.array(rhs, dtype=float)
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = list(var_restrictions)
+        self.method = method.lower()
+        self.type = type.lower()
+        self.node_selection = node_selection.lower()
+        self.node_limit = node_limit
+        self.workers = workers
+        self.tolerance = tolerance
+
+        if self.node_selection not in NODE_SELECTIONS:
+            raise ValueError("Invalid node selection rule")
+
+        self.integer_vars = [i for i, res in enumerate(self.var_restrictions) if res in INTEGER_RESTRICTIONS]
+        self.lp_restrictions = [">=0" if res in INTEGER_RESTRICTIONS else res for res in self.var_restrictions]
+
+        # Binary variables get their upper bound as an explicit row at the root
+        self.root_bounds = [(i, "<=", 1.0) for i, res in enumerate(self.var_restrictions) if res == "binary"]
+
+        self.nodes_evaluated = 0
+        self.incumbent = None
+        self.incumbent_score = -np.inf
+        self.incumbent_bounds = None
+
+    def build_node_model(self, bounds):
+        return build_node_model(self.constraints, self.rhs, self.constraint_types, bounds)
+
+    def root_model(self):
+        constraints, rhs, constraint_types = self.build_node_model(self.root_bounds)
+        return LinearProgrammingModel(self.objective, constraints, rhs, constraint_types, self.lp_restrictions,
+                                      type=self.type)
+
+    def node_steps(self, bounds):
+        """Tableau steps of a node, from a cold LinearProgrammingSolver solve of its model."""
+        constraints, rhs, constraint_types = self.build_node_model(bounds)
+        solver = LinearProgrammingSolver(self.objective, constraints, rhs, constraint_types, self.lp_restrictions,
+                                         method=node_method(self.method, rhs, constraint_types), type=self.type)
+        return solver.solve().get("steps", [])
+
+    def is_feasible(self, solution, bounds):
+        """Check a relaxation solution against the node model, so numerical slips in the LP are not accepted."""
+        constraints, rhs, constraint_types = self.build_node_model(bounds)
+        lhs = constraints @ solution
+        for value, limit, c_type in zip(lhs, rhs, constraint_types):
+            if c_type == "<=" and value > limit + self.tolerance:
+                return False
+            if c_type == ">=" and value < limit - self.tolerance:
+                return False
+            if c_type == "=" and abs(value - limit) > self.tolerance:
+                return False
+        return True
+
+    def score(self, solution):
+        """Objective value in maximization sense, so larger is always better."""
+        value = float(self.objective @ solution)
+        return value if self.type == "max" else -value
+
+    def branching_variable(self, solution):
+        """Return the most fractional integer variable, or None when the solution is integral."""
+        best_var = None
+        best_fraction = self.tolerance
+        for i in self.integer_vars:
+            fraction = abs(solution[i] - round(solution[i]))
+            if fraction > best_fraction:
+                best_var = i
+                best_fraction = fraction
+        return best_var
+
+    def evaluate(self, batch, executor, shared):
+        """Solve every (bound, bounds, parent warm start) node of the batch; returns (warm start, result) pairs."""
+        if executor is None:
+            return [node_model(parent, bounds[-1] if parent is not None else None, self.root_model)
+                    for _, bounds, parent in batch]
+        handle = shared.handle()
+        futures = [executor.submit(solve_node, handle, bounds, parent, self.constraint_types, self.lp_restrictions,
+                                   self.type)
+                   for _, bounds, parent in batch]
+        return [future.result() for future in futures]
+
+    def solve(self):
+        """Run branch-and-bound and return the best integer solution found."""
+        open_nodes = []
+        counter = 0
+
+        # Open nodes carry their parent's warm start: its solved model, which both children copy, or
+        # with workers only its basis indices, from which the worker rebuilds the child's tableau
+        def push(bound, bounds, parent):
+            nonlocal counter
+            if self.node_selection == "best-bound":
+                heapq.heappush(open_nodes, (-bound, counter, bounds, parent))
+            else:
+                open_nodes.append((bound, counter, bounds, parent))
+            counter += 1
+
+        def pop():
+            if self.node_selection == "best-bound":
+                neg_bound, _, bounds, parent = heapq.heappop(open_nodes)
+                return -neg_bound, bounds, parent
+            bound, _, bounds, parent = open_nodes.pop()
+            return bound, bounds, parent
+
+        push(np.inf, list(self.root_bounds), None)
+        executor = None
+        shared = None
+        if self.workers > 1:
+            shared = SharedModel(objective=self.objective, constraints=self.constraints, rhs=self.rhs)
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        unbounded = False
+        try:
+            while open_nodes and self.nodes_evaluated < self.node_limit:
+                batch = []
+                while open_nodes and len(batch) < self.workers and \
+                        self.nodes_evaluated + len(batch) < self.node_limit:
+                    bound, bounds, parent = pop()
+                    if bound <= self.incumbent_score + self.tolerance:
+                        continue
+                    batch.append((bound, bounds, parent))
+                if not batch:
+                    continue
+
+                results = self.evaluate(batch, executor, shared)
+                self.nodes_evaluated += len(batch)
+
+                for (_, bounds, _), (warm, result) in zip(batch, results):
+                    if result.get("error") == "Unbounded solution":
+                        unbounded = True
+                        continue
+                    if result.get("error") or result["solution"] is None:
+                        continue
+                    solution = np.array(result["solution"], dtype=float)
+                    if not self.is_feasible(solution, bounds):
+                        continue
+
+                    node_score = self.score(solution)
+                    if node_score <= self.incumbent_score + self.tolerance:
+                        continue
+
+                    var = self.branching_variable(solution)
+                    if var is None:
+                        self.incumbent = solution
+                        self.incumbent_score = node_score
+                        self.incumbent_bounds = bounds
+                        continue
+
+                    value = solution[var]
+                    push(node_score, bounds + [(var, ">=", float(math.ceil(value)))], warm)
+                    push(node_score, bounds + [(var, "<=", float(math.floor(value)))], warm)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+                shared.close()
+
+        node_limit_reached = bool(open_nodes) and self.nodes_evaluated >= self.node_limit
+
+        if self.incumbent is None:
+            if unbounded:
+                error = "Unbounded solution"
+            elif node_limit_reached:
+                error = "Node limit reached"
+            else:
+                error = "Infeasible solution"
+            return {
+                "solution": None,
+                "optimal_value": None,
+                "error": error,
+                "steps": [],
+                "nodes": self.nodes_evaluated}
+
+        solution = np.round(self.incumbent, 9)
+        solution[self.integer_vars] = np.round(solution[self.integer_vars])
+        return {
+            "solution": solution.tolist(),
+            "optimal_value": float(self.objective @ solution),
+            "steps": self.node_steps(self.incumbent_bounds),
+            "nodes": self.nodes_evaluated,
+            "node_limit_reached": node_limit_reached}
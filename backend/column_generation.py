@@ -0,0 +1,133 @@
+import itertools
+
+import numpy as np
+
+from lp_model import LinearProgrammingModel
+
+
+class ColumnGeneration:
+    """
+    Column generation driver for LPs with too many columns to enumerate.
+
+    The restricted master problem holds only the columns generated so far and is kept in a
+    LinearProgrammingModel, so every round re-solves warm from the previous basis. After each
+    solve the row duals are handed to the `pricing` callback, which returns new columns with a
+    favourable reduced cost; the loop stops when it returns none.
+    """
+
+    def __init__(self, objective, columns, rhs, constraint_types, pricing, type="min", max_iterations=1000,
+                 tolerance=1e-9):
+        """
+        Args:
+            objective: Costs of the initial master columns
+            columns: Initial master columns as a (num_rows x num_columns) matrix
+            rhs, constraint_types, type: Same as LinearProgrammingSolver
+            pricing: Callable taking the list of row duals and returning a list of (cost, column)
+                pairs to add; an empty list means no column prices out
+            max_iterations: Maximum number of pricing rounds
+            tolerance: Reduced cost below which a returned column is not added
+        """
+        columns = np.array(columns, dtype=float).reshape(len(rhs), -1)
+        self.master = LinearProgrammingModel(objective, columns, rhs, constraint_types,
+                                             [">=0"] * columns.shape[1], type=type)
+        self.pricing = pricing
+        self.type = type.lower()
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def reduced_cost(self, cost, column, duals):
+        """Reduced cost in the master's own sense: negative improves a min master, positive a max master."""
+        reduced = cost - np.dot(duals, column)
+        return reduced if self.type == "min" else -reduced
+
+    def solve(self):
+        """
+        Returns the master result dict (as LinearProgrammingModel.solve) with the final column
+        matrix under "columns", the number of pricing rounds under "pricing_rounds", and the
+        master objective after each round under "objective_history".
+        """
+        history = []
+        for rounds in range(1, self.max_iterations + 1):
+            result = self.master.solve()
+            if result.get("error"):
+                break
+            history.append(result["optimal_value"])
+
+            added = 0
+            for cost, column in self.pricing(result["duals"]):
+                column = np.array(column, dtype=float)
+                if self.reduced_cost(cost, column, result["duals"]) < -self.tolerance:
+                    self.master.add_variable(cost, column)
+                    added += 1
+            if not added:
+                break
+        else:
+            result = self.master.solve()
+
+        result["columns"] = self.master.constraints.tolist()
+        result["pricing_rounds"] = rounds
+        result["objective_history"] = history
+        return result
+
+
+def knapsack_pricing(widths, roll_width, tolerance=1e-9):
+    """
+    Pricing callback for cutting stock: the best new pattern solves an unbounded integer knapsack.
+
+    A pattern a (pieces of each width cut from one roll) costs one roll, so it prices out when
+    sum(duals * a) > 1. Widths and roll_width must be integers; the knapsack is solved by
+    dynamic programming over the roll capacity.
+    """
+    widths = [int(width) for width in widths]
+    roll_width = int(roll_width)
+
+    def pricing(duals):
+        best = np.zeros(roll_width + 1)
+        choice = np.full(roll_width + 1, -1)
+        for capacity in range(1, roll_width + 1):
+            best[capacity] = best[capacity - 1]
+            for i, width in enumerate(widths):
+                if width <= capacity and duals[i] > 0 and best[capacity - width] + duals[i] > best[capacity]:
+                    best[capacity] = best[capacity - width] + duals[i]
+                    choice[capacity] = i
+
+        if best[roll_width] <= 1 + tolerance:
+            return []
+        pattern = np.zeros(len(widths))
+        capacity = roll_width
+        while capacity > 0:
+            if choice[capacity] < 0:
+                capacity -= 1
+            else:
+                pattern[choice[capacity]] += 1
+                capacity -= widths[choice[capacity]]
+        return [(1.0, pattern)]
+
+    return pricing
+
+
+def initial_patterns(widths, roll_width):
+    """One homogeneous pattern per width (as many pieces as fit on a roll); always a feasible master."""
+    patterns = np.zeros((len(widths), len(widths)))
+    for i, width in enumerate(widths):
+        patterns[i, i] = roll_width // width
+    return patterns
+
+
+def enumerate_patterns(widths, roll_width):
+    """Every maximal cutting pattern, as columns of a (num_widths x num_patterns) matrix."""
+    smallest = min(widths)
+    patterns = []
+    for counts in itertools.product(*[range(roll_width // width + 1) for width in widths]):
+        used = sum(count * width for count, width in zip(counts, widths))
+        if used <= roll_width and roll_width - used < smallest:
+            patterns.append(counts)
+    return np.array(patterns, dtype=float).T
+
+
+def cutting_stock(widths, demands, roll_width, max_iterations=1000):
+    """Solve the LP relaxation of cutting stock by column generation with knapsack pricing."""
+    patterns = initial_patterns(widths, roll_width)
+    solver = ColumnGeneration(np.ones(patterns.shape[1]), patterns, demands, [">="] * len(widths),
+                              knapsack_pricing(widths, roll_width), type="min", max_iterations=max_iterations)
+    return solver.solve()
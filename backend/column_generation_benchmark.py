@@ -0,0 +1,54 @@
+"""
+Benchmark column generation against the fully enumerated cutting-stock model.
+
+Generates random cutting-stock instances, solves the LP relaxation once by column generation
+with knapsack pricing and once by LinearProgrammingSolver over every maximal pattern, and
+reports the pattern counts, timings and the gap between the two optimal values:
+
+    python column_generation_benchmark.py --widths 6 8 10 --roll-width 100
+"""
+import argparse
+import time
+
+import numpy as np
+
+from column_generation import cutting_stock, enumerate_patterns
+from linear_programing_solver import LinearProgrammingSolver
+
+
+def enumerated_solve(widths, demands, roll_width):
+    patterns = enumerate_patterns(widths, roll_width)
+    solver = LinearProgrammingSolver(np.ones(patterns.shape[1]), patterns, demands, [">="] * len(widths),
+                                     [">=0"] * patterns.shape[1], method="two-phase", type="min")
+    result = solver.solve()
+    result["columns"] = patterns.tolist()
+    return result
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--widths", type=int, nargs="+", default=[4, 6, 8])
+    parser.add_argument("--roll-width", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'items':>6} {'patterns':>10} {'cg cols':>8} {'enum ms':>10} {'cg ms':>10} {'gap':>10}")
+    for num_items in range(2, len(args.widths) + 1):
+        widths = args.widths[:num_items]
+        demands = rng.integers(10, 100, num_items).astype(float)
+        enumerated, enumerated_time = timed(enumerated_solve, widths, demands, args.roll_width)
+        generated, generated_time = timed(cutting_stock, widths, demands, args.roll_width)
+        gap = abs(enumerated["optimal_value"] - generated["optimal_value"])
+        print(f"{num_items:>6} {len(enumerated['columns'][0]):>10} {len(generated['columns'][0]):>8} "
+              f"{enumerated_time * 1000:>10.2f} {generated_time * 1000:>10.2f} {gap:>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import multiprocessing as mp
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+from linear_programing_solver import LinearProgrammingSolver
+
+# Model signature -> method that finished first the last time that shape of model was raced,
+# keeping the LP_RACE_MEMORY_SIZE most recently used signatures
+winning_methods = OrderedDict()
+winning_methods_lock = threading.Lock()
+RACE_MEMORY_SIZE = int(os.environ.get('LP_RACE_MEMORY_SIZE', 256))
+
+
+def model_signature(constraints, constraint_types, var_restrictions, type):
+    """Key used to remember race winners: model size plus the features that decide which methods apply."""
+    num_constraints = len(constraints)
+    num_vars = len(constraints[0]) if num_constraints else 0
+    return (num_constraints, num_vars, tuple(sorted(set(constraint_types))),
+            'unrestricted' in var_restrictions, type.lower())
+
+
+def candidate_methods(constraint_types, var_restrictions):
+    """
+    Methods that solve the model correctly, with the same rule as app.solve_request.
+
+    All-'<=' models are solved by plain simplex, the only method that splits unrestricted
+    variables. Big-M and two-phase treat every variable as non-negative, so with an unrestricted
+    variable and other row types no method applies and the list is empty.
+    """
+    if all(c_type == '<=' for c_type in constraint_types):
+        return ['simplex']
+    if 'unrestricted' in var_restrictions:
+        return []
+    return ['big-m', 'two-phase']
+
+
+def remembered_method(signature):
+    with winning_methods_lock:
+        if signature not in winning_methods:
+            return None
+        winning_methods.move_to_end(signature)
+        return winning_methods[signature]
+
+
+def remember_method(signature, method):
+    with winning_methods_lock:
+        winning_methods[signature] = method
+        winning_methods.move_to_end(signature)
+        while len(winning_methods) > RACE_MEMORY_SIZE:
+            winning_methods.popitem(last=False)
+
+
+def solve_with(method, objective, constraints, rhs, constraint_types, var_restrictions, type):
+    solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions,
+                                     method=method, type=type)
+    solution = solver.solve()
+    solution["method"] = method
+    return solution
+
+
+def run_method(result_queue, method, objective, constraints, rhs, constraint_types, var_restrictions, type):
+    solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions,
+                                     method=method, type=type)
+    try:
+        result_queue.put((method, solver.solve(), False))
+    except Exception as error:
+        result_queue.put((method, {"solution": None, "optimal_value": None, "error": str(error), "steps": []}, True))
+
+
+def race_solve(objective, constraints, rhs, constraint_types, var_restrictions, type="max", methods=None,
+               timeout=None):
+    """
+    Solve the same model with several methods in separate processes and return the first result.
+
+    Only the methods of candidate_methods are raced; when a single one applies it is run
+    directly. The losing processes are terminated. The winning method is recorded against the
+    model signature, and later calls for the same signature run that method directly when the
+    caller allows it. Without a result within `timeout` seconds an error "Solve timed out" is
+    returned.
+    """
+    signature = model_signature(constraints, constraint_types, var_restrictions, type)
+    method = remembered_method(signature)
+    if method is not None and (methods is None or method in methods):
+        return solve_with(method, objective, constraints, rhs, constraint_types, var_restrictions, type)
+
+    # Methods that do not apply to the model are never raced, even when asked for
+    candidates = candidate_methods(constraint_types, var_restrictions)
+    methods = candidates if methods is None else [method for method in methods if method in candidates]
+    if not methods:
+        return {"solution": None, "optimal_value": None, "steps": [],
+                "error": "No method supports unrestricted variables with '>=' or '=' constraints"}
+    if len(methods) == 1:
+        return solve_with(methods[0], objective, constraints, rhs, constraint_types, var_restrictions, type)
+
+    result_queue = mp.Queue()
+    processes = [
+        mp.Process(target=run_method,
+                   args=(result_queue, method, objective, constraints, rhs, constraint_types, var_restrictions, type),
+                   daemon=True)
+        for method in methods
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        # A method that crashed does not win the race unless every method crashed
+        for _ in methods:
+            method, solution, failed = result_queue.get(timeout=timeout)
+            if not failed:
+                break
+    except queue.Empty:
+        return {"solution": None, "optimal_value": None, "error": "Solve timed out", "steps": []}
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    if not failed:
+        remember_method(signature, method)
+    solution["method"] = method
+    return solution
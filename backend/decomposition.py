@@ -0,0 +1,279 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from branch_and_bound import node_method
+from column_generation import ColumnGeneration
+from linear_programing_solver import LinearProgrammingSolver
+from shared_model import SharedModel, attach_model
+
+
+def variable_components(constraints, rows):
+    """Group variables into connected components, two variables being connected when a row in `rows` uses both."""
+    parent = list(range(constraints.shape[1]))
+
+    def find(var):
+        while parent[var] != var:
+            parent[var] = parent[parent[var]]
+            var = parent[var]
+        return var
+
+    for row in rows:
+        used = np.nonzero(constraints[row])[0]
+        for var in used[1:]:
+            parent[find(var)] = find(used[0])
+    components = {}
+    for var in range(constraints.shape[1]):
+        components.setdefault(find(var), []).append(var)
+    return list(components.values())
+
+
+def detect_blocks(constraints, linking_rows=None, max_linking_fraction=0.2):
+    """
+    Find a block-angular structure in the constraint matrix.
+
+    With `linking_rows` given, the blocks are the connected components of the remaining rows.
+    Otherwise the densest rows are tried as linking rows, one more at a time (up to
+    `max_linking_fraction` of the rows), until the rest splits into at least two blocks.
+    Returns (linking_rows, blocks) with each block a (rows, columns) pair of index lists; a
+    single block means no structure was found.
+    """
+    constraints = np.asarray(constraints, dtype=float)
+    num_rows, num_vars = constraints.shape
+    if linking_rows is None:
+        by_density = sorted(range(num_rows), key=lambda row: -np.count_nonzero(constraints[row]))
+        candidates = [by_density[:count] for count in range(int(max_linking_fraction * num_rows) + 1)]
+    else:
+        candidates = [list(linking_rows)]
+
+    for linking in candidates:
+        block_rows = [row for row in range(num_rows) if row not in linking]
+        components = variable_components(constraints, block_rows)
+        if len(components) < 2 and linking_rows is None:
+            continue
+        blocks = []
+        owner = {}
+        for columns in components:
+            for var in columns:
+                owner[var] = len(blocks)
+            blocks.append(([], columns))
+        for row in block_rows:
+            used = np.nonzero(constraints[row])[0]
+            blocks[owner[used[0]] if len(used) else 0][0].append(row)
+        return sorted(linking), blocks
+    return [], [(list(range(num_rows)), list(range(num_vars)))]
+
+
+def solve_block(handle, block, objective, constraint_types, var_restrictions):
+    """Solve one pricing subproblem (min objective over the block's own rows) in a worker process."""
+    model = attach_model(handle)
+    constraints = model[f"constraints{block}"]
+    rhs = model[f"rhs{block}"]
+    solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions,
+                                     method=node_method("two-phase", rhs, constraint_types), type="min")
+    return solver.solve()
+
+
+class DecompositionSolver:
+    """
+    Dantzig-Wolfe decomposition for block-angular linear programs.
+
+    The rows split into a few linking rows and independent blocks, each block owning its own
+    rows and variables. The master problem chooses a convex combination of proposals (block
+    solutions) per block subject to the linking rows, and is solved by ColumnGeneration; its
+    pricing step solves every block subproblem with the linking duals folded into the costs.
+    Blocks are independent, so with workers > 1 they are solved in parallel processes, reading
+    their rows from shared memory.
+
+    Unrestricted variables are split into x+ - x- up front, so the blocks and the monolithic
+    fallback only ever see non-negative variables; solutions are folded back before returning.
+
+    Blocks must be bounded on their own rows (an unbounded block has no proposal to offer). If
+    no block structure is found, or a block turns out to be unbounded, the model is solved
+    monolithically by LinearProgrammingSolver instead.
+    """
+
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, type="max", blocks=None,
+                 linking_rows=None, workers=1, max_iterations=500, penalty=1e6, tolerance=1e-7):
+        """
+        Args:
+            objective, constraints, rhs, constraint_types, var_restrictions, type:
+                Same as LinearProgrammingSolver
+            blocks: Optional list of (rows, columns) index lists; detected when omitted
+            linking_rows: Optional indices of the linking rows, used with or without `blocks`
+            workers: Number of processes used to solve block subproblems in parallel
+            max_iterations: Maximum number of pricing rounds of the master
+            penalty: Cost of the master's artificial columns, which keep it feasible until
+                enough proposals have been generated
+            tolerance: Feasibility tolerance on the artificial columns at the optimum
+        """
+        objective = np.array(objective, dtype=float)
+        constraints = np.array(constraints, dtype=float).reshape(-1, len(objective))
+        # Two-phase treats every column as non-negative, so unrestricted variables get an x- column
+        self.num_vars = len(objective)
+        self.negative_parts = [j for j, restriction in enumerate(var_restrictions) if restriction == "unrestricted"]
+        self.objective = np.concatenate((objective, -objective[self.negative_parts]))
+        self.constraints = np.hstack((constraints, -constraints[:, self.negative_parts]))
+        self.rhs = np.array(rhs, dtype=float)
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = [">=0"] * len(self.objective)
+        self.type = type.lower()
+        self.workers = workers
+        self.max_iterations = max_iterations
+        self.penalty = penalty
+        self.tolerance = tolerance
+
+        if blocks is None:
+            self.linking_rows, self.blocks = detect_blocks(self.constraints, linking_rows)
+        else:
+            block_rows = {row for rows, _ in blocks for row in rows}
+            self.linking_rows = sorted(linking_rows if linking_rows is not None
+                                       else set(range(len(self.rhs))) - block_rows)
+            # Given blocks name original variables; an x- column belongs to the block of its x+
+            split_columns = {j: self.num_vars + k for k, j in enumerate(self.negative_parts)}
+            self.blocks = [(list(rows), list(columns) + [split_columns[j] for j in columns if j in split_columns])
+                           for rows, columns in blocks]
+
+        # Everything is solved in minimization sense
+        self.costs = -self.objective if self.type == "max" else self.objective
+        self.proposals = []
+        self.executor = None
+        self.shared = None
+
+    def original_values(self, values):
+        """Fold a vector over the split columns back to the original variables, x = x+ - x-."""
+        values = np.array(values[:self.num_vars], dtype=float) - np.bincount(
+            self.negative_parts, weights=values[self.num_vars:], minlength=self.num_vars)
+        return values.tolist()
+
+    def block_model(self, block):
+        rows, columns = self.blocks[block]
+        return (self.constraints[np.ix_(rows, columns)], self.rhs[rows],
+                [self.constraint_types[row] for row in rows], [self.var_restrictions[col] for col in columns])
+
+    def solve_blocks(self, block_costs):
+        """Solve every block for its cost vector, in parallel when a process pool is running."""
+        if self.executor is None:
+            results = []
+            for block, costs in enumerate(block_costs):
+                constraints, rhs, constraint_types, var_restrictions = self.block_model(block)
+                solver = LinearProgrammingSolver(costs, constraints, rhs, constraint_types, var_restrictions,
+                                                 method=node_method("two-phase", rhs, constraint_types), type="min")
+                results.append(solver.solve())
+            return results
+        handle = self.shared.handle()
+        futures = [self.executor.submit(solve_block, handle, block, costs, self.block_model(block)[2],
+                                        self.block_model(block)[3])
+                   for block, costs in enumerate(block_costs)]
+        return [future.result() for future in futures]
+
+    def proposal_column(self, block, solution):
+        """Master column of a block solution: its linking-row usage, then a 1 in the block's convexity row."""
+        columns = self.blocks[block][1]
+        convexity = np.zeros(len(self.blocks))
+        convexity[block] = 1.0
+        linking = self.constraints[np.ix_(self.linking_rows, columns)] @ solution
+        return float(self.costs[columns] @ solution), np.concatenate((linking, convexity))
+
+    def price(self, duals):
+        linking_duals = np.array(duals[:len(self.linking_rows)])
+        convexity_duals = duals[len(self.linking_rows):]
+        block_costs = [self.costs[columns] - linking_duals @ self.constraints[np.ix_(self.linking_rows, columns)]
+                       for _, columns in self.blocks]
+        new_columns = []
+        for block, result in enumerate(self.solve_blocks(block_costs)):
+            if result.get("error"):
+                raise ValueError(f"Block {block}: {result['error']}")
+            solution = np.array(result["solution"], dtype=float)
+            cost, column = self.proposal_column(block, solution)
+            # Same test ColumnGeneration applies, so self.proposals stays aligned with the master columns
+            if self.master.reduced_cost(cost, column, duals) < -self.master.tolerance:
+                self.proposals.append((block, solution))
+                new_columns.append((cost, column))
+        return new_columns
+
+    def initial_master(self):
+        """Artificial columns for every linking row plus one proposal per block at the original costs."""
+        costs = []
+        columns = []
+        num_linking = len(self.linking_rows)
+        for k, row in enumerate(self.linking_rows):
+            directions = {"<=": [-1.0], ">=": [1.0], "=": [1.0, -1.0]}[self.constraint_types[row]]
+            for direction in directions:
+                column = np.zeros(num_linking + len(self.blocks))
+                column[k] = direction
+                costs.append(self.penalty)
+                columns.append(column)
+                self.proposals.append(None)
+
+        for block, result in enumerate(self.solve_blocks([self.costs[columns] for _, columns in self.blocks])):
+            if result.get("error"):
+                raise ValueError(f"Block {block}: {result['error']}")
+            solution = np.array(result["solution"], dtype=float)
+            cost, column = self.proposal_column(block, solution)
+            costs.append(cost)
+            columns.append(column)
+            self.proposals.append((block, solution))
+        return np.array(costs), np.column_stack(columns)
+
+    def monolithic(self):
+        method = node_method("two-phase", self.rhs, self.constraint_types)
+        solver = LinearProgrammingSolver(self.objective, self.constraints, self.rhs, self.constraint_types,
+                                         self.var_restrictions, method=method, type=self.type)
+        result = solver.solve()
+        for key in ("solution", "ray"):
+            if result.get(key) is not None:
+                result[key] = self.original_values(result[key])
+        result["blocks"] = 1
+        return result
+
+    def solve(self):
+        if len(self.blocks) < 2:
+            return self.monolithic()
+
+        if self.workers > 1:
+            arrays = {}
+            for block in range(len(self.blocks)):
+                constraints, rhs, _, _ = self.block_model(block)
+                arrays[f"constraints{block}"] = constraints
+                arrays[f"rhs{block}"] = rhs
+            self.shared = SharedModel(**arrays)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            self.proposals = []
+            costs, columns = self.initial_master()
+            master_rhs = np.concatenate((self.rhs[self.linking_rows], np.ones(len(self.blocks))))
+            master_types = [self.constraint_types[row] for row in self.linking_rows] + ["="] * len(self.blocks)
+            self.master = ColumnGeneration(costs, columns, master_rhs, master_types, self.price, type="min",
+                                           max_iterations=self.max_iterations)
+            result = self.master.solve()
+        except ValueError as error:
+            if "Infeasible" in str(error):
+                return {"solution": None, "optimal_value": None, "error": "Infeasible solution", "steps": []}
+            return self.monolithic()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.shared.close()
+                self.executor = None
+                self.shared = None
+
+        if result.get("error"):
+            return {"solution": None, "optimal_value": None, "error": result["error"], "steps": []}
+        weights = np.array(result["solution"])
+        solution = np.zeros(len(self.objective))
+        for weight, proposal in zip(weights, self.proposals):
+            if proposal is None:
+                if weight > self.tolerance:
+                    return {"solution": None, "optimal_value": None, "error": "Infeasible solution", "steps": []}
+                continue
+            block, values = proposal
+            solution[self.blocks[block][1]] += weight * values
+
+        return {
+            "solution": self.original_values(solution),
+            "optimal_value": float(self.objective @ solution),
+            "steps": [],
+            "blocks": len(self.blocks),
+            "pricing_rounds": result["pricing_rounds"],
+            "objective_history": [-value if self.type == "max" else value for value in result["objective_history"]]}
@@ -0,0 +1,67 @@
+"""
+Benchmark Dantzig-Wolfe decomposition against the monolithic tableau on block-angular models.
+
+Builds random models with a growing number of equally sized blocks and a few linking rows,
+and reports the solve time of LinearProgrammingSolver on the whole model next to
+DecompositionSolver with one and several worker processes:
+
+    python decomposition_benchmark.py --blocks 2 4 8 16 --block-size 15 --workers 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from decomposition import DecompositionSolver
+from linear_programing_solver import LinearProgrammingSolver
+
+
+def block_angular_model(rng, num_blocks, block_size, num_linking):
+    """Random max model: each block has block_size variables and rows, all blocks share num_linking rows."""
+    num_vars = num_blocks * block_size
+    constraints = np.zeros((num_blocks * block_size + num_linking, num_vars))
+    for block in range(num_blocks):
+        span = slice(block * block_size, (block + 1) * block_size)
+        constraints[span, span] = rng.integers(0, 10, (block_size, block_size))
+    constraints[num_blocks * block_size:] = rng.integers(0, 5, (num_linking, num_vars))
+    rhs = np.concatenate((rng.integers(50, 100, num_blocks * block_size),
+                          rng.integers(50, 100, num_linking) * num_blocks)).astype(float)
+    objective = rng.integers(1, 10, num_vars).astype(float)
+    return objective, constraints, rhs
+
+
+def timed(solver):
+    start = time.perf_counter()
+    result = solver.solve()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--block-size", type=int, default=15)
+    parser.add_argument("--linking", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    parallel_header = f"dw x{args.workers} ms"
+    print(f"{'blocks':>7} {'tableau ms':>11} {'dw ms':>10} {parallel_header:>11} {'gap':>10}")
+    for num_blocks in args.blocks:
+        objective, constraints, rhs = block_angular_model(rng, num_blocks, args.block_size, args.linking)
+        constraint_types = ["<="] * len(rhs)
+        var_restrictions = [">=0"] * len(objective)
+        monolithic, monolithic_time = timed(LinearProgrammingSolver(
+            objective, constraints, rhs, constraint_types, var_restrictions, method="simplex", type="max"))
+        serial, serial_time = timed(DecompositionSolver(
+            objective, constraints, rhs, constraint_types, var_restrictions, type="max"))
+        parallel, parallel_time = timed(DecompositionSolver(
+            objective, constraints, rhs, constraint_types, var_restrictions, type="max", workers=args.workers))
+        gap = abs(monolithic["optimal_value"] - parallel["optimal_value"])
+        print(f"{num_blocks:>7} {monolithic_time * 1000:>11.1f} {serial_time * 1000:>10.1f} "
+              f"{parallel_time * 1000:>11.1f} {gap:>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
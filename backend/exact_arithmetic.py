@@ -0,0 +1,215 @@
+from fractions import Fraction
+
+
+def to_fraction(value):
+    """Exact value of a model coefficient; going through repr turns 0.1 into 1/10 rather than its binary expansion."""
+    if isinstance(value, Fraction):
+        return value
+    return Fraction(repr(float(value)))
+
+
+class ExactSimplex:
+    """
+    Simplex over fractions.Fraction for audit-grade answers on small models.
+
+    The model is brought to standard form  max c x  s.t.  A x = b, x >= 0, b >= 0
+    (unrestricted variables split into x+ - x-, one slack/surplus column per inequality).
+    `solve(solution_hint, basis_hint)` first factors the float solver's basis (or one guessed
+    from its solution): if it is exactly primal and dual feasible the answer is verified without
+    pivoting, if it is only primal feasible Phase II continues from it, and otherwise a cold
+    exact two-phase solve runs.
+    Bland's rule is used throughout, so degenerate models cannot cycle.
+    """
+
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions):
+        """
+        Args:
+            objective: Objective coefficients in maximization sense
+            constraints, rhs, constraint_types, var_restrictions: As for LinearProgrammingSolver
+        """
+        self.num_vars = len(objective)
+        self.num_rows = len(constraints)
+        self.var_columns = []
+        self.cost = []
+        columns = []
+        for j in range(self.num_vars):
+            column = [to_fraction(row[j]) for row in constraints]
+            self.var_columns.append([(len(columns), 1)])
+            columns.append(column)
+            self.cost.append(to_fraction(objective[j]))
+            if var_restrictions[j] == "unrestricted":
+                self.var_columns[j].append((len(columns), -1))
+                columns.append([-value for value in column])
+                self.cost.append(-to_fraction(objective[j]))
+        self.num_structural = len(columns)
+
+        self.b = [to_fraction(value) for value in rhs]
+        self.row_signs = [1] * self.num_rows
+        self.slack_columns = {}
+        for i, c_type in enumerate(constraint_types):
+            if c_type == "=":
+                continue
+            column = [Fraction(0)] * self.num_rows
+            column[i] = Fraction(1) if c_type == "<=" else Fraction(-1)
+            self.slack_columns[i] = len(columns)
+            columns.append(column)
+            self.cost.append(Fraction(0))
+
+        # Flip rows with negative rhs so b >= 0
+        self.A = [[columns[j][i] for j in range(len(columns))] for i in range(self.num_rows)]
+        for i in range(self.num_rows):
+            if self.b[i] < 0:
+                self.A[i] = [-value for value in self.A[i]]
+                self.b[i] = -self.b[i]
+                self.row_signs[i] = -1
+        self.num_columns = len(columns)
+
+    def canonical_tableau(self, basis, num_columns=None, fill=False):
+        """
+        Gauss-Jordan reduce [A | b] on the given basis columns; returns (rows, basis) or None if singular.
+
+        With fill, `basis` is a list of candidates instead: a column is skipped when it has no pivot
+        left in the rows not yet reduced, and reduction stops once every row has a basic column.
+        """
+        width = self.num_columns if num_columns is None else num_columns
+        rows = [self.A[i][:width] + [self.b[i]] for i in range(self.num_rows)]
+        ordered = [None] * self.num_rows
+        assigned = set()
+        for col in basis:
+            if len(assigned) == self.num_rows:
+                break
+            pivot_row = next((i for i in range(self.num_rows) if i not in assigned and rows[i][col] != 0), None)
+            if pivot_row is None:
+                if fill:
+                    continue
+                return None
+            self.pivot(rows, pivot_row, col)
+            ordered[pivot_row] = col
+            assigned.add(pivot_row)
+        if fill and len(assigned) < self.num_rows:
+            return None
+        return rows, ordered
+
+    @staticmethod
+    def pivot(rows, pivot_row, pivot_col):
+        pivot_value = rows[pivot_row][pivot_col]
+        rows[pivot_row] = [value / pivot_value for value in rows[pivot_row]]
+        for i, row in enumerate(rows):
+            factor = row[pivot_col]
+            if i != pivot_row and factor != 0:
+                rows[i] = [value - factor * pivot_entry for value, pivot_entry in zip(row, rows[pivot_row])]
+
+    @staticmethod
+    def reduced_costs(rows, basis, cost, columns):
+        """z_j - c_j for each column in `columns`; all >= 0 means the basis is optimal for max c x."""
+        return {j: sum(cost[basis[i]] * rows[i][j] for i in range(len(rows))) - cost[j] for j in columns}
+
+    def primal_simplex(self, rows, basis, cost, columns):
+        """Run Phase II pivots with Bland's rule; returns "optimal" or "unbounded"."""
+        while True:
+            reduced = self.reduced_costs(rows, basis, cost, columns)
+            entering = next((j for j in sorted(columns) if reduced[j] < 0), None)
+            if entering is None:
+                return "optimal"
+            best = None
+            for i, row in enumerate(rows):
+                if row[entering] > 0:
+                    ratio = row[-1] / row[entering]
+                    if best is None or ratio < best[0] or (ratio == best[0] and basis[i] < basis[best[1]]):
+                        best = (ratio, i)
+            if best is None:
+                return "unbounded"
+            self.pivot(rows, best[1], entering)
+            basis[best[1]] = entering
+
+    def columns_from_hint(self, solution_hint, tolerance=1e-9):
+        """Order columns for a basis guess from a float solution: positive columns first, then slacks, then the rest."""
+        values = [0.0] * self.num_columns
+        for j, x in enumerate(solution_hint):
+            plus = self.var_columns[j][0][0]
+            values[plus] = max(x, 0.0)
+            if len(self.var_columns[j]) > 1:
+                values[self.var_columns[j][1][0]] = max(-x, 0.0)
+        for i, col in self.slack_columns.items():
+            lhs = sum(float(self.A[i][j]) * values[j] for j in range(self.num_structural))
+            values[col] = (float(self.b[i]) - lhs) / float(self.A[i][col])
+        return [j for j in range(self.num_columns) if values[j] > tolerance]
+
+    def hinted_start(self, candidates):
+        """Factor one basis from the candidate columns, padded with slacks then any column; None unless primal feasible."""
+        candidates = list(candidates) + list(self.slack_columns.values()) + list(range(self.num_columns))
+        start = self.canonical_tableau(candidates, fill=True)
+        if start is None or any(row[-1] < 0 for row in start[0]):
+            return None
+        return start
+
+    def row_duals(self, basis):
+        """Exact duals y of the original rows, from y B = c_B; rows dropped as redundant are priced at zero."""
+        # One row per basic column: the column of A as coefficients of y, and its cost on the right
+        rows = [[self.A[i][col] for i in range(self.num_rows)] + [self.cost[col]] for col in basis]
+        duals = [Fraction(0)] * self.num_rows
+        pivots = []
+        for r in range(len(rows)):
+            k = next(k for k in range(self.num_rows) if rows[r][k] != 0)
+            self.pivot(rows, r, k)
+            pivots.append(k)
+        for r, k in enumerate(pivots):
+            duals[k] = rows[r][-1] * self.row_signs[k]
+        return duals
+
+    def cold_start(self):
+        """Exact two-phase from an all-artificial basis; returns (rows, basis) or None if infeasible."""
+        width = self.num_columns
+        rows = [self.A[i] + [Fraction(1) if k == i else Fraction(0) for k in range(self.num_rows)] + [self.b[i]]
+                for i in range(self.num_rows)]
+        basis = [width + i for i in range(self.num_rows)]
+        phase_one_cost = [Fraction(0)] * width + [Fraction(-1)] * self.num_rows
+        self.primal_simplex(rows, basis, phase_one_cost, list(range(width + self.num_rows)))
+        if any(basis[i] >= width and rows[i][-1] != 0 for i in range(self.num_rows)):
+            return None
+
+        # Drive zero-level artificials out of the basis where a structural pivot exists
+        for i in range(self.num_rows):
+            if basis[i] >= width:
+                col = next((j for j in range(width) if rows[i][j] != 0), None)
+                if col is not None:
+                    self.pivot(rows, i, col)
+                    basis[i] = col
+        keep = [i for i in range(self.num_rows) if basis[i] < width]
+        return [rows[i][:width] + [rows[i][-1]] for i in keep], [basis[i] for i in keep]
+
+    def solve(self, solution_hint=None, basis_hint=None):
+        """
+        Returns a dict with "status" ("optimal", "infeasible" or "unbounded"), and for optimal
+        models "solution", "optimal_value", "duals" and "slacks" as Fractions plus "verified"
+        (True when the hinted basis was already exactly optimal).
+
+        basis_hint lists the columns of a float solver's final basis, in this model's column
+        numbering; it is factored once and preferred over a basis guessed from solution_hint.
+        """
+        columns = list(range(self.num_columns))
+        verified = False
+        start = None
+        if basis_hint is not None or solution_hint is not None:
+            start = self.hinted_start(basis_hint if basis_hint is not None else self.columns_from_hint(solution_hint))
+            if start is not None:
+                rows, basis = start
+                verified = all(value >= 0 for value in self.reduced_costs(rows, basis, self.cost, columns).values())
+        if start is None:
+            start = self.cold_start()
+            if start is None:
+                return {"status": "infeasible"}
+        rows, basis = start
+        if not verified and self.primal_simplex(rows, basis, self.cost, columns) == "unbounded":
+            return {"status": "unbounded"}
+
+        values = [Fraction(0)] * self.num_columns
+        for i, col in enumerate(basis):
+            values[col] = rows[i][-1]
+        solution = [sum((sign * values[col] for col, sign in self.var_columns[j]), Fraction(0))
+                    for j in range(self.num_vars)]
+        optimal_value = sum((self.cost[j] * values[j] for j in range(self.num_columns)), Fraction(0))
+        slacks = [values[self.slack_columns[i]] if i in self.slack_columns else Fraction(0)
+                  for i in range(self.num_rows)]
+        return {"status": "optimal", "solution": solution, "optimal_value": optimal_value,
+                "duals": self.row_duals(basis), "slacks": slacks, "verified": verified}
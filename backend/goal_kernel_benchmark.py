@@ -0,0 +1,86 @@
+"""
+Benchmark the goal-programming pivot kernels on large preemptive goal models.
+
+Builds random models (by default 20 goals over 500 variables) and times the priority-aware
+pivoting of every goal with the NumPy kernel and, when Numba is installed, the compiled one
+(its first call, which includes compilation, is left out). Step formatting is not timed:
+
+    python goal_kernel_benchmark.py --goals 20 --variables 500 --constraints 20 --repeat 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from goal_kernels import goal_kernel, optimize_goal_numba
+from goal_programing import PreemptiveGoalProgramming
+from mixed_precision import pivot_tolerance
+
+
+def random_goal_model(rng, num_goals, num_vars, num_constraints):
+    """Random '>='/'<=' goals over non-negative variables with a few resource rows."""
+    goal_coeffs = rng.integers(0, 10, (num_goals, num_vars)).astype(float)
+    goal_values = rng.integers(100, 1000, num_goals).astype(float)
+    constraint_coeffs = rng.integers(1, 10, (num_constraints, num_vars)).astype(float)
+    constraint_values = rng.integers(500, 2000, num_constraints).astype(float)
+    goal_directions = list(rng.choice([">=", "<="], num_goals))
+    return goal_coeffs, goal_values, constraint_coeffs, constraint_values, [0] * num_vars, goal_directions
+
+
+def pivot_all_goals(model, kernel):
+    """Set up the model's tableau and time the kernel over every goal; returns (seconds, basic values)."""
+    solver = PreemptiveGoalProgramming(*model, kernel=kernel)
+    ws = solver.new_workspace()
+    solver.create_initial_tableau(ws)
+    solver.setup_goal_objective_functions(ws)
+    for i in range(solver.num_goals):
+        ws.goal_objectives[i] += ws.tableau[i]
+        ws.goal_objective_rhs[i] += ws.tableau_rhs[i]
+    basis = np.array(ws.basic_vars, dtype=np.int64)
+    tolerance = np.float64(pivot_tolerance(np.float64))
+
+    start = time.perf_counter()
+    for goal in range(solver.num_goals):
+        solver.goal_kernel(ws.tableau, ws.tableau_rhs, ws.goal_objectives, ws.goal_objective_rhs, basis, goal,
+                           tolerance)
+    elapsed = time.perf_counter() - start
+    values = ws.tableau_rhs.copy()
+    ws.release()
+    return elapsed, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--variables", type=int, default=500)
+    parser.add_argument("--constraints", type=int, default=20)
+    parser.add_argument("--models", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    kernels = ["numpy"] + (["numba"] if optimize_goal_numba is not None else [])
+    if optimize_goal_numba is None:
+        print("Numba is not installed; timing the NumPy kernel only")
+    else:
+        # Compile outside the timed runs
+        pivot_all_goals(random_goal_model(np.random.default_rng(0), 2, 3, 1), "numba")
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'model':>6} " + " ".join(f"{kernel + ' ms':>10}" for kernel in kernels) + f" {'max diff':>10}")
+    for index in range(args.models):
+        model = random_goal_model(rng, args.goals, args.variables, args.constraints)
+        times = []
+        values = []
+        for kernel in kernels:
+            runs = [pivot_all_goals(model, kernel) for _ in range(args.repeat)]
+            times.append(min(elapsed for elapsed, _ in runs))
+            values.append(runs[0][1])
+        diff = max(float(np.max(np.abs(other - values[0]))) for other in values)
+        print(f"{index:>6} " + " ".join(f"{elapsed * 1000:>10.1f}" for elapsed in times) + f" {diff:>10.2e}")
+    if goal_kernel("auto") is optimize_goal_numba:
+        print("PreemptiveGoalProgramming uses the numba kernel by default here")
+
+
+if __name__ == '__main__':
+    main()
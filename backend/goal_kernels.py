@@ -0,0 +1,145 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def candidate_columns(row, tolerance):
+    """Columns that still improve a goal (coefficient above tolerance), largest coefficient first, ties by index."""
+    columns = np.nonzero(row > tolerance)[0]
+    return columns[np.argsort(-row[columns], kind="mergesort")]
+
+
+def optimize_goal_numpy(tableau, rhs, objectives, objective_rhs, basis, goal, tolerance):
+    """
+    Pivot until goal `goal` is optimal without worsening any higher priority goal.
+
+    Works in place on the constraint rows (`tableau`, `rhs`), the goal objective rows
+    (`objectives`, `objective_rhs`) and the basic column of every row (`basis`). Each pivot is
+    a few whole-array NumPy operations; entries that fall below `tolerance` are zeroed in the
+    objective rows and in every constraint row except the pivot row.
+    """
+    candidates = candidate_columns(objectives[goal], tolerance)
+    position = 0
+    while position < len(candidates):
+        pivot_col = candidates[position]
+        # Entering this column would worsen a higher priority goal
+        if np.any(objectives[:goal, pivot_col] < 0):
+            position += 1
+            continue
+
+        column = tableau[:, pivot_col]
+        positive = column > 0
+        ratios = np.full(len(rhs), np.inf)
+        ratios[positive] = rhs[positive] / column[positive]
+        pivot_row = np.argmin(ratios)
+
+        pivot_element = tableau[pivot_row, pivot_col]
+        tableau[pivot_row] /= pivot_element
+        rhs[pivot_row] /= pivot_element
+        pivot_values = tableau[pivot_row].copy()
+        pivot_rhs = rhs[pivot_row]
+
+        factors = objectives[:, pivot_col].copy()
+        objectives -= np.outer(factors, pivot_values)
+        objective_rhs -= factors * pivot_rhs
+        objectives[np.abs(objectives) < tolerance] = 0
+
+        factors = tableau[:, pivot_col].copy()
+        tableau -= np.outer(factors, pivot_values)
+        rhs -= factors * pivot_rhs
+        tableau[pivot_row] = pivot_values
+        rhs[pivot_row] = pivot_rhs
+        small = np.abs(tableau) < tolerance
+        small[pivot_row] = False
+        tableau[small] = 0
+
+        basis[pivot_row] = pivot_col
+        if np.all(objectives[goal] <= tolerance):
+            return
+        candidates = candidate_columns(objectives[goal], tolerance)
+        position = 0
+
+
+def optimize_goal_loops(tableau, rhs, objectives, objective_rhs, basis, goal, tolerance):
+    """Same as optimize_goal_numpy written as scalar loops, for Numba to compile."""
+    num_rows, num_cols = tableau.shape
+    candidates = compiled_candidate_columns(objectives[goal], tolerance)
+    position = 0
+    while position < len(candidates):
+        pivot_col = candidates[position]
+        valid_pivot = True
+        for j in range(goal):
+            if objectives[j, pivot_col] < 0:
+                valid_pivot = False
+                break
+        if not valid_pivot:
+            position += 1
+            continue
+
+        pivot_row = 0
+        best_ratio = np.inf
+        for j in range(num_rows):
+            if tableau[j, pivot_col] > 0:
+                ratio = rhs[j] / tableau[j, pivot_col]
+                if ratio < best_ratio:
+                    best_ratio = ratio
+                    pivot_row = j
+
+        pivot_element = tableau[pivot_row, pivot_col]
+        for k in range(num_cols):
+            tableau[pivot_row, k] /= pivot_element
+        rhs[pivot_row] /= pivot_element
+
+        for j in range(objectives.shape[0]):
+            factor = objectives[j, pivot_col]
+            for k in range(num_cols):
+                objectives[j, k] -= factor * tableau[pivot_row, k]
+                if abs(objectives[j, k]) < tolerance:
+                    objectives[j, k] = 0
+            objective_rhs[j] -= factor * rhs[pivot_row]
+
+        for j in range(num_rows):
+            if j == pivot_row:
+                continue
+            factor = tableau[j, pivot_col]
+            for k in range(num_cols):
+                tableau[j, k] -= factor * tableau[pivot_row, k]
+                if abs(tableau[j, k]) < tolerance:
+                    tableau[j, k] = 0
+            rhs[j] -= factor * rhs[pivot_row]
+
+        basis[pivot_row] = pivot_col
+        optimal = True
+        for k in range(num_cols):
+            if not objectives[goal, k] <= tolerance:
+                optimal = False
+                break
+        if optimal:
+            return
+        candidates = compiled_candidate_columns(objectives[goal], tolerance)
+        position = 0
+
+
+# Numba is an optional dependency; without it the NumPy kernel is used
+if numba is not None:
+    compiled_candidate_columns = numba.njit(cache=True, nogil=True)(candidate_columns)
+    optimize_goal_numba = numba.njit(cache=True, nogil=True)(optimize_goal_loops)
+else:
+    compiled_candidate_columns = candidate_columns
+    optimize_goal_numba = None
+
+GOAL_KERNELS = ("auto", "numba", "numpy")
+
+
+def goal_kernel(name="auto"):
+    """Return the goal pivoting kernel: "numba", "numpy", or "auto" for Numba when it is installed."""
+    if name not in GOAL_KERNELS:
+        raise ValueError(f"Unknown goal kernel: {name}")
+    if name == "numba" and optimize_goal_numba is None:
+        raise ValueError("The numba goal kernel needs Numba installed")
+    if name == "numpy" or optimize_goal_numba is None:
+        return optimize_goal_numpy
+    return optimize_goal_numba
@@ -1,5 +1,8 @@
 import numpy as np
-from tabulate import tabulate
+
+from goal_kernels import goal_kernel
+from mixed_precision import iterative_refinement, pivot_tolerance
+from workspace_pool import workspace_pool
 
 
 class SimplexSolver:
@@ -158,17 +161,52 @@ class SimplexSolver:
             row.append(self.constraints[i])  # Add RHS value
             self.current_tableau.append(row)
 
-        # Format the tableau using tabulate and add to steps
+        # Format the tableau using tabulate (imported on first use, it is only needed for steps) and add to steps
+        from tabulate import tabulate
         self.tableau_steps.append( tabulate(self.current_tableau, tablefmt="plain",  floatfmt=".3f")) 
 
 
+class GoalWorkspace:
+    """
+    Mutable state of one goal programming solve: the tableau, the goal objective rows,
+    the basis and the recorded steps.
+    """
+
+    def __init__(self, basic_vars):
+        self.tableau = None
+        self.tableau_rhs = None
+        self.goal_objectives = None
+        self.goal_objective_rhs = None
+        self.basic_vars = basic_vars
+        self.tableau_steps = []
+        self.variable_names = []
+        self.unrestricted_indices = []
+        self.buffers = []
+
+    def acquire(self, shape, dtype=np.float64):
+        """Take a zero-filled buffer from workspace_pool; release() gives it back."""
+        array = workspace_pool.acquire(shape, dtype)
+        self.buffers.append(array)
+        return array
+
+    def release(self):
+        """Return every buffer of this workspace to the pool."""
+        for array in self.buffers:
+            workspace_pool.release(array)
+        self.buffers = []
+
+
 class PreemptiveGoalProgramming:
     """
     A class to solve preemptive goal programming problems.
+
+    The instance only holds the model, with read-only arrays. solve() builds a fresh
+    GoalWorkspace and runs every setup step in order on it, so one instance can be solved
+    from several threads at once and repeated calls give the same result.
     """
 
     def __init__(self, goal_coeffs, goal_values, constraint_coeffs, constraint_values,
-                unrestricted_vars, goal_directions):
+                unrestricted_vars, goal_directions, dtype=np.float64, kernel="auto"):
         """
         Initialize the PreemptiveGoalProgramming solver.
 
@@ -179,6 +217,8 @@ class PreemptiveGoalProgramming:
             constraint_values: Right-hand side values for constraints
             unrestricted_vars: Binary vector indicating unrestricted variables
             goal_directions: Direction of each goal ('>=', '<=', or '==')
+            dtype: Pivoting dtype; with float32 the final basis is refined in float64
+            kernel: Goal pivoting kernel, "numba", "numpy" or "auto" (Numba when installed)
         """
         self.goal_coeffs = np.array(goal_coeffs, dtype=float)
         self.goal_values = np.array(goal_values, dtype=float)
@@ -187,223 +227,187 @@ class PreemptiveGoalProgramming:
         self.unrestricted_vars = np.array(unrestricted_vars, dtype=float)
         self.goal_directions = np.array(goal_directions, dtype=str)
 
+        for array in (self.goal_coeffs, self.goal_values, self.constraint_coeffs, self.constraint_values,
+                      self.unrestricted_vars, self.goal_directions):
+            array.setflags(write=False)
+
         self.num_goals = len(goal_coeffs)
         self.num_constraints = len(constraint_coeffs)
         self.num_variables = len(constraint_coeffs[0])
-        self.basic_vars = [i + self.num_variables + self.num_goals for i in
-                           range(self.num_constraints + self.num_goals)]
         self.num_unrestricted = int(np.sum(self.unrestricted_vars == 1))
-        self.tableau_steps = []
-        self.unrestricted_indices = []
+        self.dtype = np.dtype(dtype)
+        self.goal_kernel = goal_kernel(kernel)
+
+    def new_workspace(self):
+        """Create an empty workspace with the starting basis (deviation and slack variables)."""
+        return GoalWorkspace([i + self.num_variables + self.num_goals for i in
+                              range(self.num_constraints + self.num_goals)])
 
-    def create_initial_tableau(self):
+    def solve(self):
+        """
+        Solve the preemptive goal programming problem on a fresh workspace.
+
+        Returns:
+            dict with "optimal_solution" (list of variable values) and "steps" (formatted tableaus)
+        """
+        ws = self.new_workspace()
+        try:
+            self.create_initial_tableau(ws)
+            self.setup_goal_objective_functions(ws)
+            self.handle_unrestricted_variables(ws)
+            self.setup_variable_names(ws)
+            solution = self.optimize(ws)
+        finally:
+            ws.release()
+        return {"optimal_solution": solution.tolist(), "steps": ws.tableau_steps}
+
+    def create_initial_tableau(self, ws):
         """Create the initial tableau for preemptive goal programming."""
-        # Initialize tableau with zeros
+        # Initialize tableau with zeros, with room for the negative parts of unrestricted variables
         total_rows = self.num_constraints + self.num_goals
-        total_cols = self.num_variables + 2 * self.num_goals + self.num_constraints
-        self.tableau = np.zeros((total_rows, total_cols), dtype=float)
-        self.tableau_rhs = np.zeros(total_rows, dtype=float)
+        total_cols = self.num_variables + 2 * self.num_goals + self.num_constraints + self.num_unrestricted
+        ws.tableau = ws.acquire((total_rows, total_cols))
+        ws.tableau_rhs = ws.acquire(total_rows)
 
         # Fill in goal constraints
         for i in range(self.num_goals):
-            self.tableau[i, :self.num_variables] = self.goal_coeffs[i]
-            self.tableau[i, i + self.num_variables] = -1  # Negative deviation
-            self.tableau[i, i + self.num_variables + self.num_goals] = 1  # Positive deviation
-            self.tableau_rhs[i] = self.goal_values[i]
+            ws.tableau[i, :self.num_variables] = self.goal_coeffs[i]
+            ws.tableau[i, i + self.num_variables] = -1  # Negative deviation
+            ws.tableau[i, i + self.num_variables + self.num_goals] = 1  # Positive deviation
+            ws.tableau_rhs[i] = self.goal_values[i]
 
         # Fill in structural constraints
         for i in range(self.num_constraints):
-            self.tableau[i + self.num_goals, :self.num_variables] = self.constraint_coeffs[i]
-            self.tableau[i + self.num_goals, i + self.num_variables + 2 * self.num_goals] = 1  # Slack variable
-            self.tableau_rhs[i + self.num_goals] = self.constraint_values[i]
+            ws.tableau[i + self.num_goals, :self.num_variables] = self.constraint_coeffs[i]
+            ws.tableau[i + self.num_goals, i + self.num_variables + 2 * self.num_goals] = 1  # Slack variable
+            ws.tableau_rhs[i + self.num_goals] = self.constraint_values[i]
 
-    def setup_goal_objective_functions(self):
+    def setup_goal_objective_functions(self, ws):
         """Set up objective functions for each goal priority level."""
         # Initialize objective function matrix
         total_cols = self.num_variables + 2 * self.num_goals + self.num_constraints + self.num_unrestricted
-        self.goal_objectives = np.zeros((self.num_goals, total_cols))
-        self.goal_objective_rhs = np.zeros(self.num_goals)
+        ws.goal_objectives = ws.acquire((self.num_goals, total_cols), dtype=self.dtype)
+        ws.goal_objective_rhs = ws.acquire(self.num_goals, dtype=self.dtype)
 
         # Set up objectives based on goal directions
         for i in range(self.num_goals):
             if self.goal_directions[i] == '>=':
                 # For >= goals, minimize negative deviation
-                self.goal_objectives[i][i + self.num_variables + self.num_goals] = -1
+                ws.goal_objectives[i][i + self.num_variables + self.num_goals] = -1
             elif self.goal_directions[i] == '<=':
                 # For <= goals, minimize positive deviation
-                self.goal_objectives[i][i + self.num_variables] = -1
+                ws.goal_objectives[i][i + self.num_variables] = -1
             else:  # '=='
                 # For == goals, minimize both deviations
-                self.goal_objectives[i][i + self.num_variables] = -1
-                self.goal_objectives[i][i + self.num_variables + self.num_goals] = -1
+                ws.goal_objectives[i][i + self.num_variables] = -1
+                ws.goal_objectives[i][i + self.num_variables + self.num_goals] = -1
 
-    def handle_unrestricted_variables(self):
+    def handle_unrestricted_variables(self, ws):
         """Handle unrestricted variables."""
         if self.num_unrestricted > 0:
+            column = self.num_variables + 2 * self.num_goals + self.num_constraints
             for i in range(len(self.unrestricted_vars)):
                 if self.unrestricted_vars[i] == 1:
-                    # For each unrestricted variable, add its negative counterpart
-                    negative_coeff = np.array(self.tableau[:, i]) * -1
-                    self.tableau = np.hstack((self.tableau, negative_coeff.reshape(-1, 1)))
-                    self.basic_vars.append(self.num_variables + self.num_constraints + 2 * self.num_goals + i)
+                    # For each unrestricted variable, fill its negative counterpart into the spare columns
+                    ws.tableau[:, column] = ws.tableau[:, i] * -1
+                    column += 1
+                    ws.basic_vars.append(self.num_variables + self.num_constraints + 2 * self.num_goals + i)
 
         # Track indices of unrestricted variables
-        self.unrestricted_indices = [j for j in range(len(self.unrestricted_vars)) if self.unrestricted_vars[j] == 1]
+        ws.unrestricted_indices = [j for j in range(len(self.unrestricted_vars)) if self.unrestricted_vars[j] == 1]
 
-    def setup_variable_names(self):
+    def setup_variable_names(self, ws):
         """Set up names for variables in the tableau for display purposes."""
-        self.variable_names = [f'x{i+1}' for i in range(self.num_variables)]
-        self.variable_names.insert(0, 'basic')  # Empty cell for row labels
+        ws.variable_names = [f'x{i+1}' for i in range(self.num_variables)]
+        ws.variable_names.insert(0, 'basic')  # Empty cell for row labels
 
         # Add positive deviation variable names
         for i in range(self.num_goals):
-            self.variable_names.append(f'S{i}+')
+            ws.variable_names.append(f'S{i}+')
 
         # Add negative deviation variable names
         for i in range(self.num_goals):
-            self.variable_names.append(f'S{i}-')
+            ws.variable_names.append(f'S{i}-')
 
         # Add slack variable names
         for i in range(self.num_constraints):
-            self.variable_names.append(f'S{i + self.num_goals}')
+            ws.variable_names.append(f'S{i + self.num_goals}')
 
         # Add unrestricted variable names
         for i in range(self.num_unrestricted):
-            self.variable_names.append(f"x{self.unrestricted_indices[i]}'")
+            ws.variable_names.append(f"x{ws.unrestricted_indices[i]}'")
 
         # Add RHS column label
-        self.variable_names.append('RHS')
+        ws.variable_names.append('RHS')
 
-    def record_tableau_step(self):
+    def record_tableau_step(self, ws):
         """Record the current state of the tableau for display."""
         current_tableau = []
 
         # Add header row with variable names
-        current_tableau.append(self.variable_names)
+        current_tableau.append(ws.variable_names)
 
         # Add objective function rows for each goal
         for j in range(self.num_goals):
             z_row = [f"Z{j}"]
-            for i in range(len(self.goal_objectives[0])):
-                z_row.append(self.goal_objectives[j, i])
-            z_row.append(self.goal_objective_rhs[j])
+            for i in range(len(ws.goal_objectives[0])):
+                z_row.append(ws.goal_objectives[j, i])
+            z_row.append(ws.goal_objective_rhs[j])
             current_tableau.append(z_row)
 
         # Add constraint rows
-        for i in range(len(self.tableau)):
-            row = self.tableau[i].tolist()
-            row.insert(0, self.variable_names[self.basic_vars[i] + 1])  # Add basic variable label
-            row.append(self.tableau_rhs[i])  # Add RHS value
+        for i in range(len(ws.tableau)):
+            row = ws.tableau[i].tolist()
+            row.insert(0, ws.variable_names[ws.basic_vars[i] + 1])  # Add basic variable label
+            row.append(ws.tableau_rhs[i])  # Add RHS value
             current_tableau.append(row)
 
-        # Format the tableau using tabulate and add to steps
-        self.tableau_steps.append (tabulate(current_tableau, tablefmt="plain", floatfmt=".3f")) 
-
-    def solve(self):
-        """Solve the preemptive goal programming problem."""
-        tolerance = 1e-9
-        self.record_tableau_step()
+        # Format the tableau using tabulate (imported on first use, it is only needed for steps) and add to steps
+        from tabulate import tabulate
+        ws.tableau_steps.append (tabulate(current_tableau, tablefmt="plain", floatfmt=".3f")) 
+
+    def optimize(self, ws):
+        """Pivot the goals in priority order on a workspace whose tableau is set up."""
+        # In the pivoting dtype, so every kernel compares against exactly the same value
+        tolerance = self.dtype.type(pivot_tolerance(self.dtype))
+
+        # The tableau is built in float64; keep those rows to refine the final basis when pivoting in float32
+        initial_tableau = ws.tableau
+        initial_rhs = ws.tableau_rhs
+        if self.dtype != np.float64:
+            ws.tableau = ws.acquire(initial_tableau.shape, dtype=self.dtype)
+            ws.tableau[:] = initial_tableau
+            ws.tableau_rhs = ws.acquire(initial_rhs.shape, dtype=self.dtype)
+            ws.tableau_rhs[:] = initial_rhs
+        self.record_tableau_step(ws)
 
         # Update objectives with tableau values
         for i in range(self.num_goals):
-            self.goal_objectives[i] += self.tableau[i]
-            self.goal_objective_rhs[i] += self.tableau_rhs[i]
+            ws.goal_objectives[i] += ws.tableau[i]
+            ws.goal_objective_rhs[i] += ws.tableau_rhs[i]
 
-        # Process each goal by priority
+        # Process each goal by priority; the kernel pivots in place and tracks the basis of every row
+        basis = np.array(ws.basic_vars[:self.num_constraints + self.num_goals], dtype=np.int64)
         for i in range(self.num_goals):
-            # Find columns with positive coefficients in the current objective
-            candidate_cols = []
-            for j in range(len(self.goal_objectives[i])):
-                if self.goal_objectives[i, j] > tolerance:
-                    candidate_cols.append(j)
-                else:
-                    candidate_cols.append(-1)
-
-            # Sort columns by coefficient value (descending)
-            sorted_cols = sorted(candidate_cols, key=lambda x: self.goal_objectives[i, x], reverse=True)
-            sorted_cols = [x for x in sorted_cols if x != -1]
-
-            # Perform pivoting operations until objective is optimized
-            while sorted_cols:
-                pivot_col = sorted_cols[0]
-                valid_pivot = True
-
-                # Check if pivot maintains feasibility for higher priority goals
-                for j in range(i):
-                    if self.goal_objectives[j, pivot_col] < 0:
-                        valid_pivot = False
-                        break
-
-                if not valid_pivot:
-                    sorted_cols.pop(0)
-                    continue
-
-                # Find pivot row using minimum ratio test
-                ratios = np.zeros(self.num_constraints + self.num_goals)
-                for j in range(self.num_constraints + self.num_goals):
-                    if self.tableau[j, pivot_col] > 0:
-                        ratios[j] = self.tableau_rhs[j] / self.tableau[j, pivot_col]
-                    else:
-                        ratios[j] = np.inf
-
-                pivot_row = np.argmin(ratios)
-                pivot_element = self.tableau[pivot_row, pivot_col]
-
-                # Perform pivot operation
-                self.tableau[pivot_row] /= pivot_element
-                self.tableau_rhs[pivot_row] /= pivot_element
-
-                # Update objective rows
-                for j in range(self.num_goals):
-                    factor = self.goal_objectives[j, pivot_col]
-                    self.goal_objectives[j] -= factor * self.tableau[pivot_row]
-                    self.goal_objective_rhs[j] -= factor * self.tableau_rhs[pivot_row]
-
-                    # Clean up small values
-                    for k in range(len(self.goal_objectives[i])):
-                        if abs(self.goal_objectives[j, k]) < tolerance:
-                            self.goal_objectives[j, k] = 0
-
-                # Update constraint rows
-                for j in range(self.num_constraints + self.num_goals):
-                    if j != pivot_row:
-                        factor = self.tableau[j, pivot_col]
-                        self.tableau[j] -= factor * self.tableau[pivot_row]
-                        self.tableau_rhs[j] -= factor * self.tableau_rhs[pivot_row]
-
-                        # Clean up small values
-                        for k in range(len(self.tableau[j])):
-                            if abs(self.tableau[j, k]) < tolerance:
-                                self.tableau[j, k] = 0.0
-
-                # Update basic variables
-                self.basic_vars[pivot_row] = pivot_col
-
-                # Check if current objective is optimized
-                if np.all(self.goal_objectives[i] <= tolerance):
-                    break
-                else:
-                    # Recalculate candidate columns
-                    candidate_cols = []
-                    for j in range(len(self.goal_objectives[i])):
-                        if self.goal_objectives[i, j] > tolerance:
-                            candidate_cols.append(j)
-                        else:
-                            candidate_cols.append(-1)
-                    sorted_cols = sorted(candidate_cols, key=lambda x: self.goal_objectives[i, x], reverse=True)
-                    sorted_cols = [x for x in sorted_cols if x != -1]
+            self.goal_kernel(ws.tableau, ws.tableau_rhs, ws.goal_objectives, ws.goal_objective_rhs, basis, i,
+                             tolerance)
+            ws.basic_vars[:len(basis)] = basis.tolist()
 
             # Record tableau after optimizing this goal
-            self.record_tableau_step()
+            self.record_tableau_step(ws)
+
+        if self.dtype != np.float64:
+            basis = ws.basic_vars[:self.num_constraints + self.num_goals]
+            ws.tableau_rhs = iterative_refinement(initial_tableau[:, basis], initial_rhs, ws.tableau_rhs, self.dtype)
 
         # Prepare solution vector
         solution = np.zeros(self.num_variables)
         for i in range(self.num_constraints + self.num_goals):
-            if self.basic_vars[i] < self.num_variables:
-                solution[self.basic_vars[i]] = self.tableau_rhs[i]
-            elif self.basic_vars[i] >= self.num_variables + self.num_constraints + 2 * self.num_goals:
-                idx = self.basic_vars[i] - self.num_constraints - 2 * self.num_goals
-                solution[idx] = self.tableau_rhs[i]
+            if ws.basic_vars[i] < self.num_variables:
+                solution[ws.basic_vars[i]] = ws.tableau_rhs[i]
+            elif ws.basic_vars[i] >= self.num_variables + self.num_constraints + 2 * self.num_goals:
+                idx = ws.basic_vars[i] - self.num_constraints - 2 * self.num_goals
+                solution[idx] = ws.tableau_rhs[i]
 
         return solution
 
@@ -427,25 +431,13 @@ def main():
     )
 
     # Set up and solve the model
-    solver.create_initial_tableau()
-    solver.setup_goal_objective_functions()
-    solver.handle_unrestricted_variables()
-    solver.setup_variable_names()
-
-    # Solve and get the solution
-    solution = solver.solve()
+    result = solver.solve()
 
     print("\nTableau Steps:")
 
-    for step in solver.tableau_steps:
+    for step in result["steps"]:
         print(step)
     print("\nOptimal Solution:")
-    print(solution)
-
-
-    k = {"optimal_solution": solution.tolist(), 
-        "steps":solver.tableau_steps
-    }
-    print(k)
+    print(result["optimal_solution"])
 
 # main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Production serving configuration for the solver backend.
+
+Run from the backend directory with:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+Each gunicorn worker serves requests on a few threads and hands solves to its own
+process pool (LP_SOLVE_WORKERS), which is what enforces the per-request LP_SOLVE_TIMEOUT.
+
+The app is imported once in the master and workers are forked from it (LP_PRELOAD_APP=0 turns
+this off), and every worker runs a dummy solve through its pool before it takes traffic.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('LP_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('LP_HTTP_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('LP_HTTP_THREADS', 4))
+
+# Solves run in a per-worker process pool so they can be timed out
+os.environ.setdefault('LP_SOLVE_WORKERS', '1')
+
+# Pre-fork: workers start with Flask, NumPy and the solvers already imported
+preload_app = os.environ.get('LP_PRELOAD_APP', '1') == '1'
+
+
+def post_fork(server, worker):
+    # Pre-warm: start the worker's solve pool and run a dummy solve before the first request
+    from app import warm_up
+    warm_up()
+
+
+# Leave room over the solve timeout so the app answers 504 before gunicorn kills the worker
+timeout = int(float(os.environ.get('LP_SOLVE_TIMEOUT', 30))) + 30
+graceful_timeout = 30
+keepalive = 5
+
+# Request limits; the body size limit is enforced by the app (LP_MAX_REQUEST_BYTES)
+limit_request_line = 8190
+limit_request_fields = 100
+limit_request_field_size = 8190
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LP_LOG_LEVEL', 'info').lower()
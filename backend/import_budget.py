@@ -0,0 +1,62 @@
+"""
+Import-time budget check for the solver backend.
+
+Imports the app in fresh interpreters under `python -X importtime`, and fails (exit status 1)
+when the median import time is over budget or a module that should load lazily was imported
+at startup. Run it from the backend directory, e.g. in CI:
+
+    python import_budget.py --budget-ms 400 --runs 7
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Only needed for steps, integer models, racing, decomposition, IIS, Pareto fronts or scenarios; app.py imports
+# them on first use
+LAZY_MODULES = ["tabulate", "branch_and_bound", "concurrent_optimizer", "decomposition", "infeasibility",
+                "pareto_front", "stochastic", "concurrent.futures.process"]
+
+
+def import_times(module):
+    """Import `module` in a fresh interpreter and return {imported module: cumulative microseconds}."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=400)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest top-level imports to report")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(times[args.module] for times in runs) / 1000
+    print(f"import {args.module}: {median_ms:.1f} ms median of {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    slowest = sorted(runs[-1].items(), key=lambda item: -item[1])
+    for name, cumulative in [item for item in slowest if "." not in item[0] and item[0] != args.module][:args.top]:
+        print(f"  {name:<30} {cumulative / 1000:>8.1f} ms")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"import time {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    eager = [name for name in LAZY_MODULES if name in runs[-1]]
+    if eager:
+        failures.append(f"imported at startup but meant to load lazily: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import numpy as np
+
+from lp_model import LinearProgrammingModel
+
+
+def find_iis(constraints, rhs, constraint_types, var_restrictions):
+    """
+    Find an irreducible infeasible subsystem (IIS) of constraint rows by deletion filtering.
+
+    Each row is dropped in turn; if the rest is still infeasible the row stays out, otherwise
+    it is put back. The remaining rows are infeasible together but feasible without any one
+    of them. The model is kept in a LinearProgrammingModel with a zero objective, so every
+    basis is dual feasible and each drop or re-add is re-solved warm by dual simplex instead
+    of from scratch. Variable sign restrictions are always kept and are not part of the IIS.
+
+    Returns a dict with "rows" (indices into the original rows, or None when the model is
+    feasible) and "solves", the number of LP re-solves used.
+    """
+    constraints = np.array(constraints, dtype=float)
+    rhs = np.array(rhs, dtype=float)
+    model = LinearProgrammingModel(np.zeros(constraints.shape[1]), constraints, rhs, constraint_types,
+                                   var_restrictions)
+    solves = 1
+    if model.solve().get("error") != "Infeasible solution":
+        return {"rows": None, "solves": solves}
+
+    # rows[k] is the original index of the model's k-th row; re-added rows move to the end
+    rows = list(range(len(rhs)))
+    for row in range(len(rhs)):
+        position = rows.index(row)
+        model.remove_constraint(position)
+        rows.pop(position)
+        solves += 1
+        if model.solve().get("error") != "Infeasible solution":
+            model.add_constraint(constraints[row], constraint_types[row], rhs[row])
+            rows.append(row)
+    return {"rows": sorted(rows), "solves": solves}
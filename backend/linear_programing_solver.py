@@ -1,105 +1,420 @@
+import os
+import tempfile
+import time
+from functools import lru_cache
+
 import numpy as np
 
+from exact_arithmetic import ExactSimplex
+from mixed_precision import iterative_refinement, pivot_tolerance
+from workspace_pool import workspace_pool
+
+# Rows eliminated per block by an in-memory pivot, which bounds its scratch buffer
+IN_MEMORY_BLOCK_ROWS = 64
+
+@lru_cache(maxsize=256)
+def standard_headers(num_vars, num_slack, num_artificial=0):
+    # Column labels only depend on the shape, so they are built once per shape and shared
+    return tuple(
+        [f"x{i+1}" for i in range(num_vars)] +
+        [f"s{i+1}" for i in range(num_slack)] +
+        [f"A{i+1}" for i in range(num_artificial)] +
+        ["RHS"]
+    )
+
+
+
+class SolveWorkspace:
+    def __init__(self, num_constraints, trace=False):
+        # Everything a solve mutates lives here, one workspace per solve() call
+        self.steps = []
+        # Open steps_file of an out-of-core solve; its steps are streamed there instead of kept in steps
+        self.steps_stream = None
+        self.basic_vars = [f"s{i+1}" for i in range(num_constraints)]
+        # Original float64 rows, kept when pivoting in a lower dtype
+        self.initial_rows = None
+        # Entering column of the last pivot loop that found no leaving row; its tableau column gives the ray
+        self.unbounded_column = None
+        self.scratch_files = []
+        # Column layout set by set_layout, and the starting unit column of every row
+        self.var_columns = None
+        self.slack_columns = None
+        self.dual_columns = None
+        self.row_signs = None
+        self.unit_columns = None
+        # Tableaus and scratch buffers taken from workspace_pool, given back by release()
+        self.buffers = []
+        self.scratch_buffers = {}
+        # Basic column of every constraint row, and with tracing on the pivots as (row, entering, leaving, seconds)
+        self.basis = None
+        self.trace = [] if trace else None
+        self.trace_clock = time.perf_counter()
+
+
+
+    def acquire(self, shape, dtype=np.float64):
+        array = workspace_pool.acquire(shape, dtype)
+        self.buffers.append(array)
+        return array
+
+
+
+    def scratch(self, name, shape, dtype):
+        # Scratch buffers are reused by every pivot of the solve while their shape and dtype stay the same
+        array = self.scratch_buffers.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = self.scratch_buffers[name] = self.acquire(shape, dtype)
+        return array
+
+
+
+    def release(self):
+        for array in self.buffers:
+            workspace_pool.release(array)
+        self.buffers = []
+        self.scratch_buffers = {}
+
+
+
 class LinearProgrammingSolver:
-    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, method="simplex", type="max"):
+    # The instance only holds the read-only model and options; solve() pivots on a fresh SolveWorkspace,
+    # so one solver can be solved from several threads at once and every call gives the same result
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, method="simplex", type="max",
+                 out_of_core=False, scratch_dir=None, block_rows=4096, precision="float",
+                 dtype=np.float64, trace=False, steps_file=None):
         self.objective = np.array(objective, dtype=float)
         self.constraints = np.array(constraints, dtype=float)
         self.rhs = np.array(rhs, dtype=float)
-        self.constraint_types = constraint_types
-        self.var_restrictions = var_restrictions
+        self.constraint_types = tuple(constraint_types)
+        self.var_restrictions = tuple(var_restrictions)
         self.method = method.lower()
         self.big_m = 1e2 
-        self.steps = []
-        self.basic_vars = [f"s{i+1}" for i in range(len(self.constraints))]  
+        # Pivoting dtype; float32 halves memory traffic and the final basis is refined in float64
+        self.dtype = np.dtype(dtype)
+        self.tolerance = pivot_tolerance(self.dtype)
         self.type = type.lower()
+        # Out-of-core mode keeps the tableau in np.memmap files under scratch_dir and pivots block_rows rows at a time
+        self.out_of_core = out_of_core
+        self.scratch_dir = scratch_dir
+        self.block_rows = block_rows
+        # Out-of-core steps are streamed to steps_file when one is given and never kept in result["steps"]
+        self.steps_file = steps_file
+        # "exact" re-checks the float answer in rational arithmetic and repairs it if needed
+        self.precision = precision.lower()
+        # Trace mode records every pivot in result["trace"], for solve_trace.write_trace and trace_replay.py
+        self.trace = trace
 
         if self.type == "min":
             self.objective = -self.objective
+        for array in (self.objective, self.constraints, self.rhs):
+            array.setflags(write=False)
 
 
     def solve(self):
-        if self.method == "simplex":
-            if 'unrestricted' in self.var_restrictions:
-                return self.simplex_method_with_unrestricted_variables()
+        ws = SolveWorkspace(len(self.constraints), trace=self.trace)
+        if self.out_of_core and self.steps_file is not None:
+            ws.steps_stream = open(self.steps_file, "w")
+        try:
+            if self.method == "simplex":
+                if 'unrestricted' in self.var_restrictions:
+                    result = self.simplex_method_with_unrestricted_variables(ws)
+                else:
+                    result = self.simplex_method(ws)
+            elif self.method == "big-m":
+                result = self.big_m_method(ws)
+            elif self.method == "two-phase":
+                result = self.two_phase_method(ws)
+            elif self.method == "goal-programming":
+                return self.goal_programming()
             else:
-                return self.simplex_method()
-        elif self.method == "big-m":
-            return self.big_m_method()
-        elif self.method == "two-phase":
-            return self.two_phase_method()
-        elif self.method == "goal-programming":
-            return self.goal_programming()
+                raise ValueError("Invalid method selected")
+        finally:
+            if ws.steps_stream is not None:
+                ws.steps_stream.close()
+            self.release_scratch(ws)
+            ws.release()
+        if ws.steps_stream is not None:
+            result["steps_file"] = self.steps_file
+        if self.precision == "exact":
+            result = self.exact_solution(ws, result)
+        if ws.trace is not None:
+            result["trace"] = self.trace_record(ws, result)
+        return result
+
+
+
+    def trace_record(self, ws, result):
+        return {
+            "method": self.method,
+            "dtype": self.dtype.name,
+            "precision": self.precision,
+            "optimal_value": result.get("optimal_value"),
+            "error": result.get("error"),
+            "pivots": [[row, entering, leaving] for row, entering, leaving, _ in ws.trace],
+            "seconds": [seconds for *_, seconds in ws.trace]}
+
+
+
+    def exact_solution(self, ws, result):
+        # Fast path: the float solver's final basis is factored once in exact arithmetic and verified (or repaired)
+        model = ExactSimplex(self.objective, self.constraints, self.rhs, self.constraint_types, self.var_restrictions)
+        basis = self.exact_basis(ws, model) if result.get("solution") is not None else None
+        exact = model.solve(basis_hint=basis)
+        if exact["status"] != "optimal":
+            return {
+                "solution": None,
+                "optimal_value": None,
+                "error": "Infeasible solution" if exact["status"] == "infeasible" else "Unbounded solution",
+                "steps": ws.steps}
+        optimal_value = -exact["optimal_value"] if self.type == "min" else exact["optimal_value"]
+        duals = [-dual if self.type == "min" else dual for dual in exact["duals"]]
+        return {
+            "solution": [float(x) for x in exact["solution"]],
+            "optimal_value": float(optimal_value),
+            "exact_solution": [str(x) for x in exact["solution"]],
+            "exact_optimal_value": str(optimal_value),
+            "duals": [float(dual) for dual in duals],
+            "slacks": [float(slack) for slack in exact["slacks"]],
+            "verified": exact["verified"],
+            "steps": ws.steps}
+
+
+
+    def exact_basis(self, ws, model):
+        # Tableau columns of the tracked basis in ExactSimplex's numbering; artificials have no counterpart and are dropped
+        columns = {}
+        for j, pairs in enumerate(ws.var_columns):
+            for col, sign in pairs:
+                exact_col = next((exact_col for exact_col, exact_sign in model.var_columns[j] if exact_sign == sign), None)
+                if exact_col is not None:
+                    columns[col] = exact_col
+        for i, col in enumerate(ws.slack_columns):
+            if col is not None and i in model.slack_columns:
+                columns[col] = model.slack_columns[i]
+        return [columns[col] for col in ws.basis if col in columns]
+
+
+
+    def allocate_tableau(self, ws, shape, dtype=np.float64):
+        if not self.out_of_core:
+            return ws.acquire(shape, dtype)
+        fd, path = tempfile.mkstemp(suffix=".tableau", dir=self.scratch_dir)
+        os.close(fd)
+        ws.scratch_files.append(path)
+        # np.memmap in w+ mode starts zero-filled, like np.zeros
+        return np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+
+
+
+    def working_tableau(self, ws, tableau):
+        # Tableaus are built in float64; a lower pivoting dtype keeps the original rows for refinement
+        if self.dtype == np.float64:
+            return tableau
+        ws.initial_rows = np.array(tableau[1:], dtype=np.float64)
+        working = self.allocate_tableau(ws, tableau.shape, dtype=self.dtype)
+        working[:] = tableau
+        return working
+
+
+
+    def refined_tableau(self, ws, tableau, basis, costs):
+        # Upcast the final low-precision tableau and refine the basic values against the original rows
+        if self.dtype == np.float64:
+            return tableau
+        refined = np.array(tableau, dtype=np.float64)
+        values = iterative_refinement(ws.initial_rows[:, basis], ws.initial_rows[:, -1], refined[1:, -1], self.dtype)
+        refined[1:, -1] = values
+        refined[1:, basis] = np.eye(len(basis))
+        refined[0, basis] = 0
+        refined[0, -1] = costs[basis] @ values
+        return refined
+
+
+
+    def release_scratch(self, ws):
+        for path in ws.scratch_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        ws.scratch_files = []
+
+
+
+    def pivot(self, ws, tableau, pivot_row, pivot_col):
+        if ws.trace is not None:
+            # Seconds since the previous pivot, so pricing and the ratio test are counted with the pivot they chose
+            now = time.perf_counter()
+            ws.trace.append((int(pivot_row), int(pivot_col), int(ws.basis[pivot_row - 1]), now - ws.trace_clock))
+            ws.trace_clock = now
+        tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
+        pivot_values = ws.scratch("pivot_row", (tableau.shape[1],), tableau.dtype)
+        pivot_values[:] = tableau[pivot_row, :]
+        block_rows = self.row_block(len(tableau))
+        update = ws.scratch("update", (block_rows, tableau.shape[1]), tableau.dtype)
+        # Eliminate the pivot column a block of rows at a time so out-of-core tableaus only page in one block
+        for start in range(0, len(tableau), block_rows):
+            end = min(start + block_rows, len(tableau))
+            block = tableau[start:end]
+            np.multiply.outer(block[:, pivot_col], pivot_values, out=update[:end - start])
+            block -= update[:end - start]
+        tableau[pivot_row, :] = pivot_values
+
+
+
+    def row_block(self, num_rows):
+        # Out-of-core tableaus are paged block_rows rows at a time; in memory a short block keeps scratch small
+        return min(self.block_rows if self.out_of_core else IN_MEMORY_BLOCK_ROWS, num_rows)
+
+
+
+    def log_step(self, ws, tableau, headers, columns=None):
+        # Out-of-core steps would be as large as the tableau itself, so they only go to steps_file, if any
+        if self.out_of_core and ws.steps_stream is None:
+            return
+        # Only the objective row is copied, to show it in the problem's own sense for min problems
+        objective_row = tableau[0] if columns is None else tableau[0, columns]
+        if(self.type == "min"):
+            objective_row = np.where(np.isclose(objective_row, 0, atol=1e-10), objective_row, -objective_row)
+        if columns is not None:
+            headers = [h for h, keep in zip(headers, columns) if keep]
+        lines = self.format_tableau(ws, objective_row, tableau, headers, columns)
+        if ws.steps_stream is not None:
+            for line in lines:
+                ws.steps_stream.write(line + "\n")
+            ws.steps_stream.write("\n")
         else:
-            raise ValueError("Invalid method selected")
+            ws.steps.append("\n".join(lines) + "\n")
 
 
 
-    def log_step(self, tableau, headers):
-        modified_tableau = tableau.copy()
-        if(self.type == "min"):
-            modified_tableau[0] = [x if np.isclose(x, 0, atol=1e-10) else -x for x in modified_tableau[0]]
-        formatted_table = self.format_tableau(modified_tableau, headers)
-        self.steps.append(formatted_table)
-        
+    def format_tableau(self, ws, objective_row, tableau, headers, columns=None):
+        # Yields the step's lines, reading the constraint rows one block at a time
+        yield "Basic\t" + "\t".join(headers)
+        yield "Z\t" + "\t".join(map(lambda x: f"{x:.2f}", objective_row))
+        block_rows = self.row_block(len(tableau))
+        for start in range(1, len(tableau), block_rows):
+            block = tableau[start:start + block_rows]
+            if columns is not None:
+                block = block[:, columns]
+            for basic_var, row in zip(ws.basic_vars[start - 1:], block):
+                yield basic_var + "\t" + "\t".join(map(lambda x: f"{x:.2f}", row))
+
+
+
+    def set_layout(self, ws, var_columns, slack_columns, dual_columns, row_signs=None):
+        # var_columns[j]: (column, sign) pairs whose signed sum is x_j
+        # slack_columns[i]: slack/surplus column of row i, or None for '=' rows
+        # dual_columns[i]: (column, coefficient) of the unit column whose reduced cost prices row i
+        # row_signs[i]: -1 when row i was negated to make its rhs non-negative
+        ws.var_columns = var_columns
+        ws.slack_columns = slack_columns
+        ws.dual_columns = dual_columns
+        ws.row_signs = row_signs if row_signs is not None else [1] * len(slack_columns)
+
+
+
+    def extract_results(self, ws, tableau, basis, column_costs):
+        # One pass over the tracked basis reads primal values, slacks and duals; column_costs are the
+        # max-sense costs of the objective row, needed to turn reduced costs back into duals
+        values = np.zeros(tableau.shape[1] - 1)
+        values[basis] = tableau[1:, -1]
+
+        solution = np.zeros(len(ws.var_columns))
+        for j, columns in enumerate(ws.var_columns):
+            for col, sign in columns:
+                solution[j] += sign * values[col]
+
+        slacks = [0.0 if col is None else float(values[col]) for col in ws.slack_columns]
+
+        duals = []
+        for (col, coefficient), sign in zip(ws.dual_columns, ws.row_signs):
+            dual = (tableau[0, col] + column_costs[col]) / coefficient * sign
+            duals.append(float(-dual if self.type == "min" else dual))
+
+        return solution, slacks, duals
+
+
 
+    def unbounded_ray(self, ws, tableau, basis, pivot_col):
+        # Raising pivot_col by t moves each basic variable by -t times its (non-positive) entry, so x + t*ray stays feasible
+        direction = np.zeros(tableau.shape[1] - 1)
+        direction[pivot_col] = 1
+        direction[basis] = -np.asarray(tableau[1:, pivot_col], dtype=np.float64)
+        ray = np.zeros(len(ws.var_columns))
+        for j, columns in enumerate(ws.var_columns):
+            for col, sign in columns:
+                ray[j] += sign * direction[col]
+        return ray.tolist()
 
 
-    def format_tableau(self, tableau, headers):
-        table_str = "Basic\t" + "\t".join(headers) + "\n"
-        for i, row in enumerate(tableau):
-            basic_var = "Z" if i == 0 else self.basic_vars[i-1]
-            table_str += basic_var + "\t" + "\t".join(map(lambda x: f"{x:.2f}", row)) + "\n"
-        return table_str
+
+    def unbounded_result(self, ws, tableau, basis, pivot_col):
+        return {
+            "solution": None,
+            "optimal_value": None,
+            "error": "Unbounded solution",
+            "ray": self.unbounded_ray(ws, tableau, basis, pivot_col),
+            "steps": ws.steps}
+
 
 
+    def farkas_certificate(self, ws, tableau, artificial_start):
+        # Phase I duals y = c_B B^-1, read off each row's unit column (its slack for '<=', else its artificial).
+        # They satisfy y A >= 0 and y b < 0 in the original rows, with y_i >= 0 on '<=' and y_i <= 0 on '>=' rows.
+        certificate = []
+        for col, sign in zip(ws.unit_columns, ws.row_signs):
+            phase_one_cost = -1 if col >= artificial_start else 0
+            certificate.append(float((tableau[0, col] + phase_one_cost) * sign))
+        return certificate
 
-    def simplex_method(self):
+
+
+    def simplex_method(self, ws):
         num_vars = len(self.objective)
         num_constraints = len(self.constraints)
         
-        tableau = np.zeros((num_constraints + 1, num_vars + num_constraints + 1))
+        tableau = self.allocate_tableau(ws, (num_constraints + 1, num_vars + num_constraints + 1))
         
         tableau[1:, :num_vars] = self.constraints
         tableau[1:, num_vars:num_vars+num_constraints] = np.eye(num_constraints)
         tableau[1:, -1] = self.rhs
         tableau[0, :num_vars] = -self.objective
         
-        headers = [f"x{i+1}" for i in range(num_vars)] + [f"s{i+1}" for i in range(num_constraints)] + ["RHS"]
+        headers = standard_headers(num_vars, num_constraints)
+        basis = ws.basis = np.arange(num_vars, num_vars + num_constraints)
+        self.set_layout(ws, [[(j, 1)] for j in range(num_vars)],
+                        [num_vars + i for i in range(num_constraints)],
+                        [(num_vars + i, 1) for i in range(num_constraints)])
         
-        self.log_step(tableau, headers)
+        tableau = self.working_tableau(ws, tableau)
+        self.log_step(ws, tableau, headers)
         
 
-        while np.any(tableau[0, :-1] < 0):
+        while np.any(tableau[0, :-1] < -self.tolerance):
             pivot_col = np.argmin(tableau[0, :-1])
-            ratios = tableau[1:, -1] / tableau[1:, pivot_col]
-            valid_ratios = [ratios[i] if tableau[i + 1, pivot_col] > 0 else np.inf for i in range(len(ratios))]
-            pivot_row = np.argmin(valid_ratios) + 1
+            column_entries = tableau[1:, pivot_col]
+            valid_rows = column_entries > self.tolerance
+            # Only rows with a positive entry are divided, so zero entries never raise a divide warning
+            ratios = np.full(len(column_entries), np.inf)
+            ratios[valid_rows] = tableau[1:, -1][valid_rows] / column_entries[valid_rows]
+            pivot_row = np.argmin(ratios) + 1
             
             # error
-            if tableau[pivot_row, pivot_col] <= 0:
-                return {
-                    "solution": None,
-                    "optimal_value": None,
-                    "error": "Unbounded solution",
-                    "steps": self.steps}
+            if tableau[pivot_row, pivot_col] <= self.tolerance:
+                return self.unbounded_result(ws, tableau, basis, pivot_col)
             
-            tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
-            
-            for i in range(len(tableau)):
-                if i != pivot_row:
-                    tableau[i, :] -= tableau[i, pivot_col] * tableau[pivot_row, :]
+            self.pivot(ws, tableau, pivot_row, pivot_col)
             
 
-            self.basic_vars[pivot_row - 1] = headers[pivot_col]
+            basis[pivot_row - 1] = pivot_col
+            ws.basic_vars[pivot_row - 1] = headers[pivot_col]
             
-            self.log_step(tableau, headers)
+            self.log_step(ws, tableau, headers)
 
-        solution = np.zeros(num_vars)
-        for i in range(num_vars):
-            col = tableau[1:, i]
-            if np.sum(col == 1) == 1 and np.sum(col == 0) == len(col) - 1:
-                row_index = np.where(col == 1)[0][0] + 1
-                solution[i] = tableau[row_index, -1]
+        costs = np.concatenate((self.objective, np.zeros(num_constraints)))
+        tableau = self.refined_tableau(ws, tableau, basis, costs)
+        solution, slacks, duals = self.extract_results(ws, tableau, basis, costs)
 
         if self.type == "min":
             optimal_value = -tableau[0, -1]
@@ -107,226 +422,219 @@ class LinearProgrammingSolver:
             optimal_value = tableau[0, -1]
         
         
-        return {"solution": solution.tolist(), "optimal_value": optimal_value, "steps": self.steps}
+        return {"solution": solution.tolist(), "optimal_value": optimal_value, "duals": duals, "slacks": slacks,
+                "steps": ws.steps}
 
 
 
-    def big_m_method(self):
+    def build_standard_tableau(self, ws):
         num_vars = len(self.objective)
         num_constraints = len(self.constraints)
-        surplus_vars = []
-        artificial_vars = []
-        for i, c_type in enumerate(self.constraint_types):
-            if c_type == '=':  
-                artificial_vars.append(i)
-            elif c_type == '>=' or c_type == '<=':  
-                surplus_vars.append(i)  
-                artificial_vars.append(i)
-        num_surplus = len(surplus_vars)
-        num_artificial = len(artificial_vars)
-        total_vars = num_vars + num_surplus + num_artificial
-        tableau = np.zeros((num_constraints + 1, total_vars + 1))
-        tableau[1:, :num_vars] = self.constraints
-        tableau[1:, -1] = self.rhs
-        surplus_start = num_vars
-        artificial_start = num_vars + num_surplus
-
-        for i, row in enumerate(surplus_vars):
-            if self.constraint_types[row] == '<=':
-                tableau[row + 1, surplus_start + i] = 1
+        constraints = self.constraints.copy()
+        rhs = self.rhs.copy()
+        constraint_types = list(self.constraint_types)
+
+        # Keep every rhs non-negative so the starting basis is feasible
+        for i in range(num_constraints):
+            if rhs[i] < 0:
+                constraints[i] = -constraints[i]
+                rhs[i] = -rhs[i]
+                constraint_types[i] = {'<=': '>=', '>=': '<=', '=': '='}[constraint_types[i]]
+
+        # '<=' rows start with their slack basic; only '>=' and '=' rows need an artificial
+        slack_rows = [i for i, c_type in enumerate(constraint_types) if c_type in ('<=', '>=')]
+        artificial_rows = [i for i, c_type in enumerate(constraint_types) if c_type in ('>=', '=')]
+        num_slack = len(slack_rows)
+        num_artificial = len(artificial_rows)
+        slack_start = num_vars
+        artificial_start = num_vars + num_slack
+
+        tableau = self.allocate_tableau(ws, (num_constraints + 1, artificial_start + num_artificial + 1))
+        tableau[1:, :num_vars] = constraints
+        tableau[1:, -1] = rhs
+        basis = ws.basis = np.zeros(num_constraints, dtype=int)
+
+        for i, row in enumerate(slack_rows):
+            if constraint_types[row] == '<=':
+                tableau[row + 1, slack_start + i] = 1
+                basis[row] = slack_start + i
             else:
-                tableau[row + 1, surplus_start + i] = -1
-        for i, row in enumerate(artificial_vars):
-            tableau[row + 1, artificial_start + i] = 1  
-        
-        for i, row in enumerate(artificial_vars):
-            tableau[0, artificial_start + i] = self.big_m  
+                tableau[row + 1, slack_start + i] = -1
+        for i, row in enumerate(artificial_rows):
+            tableau[row + 1, artificial_start + i] = 1
+            basis[row] = artificial_start + i
+
+        headers = standard_headers(num_vars, num_slack, num_artificial)
+        ws.basic_vars = [headers[col] for col in basis]
+
+        slack_columns = [None] * num_constraints
+        for i, row in enumerate(slack_rows):
+            slack_columns[row] = slack_start + i
+        dual_columns = [None] * num_constraints
+        for row in range(num_constraints):
+            if constraint_types[row] == '<=':
+                dual_columns[row] = (slack_columns[row], 1)
+            elif constraint_types[row] == '>=':
+                dual_columns[row] = (slack_columns[row], -1)
+        for i, row in enumerate(artificial_rows):
+            if constraint_types[row] == '=':
+                dual_columns[row] = (artificial_start + i, 1)
+        row_signs = [-1 if self.rhs[i] < 0 else 1 for i in range(num_constraints)]
+        ws.unit_columns = list(basis)
+        self.set_layout(ws, [[(j, 1)] for j in range(num_vars)], slack_columns, dual_columns, row_signs)
+        return self.working_tableau(ws, tableau), headers, basis, artificial_start
+
+
+
+    def standard_costs(self, tableau, artificial_start=None, artificial_cost=0):
+        costs = np.zeros(tableau.shape[1] - 1)
+        costs[:len(self.objective)] = self.objective
+        if artificial_start is not None:
+            costs[artificial_start:] = artificial_cost
+        return costs
+
+
+
+    def log_active_step(self, ws, tableau, headers, active):
+        # Retired columns stay allocated in the tableau but are left out of the logged step
+        self.log_step(ws, tableau, headers, np.append(active, True))
+
+
+
+    def run_pivots(self, ws, tableau, headers, basis, active, retire_start=None):
+        # Returns False when the problem is unbounded; columns from retire_start on are retired once they leave the basis
+        while True:
+            reduced_costs = np.where(active, tableau[0, :-1], 0)
+            if not np.any(reduced_costs < -self.tolerance):
+                return True
+            pivot_col = np.argmin(reduced_costs)
+            column_entries = tableau[1:, pivot_col]
+            valid_rows = column_entries > self.tolerance
+            if not np.any(valid_rows):
+                ws.unbounded_column = pivot_col
+                return False
+            ratios = np.full(len(column_entries), np.inf)
+            ratios[valid_rows] = tableau[1:, -1][valid_rows] / column_entries[valid_rows]
+            pivot_row = np.argmin(ratios) + 1
+            self.pivot(ws, tableau, pivot_row, pivot_col)
+            leaving = basis[pivot_row - 1]
+            basis[pivot_row - 1] = pivot_col
+            ws.basic_vars[pivot_row - 1] = headers[pivot_col]
+            if retire_start is not None and leaving >= retire_start:
+                active[leaving] = False
+            self.log_active_step(ws, tableau, headers, active)
+
+
+
+    def big_m_method(self, ws):
+        num_vars = len(self.objective)
+        tableau, headers, basis, artificial_start = self.build_standard_tableau(ws)
+        active = np.ones(tableau.shape[1] - 1, dtype=bool)
+
         tableau[0, :num_vars] = -self.objective
-        headers = (
-            [f"x{i+1}" for i in range(num_vars)] + 
-            [f"s{i+1}" for i in range(num_surplus)] + 
-            [f"A{i+1}" for i in range(num_artificial)] + 
-            ["RHS"]
-        )
-        self.basic_vars = [f"A{i+1}" for i in range(num_artificial)]
-        
-        self.log_step(tableau, headers)
-        for i, row in enumerate(artificial_vars):
-            tableau[0, :artificial_start] -= self.big_m * tableau[row + 1, :artificial_start]
-            tableau[0, artificial_start + i] = 0
-        for i in tableau[1:,-1]:
-            tableau[0,-1] -= i*self.big_m
-        
-        self.log_step(tableau, headers)
-        while np.any(tableau[0, :-1] < 0):  
-            pivot_col = np.argmin(tableau[0, :-1])  
-            column_entries = tableau[1:, pivot_col]  
-            valid_rows = column_entries > 0  
-            if not np.any(valid_rows):  
-                return {
-                    "solution": None,
-                    "optimal_value": None,
-                    "error": "Unbounded solution",
-                    "steps": self.steps
-                }
-            ratios = np.where(valid_rows, tableau[1:, -1] / column_entries, np.inf)
-            if np.all(ratios == np.inf):  
-                return {
-                    "solution": None,
-                    "optimal_value": None,
-                    "error": "Unbounded solution",
-                    "steps": self.steps
-                }
-            pivot_row = np.argmin(ratios) + 1  
-            tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]  
-            for i in range(len(tableau)):  
-                if i != pivot_row:
-                    tableau[i, :] -= tableau[i, pivot_col] * tableau[pivot_row, :]  
-            self.basic_vars[pivot_row - 1] = headers[pivot_col]  
-            self.log_step(tableau, headers)
-        solution = np.zeros(num_vars)
-        for i in range(num_vars):
-            col = tableau[1:, i]
-            if np.sum(col == 1) == 1 and np.sum(col == 0) == len(col) - 1:
-                row_index = np.where(col == 1)[0][0] + 1
-                solution[i] = tableau[row_index, -1]
-        optimal_value=0
-        for i in range(num_vars):
-            optimal_value += self.objective[i]*solution[i]
+        tableau[0, artificial_start:-1] = self.big_m
+        self.log_active_step(ws, tableau, headers, active)
+
+        for row, col in enumerate(basis):
+            if col >= artificial_start:
+                tableau[0, :] -= self.big_m * tableau[row + 1, :]
+        self.log_active_step(ws, tableau, headers, active)
+
+        bounded = self.run_pivots(ws, tableau, headers, basis, active, retire_start=artificial_start)
+        # M is a fixed constant, so a ray or an optimum that still needs an artificial can just mean M is
+        # too small next to the data; Phase I from this basis settles feasibility, then Phase II finishes
+        if not bounded and np.any(basis >= artificial_start) or bounded and any(
+                col >= artificial_start and tableau[row + 1, -1] > self.tolerance for row, col in enumerate(basis)):
+            return self.phase_one(ws, tableau, headers, basis, active, artificial_start) or self.phase_two(
+                ws, tableau, headers, basis, active)
+        if not bounded:
+            return self.unbounded_result(ws, tableau, basis, ws.unbounded_column)
+
+        tableau = self.refined_tableau(ws, tableau, basis, self.standard_costs(tableau))
+        # The objective row still carries the -M cost of every artificial column
+        solution, slacks, duals = self.extract_results(ws, 
+            tableau, basis, self.standard_costs(tableau, artificial_start, -self.big_m))
+        optimal_value = self.objective @ solution
 
         if self.type == "min":
             optimal_value = -optimal_value
-        return {"solution": solution.tolist(), "optimal_value":  optimal_value, "steps": self.steps}
-
-
-
-
-    def two_phase_method(self):
-        num_vars = len(self.objective)
-        num_constraints = len(self.constraints)
-        surplus_vars = []
-        artificial_vars = []
+        return {"solution": solution.tolist(), "optimal_value": optimal_value, "duals": duals, "slacks": slacks,
+                "steps": ws.steps}
 
-        for i, c_type in enumerate(self.constraint_types):
-            if c_type == '=':
-                artificial_vars.append(i)
-            elif c_type == '>='or c_type == '<=' :
-                surplus_vars.append(i)
-                artificial_vars.append(i)
 
-        num_surplus = len(surplus_vars)
-        num_artificial = len(artificial_vars)
-        total_vars = num_vars + num_surplus + num_artificial
 
-        tableau = np.zeros((num_constraints + 1, total_vars + 1))
 
-        tableau[1:, :num_vars] = self.constraints
-        tableau[1:, -1] = self.rhs
-
-        surplus_start = num_vars
-        artificial_start = num_vars + num_surplus
-
-        for i, row in enumerate(surplus_vars):
-            if self.constraint_types[row] == '<=':
-                tableau[row + 1, surplus_start + i] = 1
-            else:
-                tableau[row + 1, surplus_start + i] = -1 
-
-        for i, row in enumerate(artificial_vars):
-            tableau[row + 1, artificial_start + i] = 1  
-
-        for i, row in enumerate(artificial_vars):
-            tableau[0, artificial_start + i] = 1  
+    def two_phase_method(self, ws):
+        tableau, headers, basis, artificial_start = self.build_standard_tableau(ws)
+        active = np.ones(tableau.shape[1] - 1, dtype=bool)
+        return self.phase_one(ws, tableau, headers, basis, active, artificial_start) or self.phase_two(
+            ws, tableau, headers, basis, active)
 
-        headers = (
-            [f"x{i+1}" for i in range(num_vars)] + 
-            [f"s{i+1}" for i in range(num_surplus)] + 
-            [f"A{i+1}" for i in range(num_artificial)] + 
-            ["RHS"]
-        )
 
-        self.basic_vars = [f"A{i+1}" for i in range(num_artificial)]
 
-        self.log_step(tableau, headers)
+    def phase_one(self, ws, tableau, headers, basis, active, artificial_start):
+        # Minimise the sum of the artificials from the current basis; returns the failed result,
+        # or None once the artificials are at zero and retired
+        tableau[0, :] = 0
+        tableau[0, artificial_start:-1] = 1
+        self.log_active_step(ws, tableau, headers, active)
 
-        for i, row in enumerate(artificial_vars):
-            tableau[0, :] -= tableau[row + 1, :]
+        for row, col in enumerate(basis):
+            if col >= artificial_start:
+                tableau[0, :] -= tableau[row + 1, :]
+        self.log_active_step(ws, tableau, headers, active)
 
-        self.log_step(tableau, headers)
+        if not self.run_pivots(ws, tableau, headers, basis, active, retire_start=artificial_start):
+            return self.unbounded_result(ws, tableau, basis, ws.unbounded_column)
 
-        while np.any(tableau[0, :-1] < 0):
-            pivot_col = np.argmin(tableau[0, :-1])
-            column_entries = tableau[1:, pivot_col]
-            valid_rows = column_entries > 0  
-
-            if not np.any(valid_rows):  
-                return {
-                    "solution": None,
+        if not np.isclose(tableau[0, -1], 0, atol=self.tolerance):
+            return {
+                "solution": None,
                 "optimal_value": None,
-                "error": "Unbounded solution",
-                "steps": self.steps
+                "error": "Infeasible solution",
+                "farkas": self.farkas_certificate(ws, tableau, artificial_start),
+                "steps": ws.steps
             }
 
-            ratios = np.where(valid_rows, tableau[1:, -1] / column_entries, np.inf)
-            pivot_row = np.argmin(ratios) + 1  
-
-            tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
+        # Artificials still basic sit at zero: pivot them out, or leave them on redundant rows
+        for row, col in enumerate(basis):
+            if col >= artificial_start:
+                candidates = np.nonzero(np.abs(tableau[row + 1, :artificial_start]) > self.tolerance)[0]
+                if len(candidates):
+                    self.pivot(ws, tableau, row + 1, candidates[0])
+                    basis[row] = candidates[0]
+                    ws.basic_vars[row] = headers[candidates[0]]
+        active[artificial_start:] = False
+        return None
 
-            for i in range(len(tableau)):
-                if i != pivot_row:
-                    tableau[i, :] -= tableau[i, pivot_col] * tableau[pivot_row, :]
 
-            self.basic_vars[pivot_row - 1] = headers[pivot_col]
-
-            self.log_step(tableau, headers)
-
-        if not np.isclose(tableau[0, -1], 0):
-            return {
-            "solution": None,
-            "optimal_value": None,
-            "error": "Infeasible solution",
-            "steps": self.steps
-        }
-
-        tableau = np.delete(tableau, artificial_start + np.arange(num_artificial), axis=1)
-        headers = headers[:artificial_start] + ["RHS"]
 
+    def phase_two(self, ws, tableau, headers, basis, active):
+        num_vars = len(self.objective)
+        # Phase II: original costs, priced out against the current basis
+        tableau[0, :] = 0
         tableau[0, :num_vars] = -self.objective
-        self.log_step(tableau, headers)
+        for row, col in enumerate(basis):
+            if tableau[0, col] != 0:
+                tableau[0, :] -= tableau[0, col] * tableau[row + 1, :]
+        self.log_active_step(ws, tableau, headers, active)
 
-        while np.any(tableau[0, :-1] < 0):
-            pivot_col = np.argmin(tableau[0, :-1])
-            column_entries = tableau[1:, pivot_col]
-            valid_rows = column_entries > 0  
-
-            if not np.any(valid_rows):  
-                return {
-                "solution": None,
-                "optimal_value": None,
-                "error": "Unbounded solution",
-                "steps": self.steps
-            }
+        if not self.run_pivots(ws, tableau, headers, basis, active):
+            return self.unbounded_result(ws, tableau, basis, ws.unbounded_column)
 
-            ratios = np.where(valid_rows, tableau[1:, -1] / column_entries, np.inf)
-            pivot_row = np.argmin(ratios) + 1  
+        costs = self.standard_costs(tableau)
+        tableau = self.refined_tableau(ws, tableau, basis, costs)
+        solution, slacks, duals = self.extract_results(ws, tableau, basis, costs)
 
-            tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
-            for i in range(len(tableau)):
-                if i != pivot_row:
-                    tableau[i, :] -= tableau[i, pivot_col] * tableau[pivot_row, :]
-            self.basic_vars[pivot_row - 1] = headers[pivot_col]
-            self.log_step(tableau, headers)
-        solution = np.zeros(num_vars)
-        for i in range(num_vars):
-            col = tableau[1:, i]
-            if np.sum(col == 1) == 1 and np.sum(col == 0) == len(col) - 1:
-                row_index = np.where(col == 1)[0][0] + 1
-                solution[i] = tableau[row_index, -1]
-        optimal_value = tableau[0, -1] 
-        return {"solution": solution.tolist(), "optimal_value": optimal_value, "steps": self.steps}
+        if self.type == "min":
+            optimal_value = -tableau[0, -1]
+        else:
+            optimal_value = tableau[0, -1]
+        return {"solution": solution.tolist(), "optimal_value": optimal_value, "duals": duals, "slacks": slacks,
+                "steps": ws.steps}
 
 
-    def simplex_method_with_unrestricted_variables(self):
+    def simplex_method_with_unrestricted_variables(self, ws):
         num_vars = len(self.objective)
         num_constraints = len(self.constraints)
         
@@ -360,7 +668,7 @@ class LinearProgrammingSolver:
         
         num_transformed_vars = len(transformed_objective)
         
-        tableau = np.zeros((num_constraints + 1, num_transformed_vars + num_constraints + 1))
+        tableau = self.allocate_tableau(ws, (num_constraints + 1, num_transformed_vars + num_constraints + 1))
         
         tableau[1:, :num_transformed_vars] = transformed_constraints
         tableau[1:, num_transformed_vars:num_transformed_vars+num_constraints] = np.eye(num_constraints)
@@ -376,58 +684,44 @@ class LinearProgrammingSolver:
                 headers.append(f"x{i+1}")
         headers.extend([f"s{i+1}" for i in range(num_constraints)])
         headers.append("RHS")
+        basis = ws.basis = np.arange(num_transformed_vars, num_transformed_vars + num_constraints)
+        self.set_layout(ws, [list(zip(var_mapping[i], (1, -1))) for i in range(num_vars)],
+                        [num_transformed_vars + i for i in range(num_constraints)],
+                        [(num_transformed_vars + i, 1) for i in range(num_constraints)])
         
-        self.log_step(tableau, headers)
+        tableau = self.working_tableau(ws, tableau)
+        self.log_step(ws, tableau, headers)
         
-        while np.any(tableau[0, :-1] < 0):
+        while np.any(tableau[0, :-1] < -self.tolerance):
             pivot_col = np.argmin(tableau[0, :-1])
-            ratios = tableau[1:, -1] / tableau[1:, pivot_col]
-            valid_ratios = [ratios[i] if tableau[i + 1, pivot_col] > 0 else np.inf for i in range(len(ratios))]
-            pivot_row = np.argmin(valid_ratios) + 1
-            
-            if tableau[pivot_row, pivot_col] <= 0:
-                return {
-                    "solution": None,
-                    "optimal_value": None,
-                    "error": "Unbounded solution",
-                    "steps": self.steps
-                }
+            column_entries = tableau[1:, pivot_col]
+            valid_rows = column_entries > self.tolerance
+            # Only rows with a positive entry are divided, so zero entries never raise a divide warning
+            ratios = np.full(len(column_entries), np.inf)
+            ratios[valid_rows] = tableau[1:, -1][valid_rows] / column_entries[valid_rows]
+            pivot_row = np.argmin(ratios) + 1
             
-            tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
+            if tableau[pivot_row, pivot_col] <= self.tolerance:
+                return self.unbounded_result(ws, tableau, basis, pivot_col)
             
-            for i in range(len(tableau)):
-                if i != pivot_row:
-                    tableau[i, :] -= tableau[i, pivot_col] * tableau[pivot_row, :]
+            self.pivot(ws, tableau, pivot_row, pivot_col)
             
-            self.basic_vars[pivot_row - 1] = headers[pivot_col]
+            basis[pivot_row - 1] = pivot_col
+            ws.basic_vars[pivot_row - 1] = headers[pivot_col]
             
-            self.log_step(tableau, headers)
+            self.log_step(ws, tableau, headers)
         
-        solution = np.zeros(num_vars)
-        for i in range(num_vars):
-            if i in unrestricted_vars:
-                x_plus_index, x_minus_index = var_mapping[i]
-                x_plus_value = tableau[1:, x_plus_index] @ tableau[1:, -1]
-                x_minus_value = tableau[1:, x_minus_index] @ tableau[1:, -1]
-                
-                if x_plus_value > 0:
-                    solution[i] = x_plus_value
-                elif x_minus_value > 0:
-                    solution[i] = -x_minus_value
-                else:
-                    solution[i] = 0
-            else:
-                col = tableau[1:, var_mapping[i][0]]
-                if np.sum(col == 1) == 1 and np.sum(col == 0) == len(col) - 1:
-                    row_index = np.where(col == 1)[0][0] + 1
-                    solution[i] = tableau[row_index, -1]
+        costs = np.concatenate((transformed_objective, np.zeros(num_constraints)))
+        tableau = self.refined_tableau(ws, tableau, basis, costs)
+        solution, slacks, duals = self.extract_results(ws, tableau, basis, costs)
         
         if self.type == "min":
             optimal_value = -tableau[0, -1]
         else:
             optimal_value = tableau[0, -1]
         
-        return {"solution": solution.tolist(), "optimal_value": optimal_value, "steps": self.steps}
+        return {"solution": solution.tolist(), "optimal_value": optimal_value, "duals": duals, "slacks": slacks,
+                "steps": ws.steps}
 
 
 
@@ -472,7 +766,7 @@ def main():
     
     
     solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions, method="simplex", type='min')
-    solution = solver.simplex_method_with_unrestricted_variables()
+    solution = solver.solve()
 
 
     #solver = LinearProgrammingSolver(objective, constraints, rhs, constraint_types, var_restrictions, method="simplex", type="min")
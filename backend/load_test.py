@@ -0,0 +1,87 @@
+"""
+Load test for the /solve endpoint.
+
+Sends a small model from 1, 4 and 16 concurrent clients and reports throughput and latency.
+Every request perturbs the rhs so it misses the server's result cache; --cached sends the same
+body every time to measure cache hits instead. Non-200 responses and connection errors are
+counted as errors:
+
+    python load_test.py --url http://localhost:5000/solve --requests 200
+"""
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PAYLOAD = {
+    "method": "two-phase",
+    "optimization": "max",
+    "objective": [3, 5],
+    "constraints": [[1, 0], [0, 2], [3, 2]],
+    "rhs": [4, 12, 18],
+    "constraint_types": ["<=", "<=", "<="],
+    "var_restrictions": [">=0", ">=0"],
+}
+
+
+def send(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except urllib.error.URLError:
+        # No HTTP response at all (refused or reset connection)
+        status = None
+    return status, time.perf_counter() - start
+
+
+def request_body(index, cached):
+    """The payload with its last rhs shifted by `index`, so no two requests share a cache key unless cached."""
+    if cached:
+        return json.dumps(PAYLOAD).encode()
+    rhs = PAYLOAD["rhs"][:-1] + [PAYLOAD["rhs"][-1] + index / 1000]
+    return json.dumps(dict(PAYLOAD, rhs=rhs)).encode()
+
+
+def run(url, clients, total_requests, cached=False):
+    bodies = [request_body(index, cached) for index in range(total_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda body: send(url, body), bodies))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([latency for _, latency in results]) * 1000
+    errors = sum(1 for status, _ in results if status != 200)
+    return {
+        "clients": clients,
+        "throughput_rps": total_requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000/solve")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--cached", action="store_true", help="Send the same body every time (cache hits)")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for clients in args.clients:
+        result = run(args.url, clients, args.requests, args.cached)
+        print(f"{result['clients']:>8} {result['throughput_rps']:>10.1f} {result['p50_ms']:>10.2f} "
+              f"{result['p99_ms']:>10.2f} {result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+import numpy as np
+
+
+class LinearProgrammingModel:
+    """
+    A persistent LP that can be edited between solves.
+
+    Unlike LinearProgrammingSolver, which is built for one solve, this keeps the final
+    tableau and basis of the last solve and updates them in place when the model changes:
+
+    - set_objective reprices the objective row and continues with primal simplex;
+    - set_rhs shifts the basic values through B^-1 and continues with dual simplex;
+    - update_rhs does the same for a whole new right-hand side in one product;
+    - add_constraint appends one canonical row and continues with dual simplex;
+    - add_variable prices the new column through B^-1 and continues with primal simplex;
+    - remove_constraint pivots the row's slack into the basis and drops the row.
+
+    Every stored row i has an identity column (its slack, or a fixed-at-zero artificial for
+    '=' rows) holding +1 in that row, so the tableau always carries B^-1 in those columns.
+    A cold two-phase solve is only needed for the first solve, or when an edit leaves the
+    basis both primal and dual infeasible.
+    """
+
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, type="max", tolerance=1e-9):
+        """
+        Args:
+            objective, constraints, rhs, constraint_types, var_restrictions, type:
+                Same as LinearProgrammingSolver
+            tolerance: Feasibility and optimality tolerance
+        """
+        self.type = type.lower()
+        self.tolerance = tolerance
+        self.objective = np.array(objective, dtype=float)
+        self.constraints = np.array(constraints, dtype=float).reshape(-1, len(self.objective))
+        self.rhs = np.array(rhs, dtype=float)
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = list(var_restrictions)
+        self.tableau = None
+        self.phase_one = False
+        self.iterations = 0
+
+    # Model edits
+
+    def set_objective(self, objective):
+        self.objective = np.array(objective, dtype=float)
+        if self.tableau is not None:
+            self.reprice()
+
+    def set_rhs(self, row, value):
+        delta = value - self.rhs[row]
+        self.rhs[row] = value
+        if self.tableau is not None:
+            # b' = b + delta e_i, so the basic values move by delta * B^-1 e_i (the row's identity column)
+            stored_delta = self.row_signs[row] * delta
+            self.tableau[1:, -1] += stored_delta * self.tableau[1:, self.row_columns[row]]
+            self.tableau[0, -1] = self.costs()[self.basis] @ self.tableau[1:, -1]
+
+    def update_rhs(self, rhs):
+        rhs = np.array(rhs, dtype=float)
+        delta = rhs - self.rhs
+        self.rhs = rhs
+        if self.tableau is not None:
+            # Every row at once: the basic values move by B^-1 delta, read off the identity columns
+            stored_delta = np.array(self.row_signs) * delta
+            self.tableau[1:, -1] += self.tableau[1:, self.row_columns] @ stored_delta
+            self.tableau[0, -1] = self.costs()[self.basis] @ self.tableau[1:, -1]
+
+    def add_constraint(self, coefficients, constraint_type, rhs):
+        coefficients = np.array(coefficients, dtype=float)
+        self.constraints = np.vstack((self.constraints, coefficients))
+        self.rhs = np.append(self.rhs, float(rhs))
+        self.constraint_types.append(constraint_type)
+        if self.tableau is None:
+            return
+
+        sign = -1.0 if constraint_type == '>=' else 1.0
+        id_col = self.append_column(np.zeros(len(self.basis)), 'slack' if constraint_type != '=' else 'artificial')
+        row = np.zeros(self.tableau.shape[1])
+        for j, columns in enumerate(self.var_columns):
+            for col, var_sign in columns:
+                row[col] = sign * var_sign * coefficients[j]
+        row[id_col] = 1.0
+        row[-1] = sign * float(rhs)
+        # Express the new row in terms of the current basis
+        row -= row[self.basis] @ self.tableau[1:]
+        row[id_col] = 1.0
+
+        self.tableau = np.vstack((self.tableau, row))
+        self.basis = np.append(self.basis, id_col)
+        self.row_columns.append(id_col)
+        self.row_signs.append(sign)
+
+    def add_variable(self, objective_coeff, column, restriction=">=0"):
+        column = np.array(column, dtype=float)
+        self.objective = np.append(self.objective, float(objective_coeff))
+        self.constraints = np.hstack((self.constraints, column.reshape(-1, 1)))
+        self.var_restrictions.append(restriction)
+        if self.tableau is None:
+            return
+
+        # B^-1 a is the combination of the identity columns weighted by the stored coefficients
+        stored = np.array(self.row_signs) * column
+        priced = self.tableau[1:, self.row_columns] @ stored
+        columns = [(self.append_column(priced, 'structural'), 1)]
+        if restriction == 'unrestricted':
+            columns.append((self.append_column(-priced, 'structural'), -1))
+        self.var_columns.append(columns)
+        self.reprice()
+
+    def remove_constraint(self, row):
+        self.constraints = np.delete(self.constraints, row, axis=0)
+        self.rhs = np.delete(self.rhs, row)
+        del self.constraint_types[row]
+        if self.tableau is None:
+            return
+
+        id_col = self.row_columns[row]
+        basic_rows = np.nonzero(self.basis == id_col)[0]
+        if len(basic_rows):
+            tableau_row = basic_rows[0]
+        else:
+            # Bring the row's identity column into the basis first; its column is B^-1 e_i, never all zero
+            tableau_row = int(np.argmax(np.abs(self.tableau[1:, id_col])))
+            self.pivot(tableau_row + 1, id_col)
+        self.tableau = np.delete(self.tableau, tableau_row + 1, axis=0)
+        self.basis = np.delete(self.basis, tableau_row)
+        del self.row_columns[row]
+        del self.row_signs[row]
+        self.delete_column(id_col)
+        self.reprice()
+
+    # Solving
+
+    def solve(self):
+        """Re-optimize from the current basis (or cold on the first call) and return the result dict."""
+        if self.tableau is None:
+            status = self.cold_start()
+        else:
+            status = self.reoptimize()
+        if status != "optimal":
+            # Keep the basis as a warm start for the next solve, priced for the real objective
+            # (a failed cold start leaves the Phase I objective row behind)
+            self.reprice()
+            return {
+                "solution": None,
+                "optimal_value": None,
+                "error": "Infeasible solution" if status == "infeasible" else "Unbounded solution",
+                "iterations": self.iterations}
+        return self.results()
+
+    def reoptimize(self):
+        primal_feasible = not np.any(self.infeasibilities() > self.tolerance)
+        dual_feasible = np.all(self.tableau[0, :-1][self.active] >= -self.tolerance)
+        if primal_feasible:
+            return self.primal_simplex()
+        if dual_feasible:
+            status = self.dual_simplex()
+            return self.primal_simplex() if status == "optimal" else status
+        return self.cold_start()
+
+    def standard_rows(self):
+        """
+        Lay out the columns (structural, then one identity column per row) and return the rows
+        [A | I | b] in stored form, each row multiplied by its sign so '>=' rows read as '<='.
+        """
+        num_rows = len(self.constraints)
+        self.var_columns = []
+        structural = []
+        for j, restriction in enumerate(self.var_restrictions):
+            columns = [(len(structural), 1)]
+            structural.append(self.constraints[:, j])
+            if restriction == 'unrestricted':
+                columns.append((len(structural), -1))
+                structural.append(-self.constraints[:, j])
+            self.var_columns.append(columns)
+        num_structural = len(structural)
+        self.column_kinds = ['structural'] * num_structural
+
+        self.row_signs = [-1.0 if c_type == '>=' else 1.0 for c_type in self.constraint_types]
+        self.row_columns = [num_structural + i for i in range(num_rows)]
+        self.column_kinds += ['artificial' if c_type == '=' else 'slack' for c_type in self.constraint_types]
+
+        signs = np.array(self.row_signs)
+        working = np.zeros((num_rows, num_structural + num_rows + 1))
+        if num_structural:
+            working[:, :num_structural] = np.column_stack(structural) * signs[:, None]
+        working[:, num_structural:num_structural + num_rows] = np.eye(num_rows)
+        working[:, -1] = self.rhs * signs
+        return working
+
+    def basis_indices(self):
+        """
+        The current basis as column indices of the standard_rows layout, which depends only on the
+        variables and rows; None before the first solve, or when a Phase I artificial is still basic.
+        """
+        if self.tableau is None:
+            return None
+        layout = {}
+        for columns in self.var_columns:
+            for col, _ in columns:
+                layout[col] = len(layout)
+        num_structural = len(layout)
+        for i, col in enumerate(self.row_columns):
+            layout[col] = num_structural + i
+        if any(col not in layout for col in self.basis):
+            return None
+        return [layout[col] for col in self.basis]
+
+    def warm_start(self, basis):
+        """
+        Rebuild the tableau from a basis given by basis_indices(), so that the next solve
+        re-optimizes from it instead of starting cold.
+
+        The basis may come from a model with the same variables and only the first len(basis)
+        rows; every later row starts with its own identity column basic. Returns False, leaving
+        the next solve cold, when the basis matrix is singular.
+        """
+        working = self.standard_rows()
+        num_rows = len(working)
+        num_structural = len(self.column_kinds) - num_rows
+        basis = list(basis) + [num_structural + i for i in range(len(basis), num_rows)]
+        try:
+            rows = np.linalg.solve(working[:, basis], working)
+        except np.linalg.LinAlgError:
+            self.tableau = None
+            return False
+        self.tableau = np.zeros((num_rows + 1, working.shape[1]))
+        self.tableau[1:] = rows
+        self.basis = np.array(basis, dtype=int)
+        self.active = np.array([kind != 'artificial' for kind in self.column_kinds])
+        self.reprice()
+        return True
+
+    def cold_start(self):
+        """Two-phase solve from scratch; builds the tableau layout used by the incremental edits."""
+        working = self.standard_rows()
+        num_rows = len(working)
+        num_structural = len(self.column_kinds) - num_rows
+
+        # Rows whose identity column cannot start basic get a Phase I artificial
+        needs_phase_one = [i for i in range(num_rows)
+                           if working[i, -1] < 0 or self.constraint_types[i] == '=']
+        for i in needs_phase_one:
+            if working[i, -1] < 0:
+                working[i] = -working[i]
+        phase_columns = np.zeros((num_rows, len(needs_phase_one)))
+        for k, i in enumerate(needs_phase_one):
+            phase_columns[i, k] = 1.0
+        self.column_kinds += ['phase'] * len(needs_phase_one)
+
+        width = num_structural + num_rows + len(needs_phase_one)
+        self.tableau = np.zeros((num_rows + 1, width + 1))
+        self.tableau[1:, :num_structural + num_rows] = working[:, :-1]
+        self.tableau[1:, num_structural + num_rows:width] = phase_columns
+        self.tableau[1:, -1] = working[:, -1]
+        self.basis = np.array(self.row_columns, dtype=int)
+        for k, i in enumerate(needs_phase_one):
+            self.basis[i] = num_structural + num_rows + k
+
+        self.active = np.array([kind != 'artificial' for kind in self.column_kinds])
+
+        # Phase I: maximize minus the sum of the Phase I artificials
+        phase_costs = np.array([-1.0 if kind == 'phase' else 0.0 for kind in self.column_kinds])
+        self.tableau[0, :-1] = -phase_costs
+        self.tableau[0] += phase_costs[self.basis] @ self.tableau[1:]
+        self.phase_one = True
+        self.primal_simplex()
+        self.phase_one = False
+        if self.tableau[0, -1] < -self.tolerance * max(1.0, np.max(np.abs(self.rhs), initial=0.0)):
+            return "infeasible"
+
+        for row in range(len(self.basis)):
+            if self.column_kinds[self.basis[row]] == 'phase':
+                self.retire_artificial(row)
+        self.active[[kind == 'phase' for kind in self.column_kinds]] = False
+
+        self.reprice()
+        return self.primal_simplex()
+
+    def primal_simplex(self):
+        while True:
+            reduced_costs = np.where(self.active, self.tableau[0, :-1], 0)
+            if not np.any(reduced_costs < -self.tolerance):
+                return "optimal"
+            pivot_col = int(np.argmin(reduced_costs))
+            column_entries = self.tableau[1:, pivot_col]
+            # Artificials basic at zero must leave rather than move off zero in either direction
+            fixed_rows = self.basic_artificials() & (np.abs(column_entries) > self.tolerance)
+            valid_rows = (column_entries > self.tolerance) | fixed_rows
+            if not np.any(valid_rows):
+                return "unbounded"
+            ratios = np.full(len(column_entries), np.inf)
+            ratios[valid_rows] = np.abs(self.tableau[1:, -1][valid_rows] / column_entries[valid_rows])
+            self.pivot(int(np.argmin(ratios)) + 1, pivot_col)
+
+    def dual_simplex(self):
+        # Basic values must be >= 0, and basic artificials exactly 0
+        while True:
+            infeasibilities = self.infeasibilities()
+            if not np.any(infeasibilities > self.tolerance):
+                return "optimal"
+            pivot_row = int(np.argmax(infeasibilities)) + 1
+            direction = 1.0 if self.tableau[pivot_row, -1] < 0 else -1.0
+            row_entries = direction * np.where(self.active, self.tableau[pivot_row, :-1], 0)
+            valid_cols = row_entries < -self.tolerance
+            if not np.any(valid_cols):
+                return "infeasible"
+            ratios = np.full(len(row_entries), np.inf)
+            ratios[valid_cols] = self.tableau[0, :-1][valid_cols] / -row_entries[valid_cols]
+            self.pivot(pivot_row, int(np.argmin(ratios)))
+
+    # Tableau helpers
+
+    def basic_artificials(self):
+        """Rows whose basic column must stay at zero: '=' artificials, and Phase I artificials once Phase I is over."""
+        fixed_kinds = ('artificial',) if self.phase_one else ('artificial', 'phase')
+        return np.array([self.column_kinds[col] in fixed_kinds for col in self.basis], dtype=bool)
+
+    def infeasibilities(self):
+        """Primal infeasibility of each basic variable: negative values, or any nonzero artificial."""
+        values = self.tableau[1:, -1]
+        return np.where(self.basic_artificials(), np.abs(values), np.maximum(-values, 0))
+
+    def costs(self):
+        """Max-sense cost of every tableau column."""
+        objective = -self.objective if self.type == "min" else self.objective
+        costs = np.zeros(self.tableau.shape[1] - 1)
+        for j, columns in enumerate(self.var_columns):
+            for col, sign in columns:
+                costs[col] = sign * objective[j]
+        return costs
+
+    def reprice(self):
+        """Rebuild the objective row from the costs and the current basis."""
+        costs = self.costs()
+        self.tableau[0, :-1] = -costs
+        self.tableau[0, -1] = 0
+        self.tableau[0] += costs[self.basis] @ self.tableau[1:]
+
+    def pivot(self, pivot_row, pivot_col):
+        self.tableau[pivot_row] /= self.tableau[pivot_row, pivot_col]
+        pivot_values = self.tableau[pivot_row].copy()
+        self.tableau -= np.outer(self.tableau[:, pivot_col], pivot_values)
+        self.tableau[pivot_row] = pivot_values
+        leaving = self.basis[pivot_row - 1]
+        self.basis[pivot_row - 1] = pivot_col
+        if self.column_kinds[leaving] in ('artificial', 'phase'):
+            self.active[leaving] = False
+        self.iterations += 1
+
+    def retire_artificial(self, row):
+        """Pivot an artificial out of basis row `row` if any active column allows it (else the row is redundant)."""
+        entries = np.where(self.active, np.abs(self.tableau[row + 1, :-1]), 0)
+        col = int(np.argmax(entries))
+        if entries[col] > self.tolerance:
+            self.pivot(row + 1, col)
+
+    def append_column(self, values, kind):
+        column = np.zeros((self.tableau.shape[0], 1))
+        column[1:, 0] = values
+        self.tableau = np.hstack((self.tableau[:, :-1], column, self.tableau[:, -1:]))
+        self.column_kinds.append(kind)
+        self.active = np.append(self.active, kind != 'artificial')
+        return self.tableau.shape[1] - 2
+
+    def delete_column(self, col):
+        self.tableau = np.delete(self.tableau, col, axis=1)
+        del self.column_kinds[col]
+        self.active = np.delete(self.active, col)
+        self.basis[self.basis > col] -= 1
+        self.row_columns = [c - 1 if c > col else c for c in self.row_columns]
+        self.var_columns = [[(c - 1 if c > col else c, sign) for c, sign in columns] for columns in self.var_columns]
+
+    def results(self):
+        values = np.zeros(self.tableau.shape[1] - 1)
+        values[self.basis] = self.tableau[1:, -1]
+        solution = np.zeros(len(self.var_columns))
+        for j, columns in enumerate(self.var_columns):
+            for col, sign in columns:
+                solution[j] += sign * values[col]
+
+        slacks = []
+        duals = []
+        for i, col in enumerate(self.row_columns):
+            slacks.append(0.0 if self.constraint_types[i] == '=' else float(values[col]))
+            dual = self.row_signs[i] * self.tableau[0, col]
+            duals.append(float(-dual if self.type == "min" else dual) + 0.0)
+
+        return {
+            "solution": solution.tolist(),
+            "optimal_value": float(self.objective @ solution),
+            "duals": duals,
+            "slacks": slacks,
+            "iterations": self.iterations}
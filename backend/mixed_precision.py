@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def pivot_tolerance(dtype):
+    """Zero tolerance for pivoting in `dtype`: 1e-9 for float64, loosened with machine epsilon for float32."""
+    return max(1e-9, float(np.finfo(dtype).eps) * 100)
+
+
+def iterative_refinement(basis_matrix, rhs, values, dtype, max_steps=5):
+    """
+    Recover float64 accuracy for the basic variable values of a low-precision solve.
+
+    `basis_matrix` and `rhs` are the original (float64) basis columns and right-hand side,
+    `values` the basic values read off the low-precision tableau. The basis is inverted once
+    in `dtype`; each step computes the residual b - B x in float64 and applies the
+    low-precision correction, which converges to float64 accuracy for reasonably conditioned bases.
+    """
+    basis_matrix = np.asarray(basis_matrix, dtype=np.float64)
+    rhs = np.asarray(rhs, dtype=np.float64)
+    values = np.array(values, dtype=np.float64)
+    try:
+        inverse = np.linalg.inv(basis_matrix.astype(dtype))
+    except np.linalg.LinAlgError:
+        return values
+    scale = max(np.max(np.abs(rhs), initial=0.0), 1.0)
+    for _ in range(max_steps):
+        residual = rhs - basis_matrix @ values
+        if np.max(np.abs(residual), initial=0.0) <= 1e-14 * scale:
+            break
+        values += (inverse @ residual.astype(dtype)).astype(np.float64)
+    return values
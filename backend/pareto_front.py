@@ -0,0 +1,199 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lp_model import LinearProgrammingModel
+from request_schema import MAX_PARETO_POINTS, PARETO_METHODS
+from shared_model import SharedModel, attach_model
+
+
+def serpentine_grid(axes):
+    """Every combination of the values in `axes`, ordered so that consecutive points are one grid step apart."""
+    if not axes:
+        return [()]
+    grid = []
+    for index, value in enumerate(axes[0]):
+        rest = serpentine_grid(axes[1:])
+        grid.extend((value,) + point for point in (rest if index % 2 == 0 else rest[::-1]))
+    return grid
+
+
+def weight_lattice(num_objectives, points):
+    """Weights on the simplex lattice with `points` steps per objective, neighbouring weights next to each other."""
+    steps = points - 1
+    grid = [combination for combination in serpentine_grid([range(steps + 1)] * (num_objectives - 1))
+            if sum(combination) <= steps]
+    return [tuple(count / steps for count in combination) + ((steps - sum(combination)) / steps,)
+            for combination in grid]
+
+
+def non_dominated(points, type, tolerance):
+    """Drop points dominated by (or equal to) another point; `points` are dicts with an "objectives" list."""
+    if not points:
+        return []
+    values = np.array([point["objectives"] for point in points]) * (1.0 if type == "max" else -1.0)
+    indices = np.arange(len(points))
+    kept = []
+    for i, value in enumerate(values):
+        at_least = np.all(values >= value - tolerance, axis=1)
+        # Of two equal points only the first is kept
+        better = np.any(values > value + tolerance, axis=1) | (indices < i)
+        at_least[i] = False
+        if not np.any(at_least & better):
+            kept.append(points[i])
+    return kept
+
+
+def solve_run(model, parameters, method, constraint_types, var_restrictions, type, ranges):
+    """
+    Solve a run of neighbouring sweep points on one LinearProgrammingModel, each warm-started from the last.
+
+    Epsilon-constraint points only move the right-hand sides of the epsilon rows (dual simplex from
+    the previous basis); weighted-sum points only change the objective (primal simplex).
+    Returns the objective values and solution of every point (None when infeasible) and the pivot count.
+    """
+    objectives = model["objectives"]
+    if method == "epsilon-constraint":
+        lp = LinearProgrammingModel(objectives[0], model["constraints"], model["rhs"], constraint_types,
+                                    var_restrictions, type=type)
+        bound = ">=" if type == "max" else "<="
+        first_row = len(model["rhs"])
+        for objective, epsilon in zip(objectives[1:], parameters[0]):
+            lp.add_constraint(objective, bound, epsilon)
+    else:
+        lp = LinearProgrammingModel(np.asarray(parameters[0]) @ (objectives / ranges[:, None]), model["constraints"],
+                                    model["rhs"], constraint_types, var_restrictions, type=type)
+
+    results = []
+    for parameter in parameters:
+        if method == "epsilon-constraint":
+            for row, epsilon in enumerate(parameter):
+                lp.set_rhs(first_row + row, epsilon)
+        else:
+            lp.set_objective(np.asarray(parameter) @ (objectives / ranges[:, None]))
+        result = lp.solve()
+        if result.get("error"):
+            results.append(None)
+            continue
+        results.append({"objectives": (objectives @ np.array(result["solution"])).tolist(),
+                        "solution": result["solution"]})
+    return results, lp.iterations
+
+
+def solve_shared_run(handle, *args):
+    """solve_run in a worker process, on the model arrays in shared memory."""
+    return solve_run(attach_model(handle), *args)
+
+
+class ParetoFront:
+    """
+    Non-dominated trade-off points of an LP with several objectives.
+
+    The payoff table (every objective optimized alone) gives the ideal and nadir value of every
+    objective. The front is then swept in one of two ways:
+
+    - "epsilon-constraint" optimizes the first objective with every other objective bounded by
+      an epsilon on a grid of `points` values from its nadir to its ideal value;
+    - "weighted-sum" optimizes weighted sums of the objectives, each scaled by its range, over
+      a lattice of weights with `points` steps per objective.
+
+    Neighbouring sweep points are grouped into runs solved on one LinearProgrammingModel, so
+    every solve after the first of a run is warm-started from the previous basis. With
+    workers > 1 the runs are spread across a process pool that reads the model from shared
+    memory. Infeasible sweep points are skipped and dominated points are dropped.
+    """
+
+    def __init__(self, objectives, constraints, rhs, constraint_types, var_restrictions, type="max",
+                 method="epsilon-constraint", points=11, workers=1, max_points=MAX_PARETO_POINTS,
+                 tolerance=1e-7):
+        """
+        Args:
+            objectives: One row of objective coefficients per objective, all optimized in the `type` sense
+            constraints, rhs, constraint_types, var_restrictions, type:
+                Same as LinearProgrammingSolver
+            method: "epsilon-constraint" or "weighted-sum"
+            points: Grid values per epsilon-bounded objective, or weight steps per objective
+            workers: Number of processes the sweep is spread across
+            max_points: Largest sweep allowed, since the grid grows as points ** (objectives - 1)
+            tolerance: Tolerance on objective values when comparing points
+        """
+        self.objectives = np.array(objectives, dtype=float)
+        if self.objectives.ndim != 2:
+            raise ValueError("objectives must be a 2-dimensional array")
+        self.constraints = np.array(constraints, dtype=float).reshape(-1, self.objectives.shape[1])
+        self.rhs = np.array(rhs, dtype=float)
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = list(var_restrictions)
+        self.type = type.lower()
+        if method not in PARETO_METHODS:
+            raise ValueError(f"Unknown Pareto method: {method}")
+        self.method = method
+        if points < 2:
+            raise ValueError("points must be at least 2")
+        self.points = points
+        self.workers = workers
+        self.max_points = max_points
+        self.tolerance = tolerance
+
+    def payoff_table(self):
+        """Value of every objective at the optimum of each objective alone (rows), with the error when one has none."""
+        lp = LinearProgrammingModel(self.objectives[0], self.constraints, self.rhs, self.constraint_types,
+                                    self.var_restrictions, type=self.type)
+        rows = []
+        for objective in self.objectives:
+            lp.set_objective(objective)
+            result = lp.solve()
+            if result.get("error"):
+                return None, result["error"], lp.iterations
+            rows.append(self.objectives @ np.array(result["solution"]))
+        return np.array(rows), None, lp.iterations
+
+    def sweep(self, ideal, nadir):
+        if self.method == "weighted-sum":
+            return weight_lattice(len(self.objectives), self.points)
+        axes = [np.linspace(nadir[i], ideal[i], self.points).tolist() for i in range(1, len(self.objectives))]
+        return serpentine_grid(axes)
+
+    def solve(self):
+        payoff, error, iterations = self.payoff_table()
+        if payoff is None:
+            return {"points": [], "error": error, "iterations": iterations}
+        best = np.max if self.type == "max" else np.min
+        worst = np.min if self.type == "max" else np.max
+        ideal, nadir = best(payoff, axis=0), worst(payoff, axis=0)
+        ranges = np.maximum(np.abs(ideal - nadir), self.tolerance)
+
+        parameters = self.sweep(ideal, nadir)
+        if len(parameters) > self.max_points:
+            raise ValueError(f"The sweep has {len(parameters)} points, more than max_points={self.max_points}")
+        # One contiguous run of neighbouring points per worker
+        runs = np.array_split(np.arange(len(parameters)), max(1, min(self.workers, len(parameters))))
+        options = (self.method, self.constraint_types, self.var_restrictions, self.type, ranges)
+        if self.workers > 1:
+            with SharedModel(objectives=self.objectives, constraints=self.constraints, rhs=self.rhs) as shared, \
+                    ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(solve_shared_run, shared.handle(), [parameters[i] for i in run], *options)
+                           for run in runs]
+                chunks = [future.result() for future in futures]
+        else:
+            model = {"objectives": self.objectives, "constraints": self.constraints, "rhs": self.rhs}
+            chunks = [solve_run(model, [parameters[i] for i in run], *options) for run in runs]
+
+        key = "weights" if self.method == "weighted-sum" else "epsilon"
+        points = []
+        for run, (results, run_iterations) in zip(runs, chunks):
+            iterations += run_iterations
+            for index, result in zip(run, results):
+                if result is not None:
+                    result[key] = list(parameters[index])
+                    points.append(result)
+        points = non_dominated(points, self.type, self.tolerance * max(1.0, float(np.max(np.abs(ranges)))))
+        points.sort(key=lambda point: point["objectives"], reverse=self.type == "max")
+
+        return {
+            "points": points,
+            "ideal": ideal.tolist(),
+            "nadir": nadir.tolist(),
+            "payoff": payoff.tolist(),
+            "solves": len(self.objectives) + len(parameters),
+            "iterations": iterations}
@@ -0,0 +1,351 @@
+import base64
+import math
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+
+LP_METHODS = ("simplex", "big-m", "two-phase", "auto-race", "decomposition")
+CONSTRAINT_TYPES = ("<=", ">=", "=")
+# Restrictions that need branch-and-bound; the rest are plain LP sign restrictions
+INTEGER_RESTRICTIONS = ("integer", "binary")
+CONTINUOUS_RESTRICTIONS = (">=0", ">=", "unrestricted")
+VAR_RESTRICTIONS = CONTINUOUS_RESTRICTIONS + INTEGER_RESTRICTIONS
+GOAL_DIRECTIONS = ("<=", ">=", "=", "==")
+PRECISIONS = ("float", "exact")
+DTYPES = ("float64", "float32")
+NODE_SELECTIONS = ("best-bound", "depth-first")
+# Server-side caps on what a client may ask for; larger requests are rejected
+MAX_REQUEST_WORKERS = int(os.environ.get('LP_MAX_REQUEST_WORKERS', os.cpu_count() or 1))
+MAX_NODE_LIMIT = int(os.environ.get('LP_MAX_NODE_LIMIT', 100000))
+PARETO_METHODS = ("epsilon-constraint", "weighted-sum")
+STOCHASTIC_METHODS = ("l-shaped", "extensive")
+# Largest Pareto sweep accepted; an epsilon-constraint grid has points ** (objectives - 1) points
+MAX_PARETO_POINTS = 10000
+
+
+class SchemaError(ValueError):
+    """Raised when a /solve payload is malformed; the message names the offending field."""
+
+
+def decode_array(value, name, ndim):
+    """
+    Decode a numeric array field into a float64 NumPy array.
+
+    Accepts either nested JSON lists or the compact encoding
+    {"dtype": "float64", "shape": [...], "data": "<base64 of little-endian bytes>"},
+    which is decoded straight into a NumPy buffer without building Python lists.
+    """
+    if isinstance(value, dict):
+        if value.get("dtype", "float64") != "float64":
+            raise SchemaError(f"{name}: only float64 packed arrays are supported")
+        try:
+            shape = tuple(int(n) for n in value["shape"])
+            array = np.frombuffer(base64.b64decode(value["data"], validate=True), dtype="<f8")
+        except (KeyError, TypeError, ValueError) as error:
+            raise SchemaError(f"{name}: invalid packed array ({error})")
+        if any(n < 0 for n in shape) or array.size != math.prod(shape):
+            raise SchemaError(f"{name}: packed data does not match shape {list(shape)}")
+        array = array.reshape(shape)
+    else:
+        try:
+            array = np.array(value, dtype=float)
+        except (TypeError, ValueError):
+            raise SchemaError(f"{name}: expected a numeric array")
+    if array.ndim != ndim:
+        raise SchemaError(f"{name}: expected a {ndim}-dimensional array, got {array.ndim}")
+    if not np.all(np.isfinite(array)):
+        raise SchemaError(f"{name}: values must be finite")
+    return array
+
+
+def require(data, name):
+    if name not in data:
+        raise SchemaError(f"{name}: field is required")
+    return data[name]
+
+
+def int_field(data, name, default, minimum=None, maximum=None):
+    try:
+        value = int(data.get(name, default))
+    except (TypeError, ValueError):
+        raise SchemaError(f"{name}: expected an integer")
+    if minimum is not None and value < minimum:
+        raise SchemaError(f"{name}: expected at least {minimum}, got {value}")
+    if maximum is not None and value > maximum:
+        raise SchemaError(f"{name}: expected at most {maximum}, got {value}")
+    return value
+
+
+def bool_field(data, name, default=False):
+    # Only JSON true/false; bool() would read the string "false" as True
+    value = data.get(name, default)
+    if not isinstance(value, bool):
+        raise SchemaError(f"{name}: expected true or false")
+    return value
+
+
+def workers_field(data):
+    return int_field(data, "workers", 1, minimum=1, maximum=MAX_REQUEST_WORKERS)
+
+
+def choice_field(data, name, allowed, default):
+    value = data.get(name, default)
+    if value not in allowed:
+        raise SchemaError(f"{name}: '{value}' is not one of {', '.join(allowed)}")
+    return value
+
+
+def string_list(data, name, allowed, length):
+    values = require(data, name)
+    if not isinstance(values, list) or len(values) != length:
+        raise SchemaError(f"{name}: expected a list of {length} entries")
+    for value in values:
+        if value not in allowed:
+            raise SchemaError(f"{name}: '{value}' is not one of {', '.join(allowed)}")
+    return list(values)
+
+
+@dataclass
+class LPRequest:
+    method: str
+    optimization: str
+    objective: np.ndarray
+    constraints: np.ndarray
+    rhs: np.ndarray
+    constraint_types: list
+    var_restrictions: list
+    node_selection: str = "best-bound"
+    node_limit: int = 1000
+    workers: int = 1
+    out_of_core: bool = False
+    precision: str = "float"
+    dtype: str = "float64"
+    iis: bool = False
+
+    @classmethod
+    def from_json(cls, data):
+        method = require(data, "method")
+        if method not in LP_METHODS:
+            raise SchemaError(f"method: '{method}' is not one of {', '.join(LP_METHODS)}")
+        optimization = require(data, "optimization")
+        if optimization not in ("max", "min"):
+            raise SchemaError("optimization: expected 'max' or 'min'")
+
+        objective = decode_array(require(data, "objective"), "objective", 1)
+        constraints = decode_array(require(data, "constraints"), "constraints", 2)
+        rhs = decode_array(require(data, "rhs"), "rhs", 1)
+        num_constraints, num_vars = constraints.shape
+        if num_vars != len(objective):
+            raise SchemaError(f"constraints: expected {len(objective)} columns, got {num_vars}")
+        if len(rhs) != num_constraints:
+            raise SchemaError(f"rhs: expected {num_constraints} values, got {len(rhs)}")
+
+        return cls(
+            method=method,
+            optimization=optimization,
+            objective=objective,
+            constraints=constraints,
+            rhs=rhs,
+            constraint_types=string_list(data, "constraint_types", CONSTRAINT_TYPES, num_constraints),
+            var_restrictions=string_list(data, "var_restrictions", VAR_RESTRICTIONS, num_vars),
+            node_selection=choice_field(data, "node_selection", NODE_SELECTIONS, "best-bound"),
+            node_limit=int_field(data, "node_limit", min(1000, MAX_NODE_LIMIT), minimum=1, maximum=MAX_NODE_LIMIT),
+            workers=workers_field(data),
+            out_of_core=bool_field(data, "out_of_core"),
+            precision=choice_field(data, "precision", PRECISIONS, "float"),
+            dtype=choice_field(data, "dtype", DTYPES, "float64"),
+            iis=bool_field(data, "iis"),
+        )
+
+
+@dataclass
+class GoalRequest:
+    goals_coeffs: np.ndarray
+    goals_values: np.ndarray
+    constraints_coeffs: np.ndarray
+    constraints_values: np.ndarray
+    goals_directions: list
+    unrestricted_vars: np.ndarray = field(default=None)
+    dtype: str = "float64"
+
+    @classmethod
+    def from_json(cls, data):
+        goals_coeffs = decode_array(require(data, "goals_coeffs"), "goals_coeffs", 2)
+        goals_values = decode_array(require(data, "goals_values"), "goals_values", 1)
+        constraints_coeffs = decode_array(require(data, "constraints_coeffs"), "constraints_coeffs", 2)
+        constraints_values = decode_array(require(data, "constraints_values"), "constraints_values", 1)
+        num_goals, num_vars = goals_coeffs.shape
+        if len(goals_values) != num_goals:
+            raise SchemaError(f"goals_values: expected {num_goals} values, got {len(goals_values)}")
+        if constraints_coeffs.shape[1] != num_vars:
+            raise SchemaError(f"constraints_coeffs: expected {num_vars} columns, got {constraints_coeffs.shape[1]}")
+        if len(constraints_values) != len(constraints_coeffs):
+            raise SchemaError(f"constraints_values: expected {len(constraints_coeffs)} values, "
+                              f"got {len(constraints_values)}")
+
+        if "unrestricted_vars" in data:
+            unrestricted_vars = decode_array(data["unrestricted_vars"], "unrestricted_vars", 1)
+            if len(unrestricted_vars) != num_vars:
+                raise SchemaError(f"unrestricted_vars: expected {num_vars} values, got {len(unrestricted_vars)}")
+        else:
+            unrestricted_vars = np.zeros(num_vars)
+
+        return cls(
+            goals_coeffs=goals_coeffs,
+            goals_values=goals_values,
+            constraints_coeffs=constraints_coeffs,
+            constraints_values=constraints_values,
+            goals_directions=string_list(data, "goals_directions", GOAL_DIRECTIONS, num_goals),
+            unrestricted_vars=unrestricted_vars,
+            dtype=choice_field(data, "dtype", DTYPES, "float64"),
+        )
+
+
+@dataclass
+class ParetoRequest:
+    optimization: str
+    objectives: np.ndarray
+    constraints: np.ndarray
+    rhs: np.ndarray
+    constraint_types: list
+    var_restrictions: list
+    method: str = "epsilon-constraint"
+    points: int = 11
+    workers: int = 1
+
+    @classmethod
+    def from_json(cls, data):
+        optimization = require(data, "optimization")
+        if optimization not in ("max", "min"):
+            raise SchemaError("optimization: expected 'max' or 'min'")
+
+        objectives = decode_array(require(data, "objectives"), "objectives", 2)
+        constraints = decode_array(require(data, "constraints"), "constraints", 2)
+        rhs = decode_array(require(data, "rhs"), "rhs", 1)
+        num_objectives, num_vars = objectives.shape
+        if num_objectives < 2:
+            raise SchemaError("objectives: expected at least 2 objectives")
+        num_constraints = constraints.shape[0]
+        if constraints.shape[1] != num_vars:
+            raise SchemaError(f"constraints: expected {num_vars} columns, got {constraints.shape[1]}")
+        if len(rhs) != num_constraints:
+            raise SchemaError(f"rhs: expected {num_constraints} values, got {len(rhs)}")
+        points = int_field(data, "points", 11, minimum=2)
+        if points ** (num_objectives - 1) > MAX_PARETO_POINTS:
+            raise SchemaError(f"points: {points} points for {num_objectives} objectives is more than "
+                              f"{MAX_PARETO_POINTS} sweep points")
+
+        return cls(
+            optimization=optimization,
+            objectives=objectives,
+            constraints=constraints,
+            rhs=rhs,
+            constraint_types=string_list(data, "constraint_types", CONSTRAINT_TYPES, num_constraints),
+            var_restrictions=string_list(data, "var_restrictions", CONTINUOUS_RESTRICTIONS, num_vars),
+            method=choice_field(data, "method", PARETO_METHODS, "epsilon-constraint"),
+            points=points,
+            workers=workers_field(data),
+        )
+
+
+@dataclass
+class StochasticRequest:
+    optimization: str
+    objective: np.ndarray
+    constraints: np.ndarray
+    rhs: np.ndarray
+    constraint_types: list
+    var_restrictions: list
+    first_stage: list
+    rhs_deltas: np.ndarray
+    cost_deltas: np.ndarray = field(default=None)
+    probabilities: np.ndarray = field(default=None)
+    method: str = "l-shaped"
+    workers: int = 1
+
+    @classmethod
+    def from_json(cls, data):
+        optimization = require(data, "optimization")
+        if optimization not in ("max", "min"):
+            raise SchemaError("optimization: expected 'max' or 'min'")
+
+        objective = decode_array(require(data, "objective"), "objective", 1)
+        constraints = decode_array(require(data, "constraints"), "constraints", 2)
+        rhs = decode_array(require(data, "rhs"), "rhs", 1)
+        num_constraints, num_vars = constraints.shape
+        if num_vars != len(objective):
+            raise SchemaError(f"constraints: expected {len(objective)} columns, got {num_vars}")
+        if len(rhs) != num_constraints:
+            raise SchemaError(f"rhs: expected {num_constraints} values, got {len(rhs)}")
+
+        first_stage = data.get("first_stage", [])
+        if (not isinstance(first_stage, list) or len(set(first_stage)) != len(first_stage)
+                or not all(isinstance(j, int) and 0 <= j < num_vars for j in first_stage)):
+            raise SchemaError(f"first_stage: expected distinct variable indices below {num_vars}")
+
+        # Scenarios are given as rows of changes to the base model; at least one of the two is needed
+        if "rhs_deltas" not in data and "cost_deltas" not in data:
+            raise SchemaError("rhs_deltas: field is required unless cost_deltas is given")
+        cost_deltas = None
+        if "cost_deltas" in data:
+            cost_deltas = decode_array(data["cost_deltas"], "cost_deltas", 2)
+            if cost_deltas.shape[1] != num_vars:
+                raise SchemaError(f"cost_deltas: expected {num_vars} columns, got {cost_deltas.shape[1]}")
+        if "rhs_deltas" in data:
+            rhs_deltas = decode_array(data["rhs_deltas"], "rhs_deltas", 2)
+            if rhs_deltas.shape[1] != num_constraints:
+                raise SchemaError(f"rhs_deltas: expected {num_constraints} columns, got {rhs_deltas.shape[1]}")
+        else:
+            rhs_deltas = np.zeros((len(cost_deltas), num_constraints))
+        num_scenarios = len(rhs_deltas)
+        if num_scenarios == 0:
+            raise SchemaError("rhs_deltas: expected at least one scenario")
+        if cost_deltas is not None and len(cost_deltas) != num_scenarios:
+            raise SchemaError(f"cost_deltas: expected {num_scenarios} scenarios, got {len(cost_deltas)}")
+
+        probabilities = None
+        if "probabilities" in data:
+            probabilities = decode_array(data["probabilities"], "probabilities", 1)
+            if len(probabilities) != num_scenarios:
+                raise SchemaError(f"probabilities: expected {num_scenarios} values, got {len(probabilities)}")
+            if np.any(probabilities < 0) or abs(probabilities.sum() - 1) > 1e-9:
+                raise SchemaError("probabilities: expected non-negative values summing to 1")
+
+        return cls(
+            optimization=optimization,
+            objective=objective,
+            constraints=constraints,
+            rhs=rhs,
+            constraint_types=string_list(data, "constraint_types", CONSTRAINT_TYPES, num_constraints),
+            var_restrictions=string_list(data, "var_restrictions", CONTINUOUS_RESTRICTIONS, num_vars),
+            first_stage=first_stage,
+            rhs_deltas=rhs_deltas,
+            cost_deltas=cost_deltas,
+            probabilities=probabilities,
+            method=choice_field(data, "method", STOCHASTIC_METHODS, "l-shaped"),
+            workers=workers_field(data),
+        )
+
+
+def parse_stochastic_request(data):
+    """Validate a /stochastic payload and return a StochasticRequest."""
+    if not isinstance(data, dict):
+        raise SchemaError("request body must be a JSON object")
+    return StochasticRequest.from_json(data)
+
+
+def parse_pareto_request(data):
+    """Validate a /pareto payload and return a ParetoRequest."""
+    if not isinstance(data, dict):
+        raise SchemaError("request body must be a JSON object")
+    return ParetoRequest.from_json(data)
+
+
+def parse_request(data):
+    """Validate a /solve payload and return an LPRequest or GoalRequest."""
+    if not isinstance(data, dict):
+        raise SchemaError("request body must be a JSON object")
+    if data.get("method") == "goal":
+        return GoalRequest.from_json(data)
+    return LPRequest.from_json(data)
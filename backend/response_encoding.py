@@ -0,0 +1,94 @@
+import gzip
+import json
+
+import numpy as np
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_STEPS_LIMIT = 50
+# Responses smaller than this are sent uncompressed; compressing them costs more than it saves
+MIN_COMPRESS_BYTES = 1024
+
+
+def numpy_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """Serialize a solver result to JSON bytes, using orjson (with native NumPy support) when installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=numpy_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=numpy_default, separators=(",", ":")).encode()
+
+
+def paginate_steps(payload, args):
+    """
+    Trim payload["steps"] to the page requested by the query string.
+
+    `steps_offset` and `steps_limit` select a page (default: the first DEFAULT_STEPS_LIMIT
+    steps); `steps=all` returns every step. The total count is always reported in `steps_total`.
+    """
+    steps = payload.get("steps")
+    if steps is None:
+        return payload
+    total = len(steps)
+    offset = max(args.get("steps_offset", 0, type=int), 0)
+    if args.get("steps") == "all":
+        limit = total
+    else:
+        limit = max(args.get("steps_limit", DEFAULT_STEPS_LIMIT, type=int), 0)
+    payload = dict(payload)
+    payload["steps"] = steps[offset:offset + limit]
+    payload["steps_offset"] = offset
+    payload["steps_total"] = total
+    return payload
+
+
+def choose_encoding(accept_encoding):
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values; None means identity."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        pieces = part.strip().split(";")
+        name = pieces[0].strip().lower()
+        quality = 1.0
+        for param in pieces[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            offered[name] = quality
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [(offered.get(name, offered.get("*", 0.0)), name) for name in supported]
+    quality, name = max(candidates, key=lambda candidate: candidate[0])
+    return name if quality > 0 else None
+
+
+def encode_response(payload, request, status=200):
+    """Build the JSON response for a solver result: paginate steps, serialize, and compress if accepted."""
+    body = dumps(paginate_steps(payload, request.args))
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding == "br":
+            body = brotli.compress(body, quality=4)
+            headers["Content-Encoding"] = "br"
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+    return Response(body, status=status, mimetype="application/json", headers=headers)
@@ -0,0 +1,62 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Shared memory blocks this process has attached to, kept open so the NumPy views stay valid
+attached_blocks = {}
+
+
+class SharedModel:
+    """
+    Places the arrays of an LP model in multiprocessing shared memory.
+
+    Only the small handle returned by `handle()` needs to be sent to worker processes;
+    workers call `attach_model(handle)` to get zero-copy NumPy views of the same buffers.
+    The creating process owns the blocks and must call `close()` (or use it as a context
+    manager) once the workers are done.
+    """
+
+    def __init__(self, **arrays):
+        """
+        Args:
+            arrays: Named arrays to share, e.g. objective=..., constraints=..., rhs=...
+        """
+        self.blocks = {}
+        self.arrays = {}
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values, dtype=float)
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            view = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+            view[...] = values
+            self.blocks[name] = block
+            self.arrays[name] = view
+
+    def handle(self):
+        """Return a small picklable description of the shared arrays."""
+        return {name: (self.blocks[name].name, view.shape, view.dtype.str) for name, view in self.arrays.items()}
+
+    def close(self):
+        """Release and unlink the shared memory blocks."""
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_model(handle):
+    """Return {name: array} views onto the shared blocks described by `handle`, without copying."""
+    arrays = {}
+    for name, (block_name, shape, dtype) in handle.items():
+        block = attached_blocks.get(block_name)
+        if block is None:
+            block = shared_memory.SharedMemory(name=block_name)
+            attached_blocks[block_name] = block
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays
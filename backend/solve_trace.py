@@ -0,0 +1,35 @@
+import json
+
+import numpy as np
+
+
+def write_trace(path, request_body, trace):
+    """
+    Write a solve trace to a compressed .npz file.
+
+    The file holds the raw JSON request body, the solver settings (method, dtype, precision) as
+    JSON, the pivots as an int32 array of (row, entering column, leaving column) and the seconds
+    spent on each pivot as float64, so a long pivot path stays a few bytes per pivot.
+
+    Args:
+        path: File to write; np.savez_compressed appends ".npz" when it is missing
+        request_body: The /solve request body as bytes
+        trace: result["trace"] of a LinearProgrammingSolver(trace=True) solve
+    """
+    settings = {name: value for name, value in trace.items() if name not in ("pivots", "seconds")}
+    np.savez_compressed(
+        path,
+        request=np.frombuffer(request_body, dtype=np.uint8),
+        settings=np.frombuffer(json.dumps(settings).encode(), dtype=np.uint8),
+        pivots=np.array(trace["pivots"], dtype=np.int32).reshape(-1, 3),
+        seconds=np.array(trace["seconds"], dtype=np.float64))
+
+
+def read_trace(path):
+    """Return (request JSON, trace dict) from a file written by write_trace."""
+    with np.load(path, allow_pickle=False) as data:
+        request = json.loads(data["request"].tobytes())
+        trace = json.loads(data["settings"].tobytes())
+        trace["pivots"] = data["pivots"].tolist()
+        trace["seconds"] = data["seconds"].tolist()
+    return request, trace
@@ -0,0 +1,187 @@
+"""
+Performance harness for every solver method.
+
+Generates random models from a seed, solves each one with every method that applies to it and
+sums the solve times per method; with --baseline they are compared against a saved run. The
+same models and methods are checked for equivalence against exact arithmetic by
+tests/test_equivalence.py.
+
+The harness exits with status 1 when a method raised, or became more than --max-slowdown times
+slower than in the baseline:
+
+    python solver_harness.py --models 300 --save-baseline harness_baseline.json
+    python solver_harness.py --models 300 --baseline harness_baseline.json --max-slowdown 1.5
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from decomposition import DecompositionSolver
+from goal_programing import PreemptiveGoalProgramming
+from linear_programing_solver import LinearProgrammingSolver
+from lp_model import LinearProgrammingModel
+
+
+def random_lp(rng):
+    """Random small LP; about a third are in standard form (all '<=', rhs >= 0) so plain simplex applies."""
+    num_rows, num_vars = rng.integers(1, 7), rng.integers(1, 7)
+    standard = rng.random() < 1 / 3
+    constraints = rng.integers(-5, 10, (num_rows, num_vars)).astype(float)
+    if standard:
+        rhs = rng.integers(0, 30, num_rows).astype(float)
+        constraint_types = ["<="] * num_rows
+    else:
+        rhs = rng.integers(-10, 30, num_rows).astype(float)
+        constraint_types = [["<=", ">=", "="][t] for t in rng.choice(3, num_rows, p=[0.5, 0.3, 0.2])]
+    unrestricted = rng.random(num_vars) < (0.3 if standard else 0)
+    return {
+        "objective": rng.integers(-5, 10, num_vars).astype(float).tolist(),
+        "constraints": constraints.tolist(),
+        "rhs": rhs.tolist(),
+        "constraint_types": constraint_types,
+        "var_restrictions": ["unrestricted" if free else ">=0" for free in unrestricted],
+        "type": "max" if rng.random() < 0.5 else "min",
+    }
+
+
+def random_goal_model(rng):
+    """Random preemptive goal model with non-negative goal and resource rows."""
+    num_goals, num_rows, num_vars = rng.integers(1, 5), rng.integers(1, 4), rng.integers(1, 5)
+    return {
+        "goals_coeffs": rng.integers(0, 10, (num_goals, num_vars)).astype(float).tolist(),
+        "goals_values": rng.integers(1, 40, num_goals).astype(float).tolist(),
+        "constraints_coeffs": rng.integers(0, 10, (num_rows, num_vars)).astype(float).tolist(),
+        "constraints_values": rng.integers(5, 50, num_rows).astype(float).tolist(),
+        "goals_directions": [[">=", "<=", "="][t] for t in rng.integers(0, 3, num_goals)],
+    }
+
+
+def is_standard_form(model):
+    return all(c_type == "<=" for c_type in model["constraint_types"]) and min(model["rhs"]) >= 0
+
+
+def non_negative(model):
+    return all(res == ">=0" for res in model["var_restrictions"])
+
+
+def solver_method(method, **options):
+    def run(model):
+        return LinearProgrammingSolver(model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                                       model["var_restrictions"], method=method, type=model["type"], **options).solve()
+    return run
+
+
+def lp_model_method(model):
+    return LinearProgrammingModel(model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                                  model["var_restrictions"], type=model["type"]).solve()
+
+
+def decomposition_method(model):
+    return DecompositionSolver(model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                               model["var_restrictions"], type=model["type"]).solve()
+
+
+# name: (applies to model, run, relative tolerance on the objective and on feasibility)
+LP_METHODS = {
+    "simplex": (is_standard_form, solver_method("simplex"), 1e-7),
+    "big-m": (non_negative, solver_method("big-m"), 1e-7),
+    "two-phase": (non_negative, solver_method("two-phase"), 1e-7),
+    "two-phase-float32": (non_negative, solver_method("two-phase", dtype=np.float32), 1e-4),
+    "two-phase-exact": (non_negative, solver_method("two-phase", precision="exact"), 1e-9),
+    "two-phase-out-of-core": (non_negative, solver_method("two-phase", out_of_core=True, block_rows=2), 1e-7),
+    "lp-model": (lambda model: True, lp_model_method, 1e-7),
+    "decomposition": (non_negative, decomposition_method, 1e-6),
+}
+
+
+def goal_method(kernel):
+    def run(model):
+        return PreemptiveGoalProgramming(model["goals_coeffs"], model["goals_values"], model["constraints_coeffs"],
+                                         model["constraints_values"], [0] * len(model["goals_coeffs"][0]),
+                                         model["goals_directions"], kernel=kernel).solve()
+    return run
+
+
+GOAL_METHODS = {"goal": goal_method("auto"), "goal-numpy": goal_method("numpy")}
+
+
+def timed(run, model):
+    start = time.perf_counter()
+    try:
+        result = run(model)
+    except Exception as error:
+        result = {"error": f"raised {error!r}"}
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=300, help="Number of random LPs (and of goal models)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--methods", nargs="+", default=list(LP_METHODS) + list(GOAL_METHODS))
+    parser.add_argument("--baseline", help="JSON timings of an earlier run to compare against")
+    parser.add_argument("--save-baseline", help="Write this run's timings to a JSON file")
+    parser.add_argument("--max-slowdown", type=float, default=1.5,
+                        help="Fail when a method takes more than this many times its baseline time")
+    args = parser.parse_args()
+
+    timings = defaultdict(float)
+    counts = defaultdict(int)
+    failures = []
+    rng = np.random.default_rng(args.seed)
+    for index in range(args.models):
+        model = random_lp(rng)
+        for name in args.methods:
+            if name not in LP_METHODS:
+                continue
+            applies, run, _ = LP_METHODS[name]
+            if not applies(model):
+                continue
+            result, elapsed = timed(run, model)
+            timings[name] += elapsed
+            counts[name] += 1
+            if (result.get("error") or "").startswith("raised"):
+                failures.append(f"lp {index} ({name}): {result['error']}")
+
+        goal_model = random_goal_model(rng)
+        for name in args.methods:
+            if name not in GOAL_METHODS:
+                continue
+            result, elapsed = timed(GOAL_METHODS[name], goal_model)
+            timings[name] += elapsed
+            counts[name] += 1
+            if (result.get("error") or "").startswith("raised"):
+                failures.append(f"goal {index} ({name}): {result['error']}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print(f"{'method':<24} {'models':>7} {'total ms':>10} {'baseline ms':>12} {'ratio':>7}")
+    for name in args.methods:
+        if not counts[name]:
+            continue
+        line = f"{name:<24} {counts[name]:>7} {timings[name] * 1000:>10.1f}"
+        if name in baseline:
+            ratio = timings[name] / baseline[name]
+            line += f" {baseline[name] * 1000:>12.1f} {ratio:>7.2f}"
+            if ratio > args.max_slowdown:
+                failures.append(f"{name}: {ratio:.2f}x slower than the baseline (limit {args.max_slowdown}x)")
+        print(line)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(dict(timings), baseline_file, indent=2)
+
+    print(f"seed {args.seed}: {len(failures)} failure(s)")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lp_model import LinearProgrammingModel
+from request_schema import STOCHASTIC_METHODS
+from shared_model import SharedModel, attach_model
+
+# Worker processes keep one RecourseModel per shared model, so each worker warm-starts from its own last basis
+recourse_models = {}
+
+
+class RecourseModel:
+    """
+    The second-stage LP of every scenario: max q_s y subject to W y (types) h_s - T x.
+
+    All scenarios share W, so one LinearProgrammingModel is kept and only its right-hand side
+    (and its costs, for scenarios with cost deltas) changes between solves; every solve after the
+    first starts from the previous scenario's basis and reuses its B^-1. When a scenario is
+    infeasible for the given x, an elastic copy of the model (each row may be violated at a cost
+    of 1 per unit) measures the violation for a feasibility cut.
+    """
+
+    def __init__(self, recourse, technology, rhs, costs, constraint_types, var_restrictions):
+        """
+        Args:
+            recourse: W, the second-stage rows over the second-stage variables
+            technology: T, the second-stage rows over the first-stage variables
+            rhs: h, one row of second-stage right-hand sides per scenario
+            costs: q, one row of max-sense second-stage costs per scenario
+            constraint_types, var_restrictions: Of the second-stage rows and variables
+        """
+        self.recourse = recourse
+        self.technology = technology
+        self.rhs = rhs
+        self.costs = costs
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = list(var_restrictions)
+        self.lp = None
+        self.elastic = None
+
+    def solve(self, x, scenario):
+        """Return (status, value, duals, solution) of one scenario at first-stage values x."""
+        rhs = self.rhs[scenario] - self.technology @ x
+        costs = self.costs[scenario]
+        if self.lp is None:
+            self.lp = LinearProgrammingModel(costs, self.recourse, rhs, self.constraint_types, self.var_restrictions)
+        else:
+            if not np.array_equal(self.lp.objective, costs):
+                self.lp.set_objective(costs)
+            self.lp.update_rhs(rhs)
+        result = self.lp.solve()
+        if not result.get("error"):
+            return "optimal", result["optimal_value"], result["duals"], result["solution"]
+        if result["error"] == "Unbounded solution":
+            return "unbounded", None, None, None
+
+        if self.elastic is None:
+            num_rows, num_vars = self.recourse.shape
+            identity = np.eye(num_rows)
+            self.elastic = LinearProgrammingModel(
+                np.concatenate((np.zeros(num_vars), -np.ones(2 * num_rows))),
+                np.hstack((self.recourse, identity, -identity)), rhs, self.constraint_types,
+                self.var_restrictions + [">=0"] * 2 * num_rows)
+        else:
+            self.elastic.update_rhs(rhs)
+        result = self.elastic.solve()
+        return "infeasible", result["optimal_value"], result["duals"], None
+
+
+def solve_shared_scenarios(handle, constraint_types, var_restrictions, x, scenarios):
+    """Solve scenarios in a worker process, on the recourse model arrays in shared memory."""
+    key = handle["recourse"][0]
+    if key not in recourse_models:
+        model = attach_model(handle)
+        recourse_models[key] = RecourseModel(model["recourse"], model["technology"], model["rhs"], model["costs"],
+                                             constraint_types, var_restrictions)
+    return [recourse_models[key].solve(x, scenario) for scenario in scenarios]
+
+
+class StochasticSolver:
+    """
+    Two-stage stochastic LP over a set of scenarios sharing one base model.
+
+    The variables listed in `first_stage` are decided once for all scenarios; every other
+    variable is a recourse variable with one copy per scenario. Scenario s changes the base
+    model by rhs_deltas[s] (on the rows) and cost_deltas[s] (on the variables), and has
+    probability probabilities[s]; the expected objective is optimized. Rows that only use
+    first-stage variables and do not change between scenarios are first-stage rows; all other
+    rows are copied per scenario.
+
+    "l-shaped" solves it by multi-cut Benders decomposition: a master LP over the first-stage
+    variables and one value estimate per scenario, cut by the recourse duals of every scenario
+    at the master's current solution, until the master's bound meets the best expected value
+    found. The recourse LPs of all scenarios share their constraint matrix, so they are solved on
+    one warm LinearProgrammingModel per process (workers > 1 spreads scenarios over a process
+    pool that reads the arrays from shared memory). The first master solution comes from the
+    expected-value problem (every scenario replaced by the mean rhs and costs).
+
+    "extensive" builds the deterministic equivalent with every scenario's rows and recourse
+    variables as diagonal blocks, and solves it in one LP. L-shaped falls back to it when the
+    master LP is unbounded, or when there are no recourse variables.
+    """
+
+    def __init__(self, objective, constraints, rhs, constraint_types, var_restrictions, first_stage, rhs_deltas,
+                 cost_deltas=None, probabilities=None, type="max", method="l-shaped", workers=1,
+                 max_iterations=200, tolerance=1e-7):
+        """
+        Args:
+            objective, constraints, rhs, constraint_types, var_restrictions, type:
+                The base model, as for LinearProgrammingSolver
+            first_stage: Indices of the first-stage variables
+            rhs_deltas: One row of rhs changes per scenario
+            cost_deltas: Optional row of objective changes per scenario
+            probabilities: Scenario probabilities; equally likely when omitted
+            method: "l-shaped" or "extensive"
+            workers: Number of processes the L-shaped recourse solves are spread across
+            max_iterations: Maximum number of L-shaped master solves
+            tolerance: Relative gap between the master bound and the best expected value at which
+                L-shaped stops
+        """
+        self.objective = np.array(objective, dtype=float)
+        self.constraints = np.array(constraints, dtype=float).reshape(-1, len(self.objective))
+        self.rhs = np.array(rhs, dtype=float)
+        self.constraint_types = list(constraint_types)
+        self.var_restrictions = list(var_restrictions)
+        self.type = type.lower()
+        if method not in STOCHASTIC_METHODS:
+            raise ValueError(f"Unknown stochastic method: {method}")
+        self.method = method
+        self.workers = workers
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+        self.rhs_deltas = np.array(rhs_deltas, dtype=float).reshape(-1, len(self.rhs))
+        num_scenarios = len(self.rhs_deltas)
+        self.cost_deltas = (np.zeros((num_scenarios, len(self.objective))) if cost_deltas is None
+                            else np.array(cost_deltas, dtype=float).reshape(num_scenarios, -1))
+        self.probabilities = (np.full(num_scenarios, 1.0 / num_scenarios) if probabilities is None
+                              else np.array(probabilities, dtype=float))
+
+        num_vars = len(self.objective)
+        self.first = sorted(set(int(j) for j in first_stage))
+        self.second = [j for j in range(num_vars) if j not in set(self.first)]
+        varied = np.any(self.rhs_deltas != 0, axis=0)
+        uses_second = np.any(self.constraints[:, self.second] != 0, axis=1)
+        self.second_rows = [i for i in range(len(self.rhs)) if varied[i] or uses_second[i]]
+        self.first_rows = [i for i in range(len(self.rhs)) if not (varied[i] or uses_second[i])]
+
+        # Everything is solved in maximization sense
+        sign = 1.0 if self.type == "max" else -1.0
+        scenario_costs = sign * (self.objective + self.cost_deltas)
+        self.first_costs = self.probabilities @ scenario_costs[:, self.first]
+        self.second_costs = scenario_costs[:, self.second]
+        self.recourse = self.constraints[np.ix_(self.second_rows, self.second)]
+        self.technology = self.constraints[np.ix_(self.second_rows, self.first)]
+        self.second_rhs = self.rhs[self.second_rows] + self.rhs_deltas[:, self.second_rows]
+
+    def first_stage_model(self):
+        return (self.constraints[np.ix_(self.first_rows, self.first)], self.rhs[self.first_rows],
+                [self.constraint_types[i] for i in self.first_rows], [self.var_restrictions[j] for j in self.first])
+
+    def extensive_form(self, second_rhs, second_costs, probabilities):
+        """Deterministic equivalent: first-stage rows, then the rows of every scenario over its own recourse copy."""
+        constraints, rhs, constraint_types, var_restrictions = self.first_stage_model()
+        num_first = len(self.first)
+        num_rows, num_second = self.recourse.shape
+        num_scenarios = len(probabilities)
+        matrix = np.zeros((len(rhs) + num_scenarios * num_rows, num_first + num_scenarios * num_second))
+        matrix[:len(rhs), :num_first] = constraints
+        costs = np.concatenate((self.first_costs, (probabilities[:, None] * second_costs).ravel()))
+        for s in range(num_scenarios):
+            rows = slice(len(rhs) + s * num_rows, len(rhs) + (s + 1) * num_rows)
+            matrix[rows, :num_first] = self.technology
+            matrix[rows, num_first + s * num_second:num_first + (s + 1) * num_second] = self.recourse
+        second_types = [self.constraint_types[i] for i in self.second_rows]
+        second_restrictions = [self.var_restrictions[j] for j in self.second]
+        return LinearProgrammingModel(costs, matrix, np.concatenate((rhs, second_rhs.ravel())),
+                                      constraint_types + second_types * num_scenarios,
+                                      var_restrictions + second_restrictions * num_scenarios)
+
+    def solve_extensive(self):
+        result = self.extensive_form(self.second_rhs, self.second_costs, self.probabilities).solve()
+        if result.get("error"):
+            return self.error_result(result["error"])
+        values = np.array(result["solution"])
+        num_first, num_second = len(self.first), len(self.second)
+        x = values[:num_first]
+        recourse = values[num_first:].reshape(len(self.probabilities), num_second)
+        return self.build_result(x, recourse, "extensive", iterations=result["iterations"], cuts=0)
+
+    def expected_value_start(self):
+        """First-stage solution of the expected-value problem, or None when it has none."""
+        model = self.extensive_form((self.probabilities @ self.second_rhs)[None, :],
+                                    (self.probabilities @ self.second_costs)[None, :], np.ones(1))
+        result = model.solve()
+        if result.get("error"):
+            return None
+        return np.array(result["solution"][:len(self.first)])
+
+    def solve_scenarios(self, x):
+        if self.executor is None:
+            return [self.recourse_model.solve(x, s) for s in range(len(self.probabilities))]
+        handle = self.shared.handle()
+        types = [self.constraint_types[i] for i in self.second_rows]
+        restrictions = [self.var_restrictions[j] for j in self.second]
+        runs = np.array_split(np.arange(len(self.probabilities)), self.workers)
+        futures = [self.executor.submit(solve_shared_scenarios, handle, types, restrictions, x, run.tolist())
+                   for run in runs if len(run)]
+        return [outcome for future in futures for outcome in future.result()]
+
+    def l_shaped(self):
+        x = self.expected_value_start()
+        if x is None:
+            return self.solve_extensive()
+        num_first, num_scenarios = len(self.first), len(self.probabilities)
+        master = None
+        thetas = None
+        best = None
+        cuts = 0
+        converged = False
+        for iteration in range(1, self.max_iterations + 1):
+            outcomes = self.solve_scenarios(x)
+            if any(status == "unbounded" for status, *_ in outcomes):
+                return self.error_result("Unbounded solution")
+            if all(status == "optimal" for status, *_ in outcomes):
+                value = float(self.first_costs @ x + self.probabilities @ [value for _, value, *_ in outcomes])
+                if best is None or value > best[0]:
+                    best = (value, x, np.array([solution for *_, solution in outcomes]))
+
+            new_cuts = []
+            for s, (status, value, duals, _) in enumerate(outcomes):
+                # Q_s is concave in its rhs h_s - T x, so the duals give a supergradient plane at x
+                gradient = np.array(duals) @ self.technology
+                row = np.zeros(num_first + num_scenarios)
+                row[:num_first] = gradient
+                if status == "infeasible":
+                    # Elastic violation must reach 0: value - gradient (x' - x) >= 0
+                    new_cuts.append((row, value + gradient @ x))
+                elif thetas is None or thetas[s] > value + self.tolerance * max(1.0, abs(value)):
+                    row[num_first + s] = 1.0
+                    new_cuts.append((row, value + gradient @ x))
+            if master is None:
+                master = LinearProgrammingModel(self.first_costs, *self.first_stage_model())
+                for s in range(num_scenarios):
+                    master.add_variable(self.probabilities[s], np.zeros(len(master.rhs)), "unrestricted")
+            elif not new_cuts:
+                converged = True
+                break
+            for row, bound in new_cuts:
+                master.add_constraint(row, "<=", bound)
+            cuts += len(new_cuts)
+
+            result = master.solve()
+            if result.get("error") == "Infeasible solution":
+                return self.error_result("Infeasible solution")
+            if result.get("error"):
+                return self.solve_extensive()
+            solution = np.array(result["solution"])
+            x, thetas = solution[:num_first], solution[num_first:]
+            if best is not None and result["optimal_value"] - best[0] <= self.tolerance * max(1.0, abs(best[0])):
+                converged = True
+                break
+        if best is None:
+            return self.solve_extensive()
+        return self.build_result(best[1], best[2], "l-shaped", iterations=iteration, cuts=cuts, converged=converged)
+
+    def build_result(self, x, recourse, method, **details):
+        """Result dict in the original sense: the expected solution and value, and every scenario's own."""
+        num_vars = len(self.objective)
+        scenarios = []
+        expected = np.zeros(num_vars)
+        for s, (probability, values) in enumerate(zip(self.probabilities, recourse)):
+            solution = np.zeros(num_vars)
+            solution[self.first] = x
+            solution[self.second] = values
+            expected += probability * solution
+            scenarios.append({"solution": solution.tolist(),
+                              "optimal_value": float((self.objective + self.cost_deltas[s]) @ solution)})
+        return {
+            "solution": expected.tolist(),
+            "optimal_value": float(self.probabilities @ [scenario["optimal_value"] for scenario in scenarios]),
+            "scenarios": scenarios,
+            "method": method,
+            "steps": [],
+            **details}
+
+    def error_result(self, error):
+        return {"solution": None, "optimal_value": None, "error": error, "steps": []}
+
+    def solve(self):
+        if self.method == "extensive" or not self.second:
+            return self.solve_extensive()
+
+        self.recourse_model = RecourseModel(self.recourse, self.technology, self.second_rhs, self.second_costs,
+                                            [self.constraint_types[i] for i in self.second_rows],
+                                            [self.var_restrictions[j] for j in self.second])
+        self.executor = None
+        self.shared = None
+        if self.workers > 1:
+            self.shared = SharedModel(recourse=self.recourse, technology=self.technology, rhs=self.second_rhs,
+                                      costs=self.second_costs)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            if not self.first:
+                # No first stage: the scenarios are independent LPs sharing one warm recourse model
+                outcomes = self.solve_scenarios(np.zeros(0))
+                for status, *_ in outcomes:
+                    if status != "optimal":
+                        return self.error_result("Unbounded solution" if status == "unbounded"
+                                                 else "Infeasible solution")
+                return self.build_result(np.zeros(0), [solution for *_, solution in outcomes], "independent",
+                                         iterations=1, cuts=0)
+            return self.l_shaped()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.shared.close()
+                self.executor = None
+                self.shared = None
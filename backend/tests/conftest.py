@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The backend modules import each other by their flat names, as when run from the backend directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,151 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from branch_and_bound import BranchAndBoundSolver
+from exact_arithmetic import ExactSimplex
+
+
+def random_integer_model(rng, mixed):
+    """
+    Random model whose integer variables are boxed by the first row (positive coefficients on the
+    integer variables only, rhs <= 25).
+
+    Mixed models add a continuous (possibly unrestricted) variable and '>=' / '=' rows.
+    """
+    num_int = rng.integers(1, 4)
+    num_vars = num_int + (1 if mixed else 0)
+    rows = [np.concatenate((rng.integers(3, 10, num_int), np.zeros(num_vars - num_int)))]
+    rhs = [rng.integers(10, 26)]
+    constraint_types = ["<="]
+    for _ in range(rng.integers(1, 3)):
+        rows.append(rng.integers(-3, 9, num_vars))
+        c_type = rng.choice(["<=", ">=", "="]) if mixed else "<="
+        constraint_types.append(str(c_type))
+        rhs.append(rng.integers(10, 40) if c_type == "<=" else rng.integers(0, 6))
+    restrictions = [str(rng.choice(["integer", "binary"], p=[0.7, 0.3])) for _ in range(num_int)]
+    if mixed:
+        restrictions.append(str(rng.choice([">=0", "unrestricted"])))
+    return {
+        "objective": rng.integers(-2, 9, num_vars).astype(float),
+        "constraints": np.array(rows, dtype=float),
+        "rhs": np.array(rhs, dtype=float),
+        "constraint_types": constraint_types,
+        "var_restrictions": restrictions,
+        "type": "max" if rng.random() < 0.5 else "min",
+    }
+
+
+def enumerate_optimum(model):
+    """Status and objective value by trying every integer point in the box, solving the continuous rest exactly."""
+    restrictions = model["var_restrictions"]
+    integer = [j for j, res in enumerate(restrictions) if res in ("integer", "binary")]
+    continuous = [j for j in range(len(restrictions)) if j not in integer]
+    first = model["constraints"][0]
+    boxes = [range(2) if restrictions[j] == "binary" else range(int(model["rhs"][0] // first[j]) + 1)
+             for j in integer]
+    sign = 1.0 if model["type"] == "max" else -1.0
+    best = None
+    for point in itertools.product(*boxes):
+        point = np.array(point, dtype=float)
+        rhs = model["rhs"] - model["constraints"][:, integer] @ point
+        value = sign * model["objective"][integer] @ point
+        if continuous:
+            exact = ExactSimplex(sign * model["objective"][continuous], model["constraints"][:, continuous], rhs,
+                                 model["constraint_types"], [restrictions[j] for j in continuous]).solve()
+            if exact["status"] == "unbounded":
+                return "unbounded", None
+            if exact["status"] == "infeasible":
+                continue
+            value += float(exact["optimal_value"])
+        else:
+            slack = {"<=": rhs >= -1e-9, ">=": rhs <= 1e-9, "=": np.abs(rhs) <= 1e-9}
+            if not all(slack[c_type][i] for i, c_type in enumerate(model["constraint_types"])):
+                continue
+        best = value if best is None else max(best, value)
+    if best is None:
+        return "infeasible", None
+    return "optimal", sign * best
+
+
+def solve(model, **options):
+    return BranchAndBoundSolver(model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                                model["var_restrictions"], type=model["type"], **options).solve()
+
+
+def check(model, result):
+    status, value = enumerate_optimum(model)
+    if status != "optimal":
+        assert result["error"] == {"infeasible": "Infeasible solution", "unbounded": "Unbounded solution"}[status]
+        return
+    assert result.get("error") is None
+    assert result["optimal_value"] == pytest.approx(value, rel=1e-7, abs=1e-7)
+    solution = np.array(result["solution"])
+    for j, res in enumerate(model["var_restrictions"]):
+        if res in ("integer", "binary"):
+            assert solution[j] == pytest.approx(round(solution[j]), abs=1e-6)
+
+
+@pytest.mark.parametrize("node_selection", ["best-bound", "depth-first"])
+def test_pure_integer_models_match_enumeration(node_selection):
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        model = random_integer_model(rng, mixed=False)
+        check(model, solve(model, node_selection=node_selection))
+
+
+def test_mixed_models_match_enumeration():
+    # Includes unrestricted continuous variables with '>=' and '=' rows, which the warm-started
+    # node models support
+    rng = np.random.default_rng(1)
+    for _ in range(25):
+        model = random_integer_model(rng, mixed=True)
+        check(model, solve(model))
+
+
+@pytest.mark.parametrize("mixed", [False, True])
+def test_workers_give_the_same_optimum(mixed):
+    # Worker tasks rebuild each node from shared memory and warm-start it from the parent's basis indices
+    rng = np.random.default_rng(2)
+    for _ in range(8):
+        model = random_integer_model(rng, mixed=mixed)
+        one, two = solve(model), solve(model, workers=2)
+        assert one.get("error") == two.get("error")
+        assert two.get("optimal_value") == pytest.approx(one.get("optimal_value"))
+
+
+def test_optimal_result_has_steps_and_node_count():
+    model = {"objective": [5.0, 4.0], "constraints": np.array([[6.0, 4.0], [1.0, 2.0]]), "rhs": [24.0, 6.0],
+             "constraint_types": ["<=", "<="], "var_restrictions": ["integer", "integer"], "type": "max"}
+    result = solve(model)
+    assert result["optimal_value"] == pytest.approx(20.0)
+    assert result["steps"]
+    assert result["nodes"] >= 1
+    assert not result["node_limit_reached"]
+
+
+def test_node_limit():
+    model = {"objective": [1.0, 1.0], "constraints": np.array([[2.0, 2.0]]), "rhs": [3.0],
+             "constraint_types": ["<="], "var_restrictions": ["integer", "integer"], "type": "max"}
+    result = solve(model, node_limit=1)
+    assert result["nodes"] == 1
+    assert result["error"] == "Node limit reached"
+
+
+def test_unknown_node_selection():
+    with pytest.raises(ValueError):
+        BranchAndBoundSolver([1.0], [[1.0]], [1.0], ["<="], ["integer"], node_selection="breadth-first")
+
+
+@pytest.mark.parametrize("method", ["auto-race", "decomposition"])
+def test_integer_models_with_non_tableau_methods(method):
+    import app
+    from request_schema import parse_request
+
+    model = parse_request({"method": method, "optimization": "max", "objective": [5, 4],
+                           "constraints": [[6, 4], [1, 2], [1, 1]], "rhs": [24, 6, 1],
+                           "constraint_types": ["<=", "<=", ">="], "var_restrictions": ["integer", "integer"]})
+    result = app.solve_request(model)
+    assert result["optimal_value"] == pytest.approx(20.0)
+    assert result["steps"]
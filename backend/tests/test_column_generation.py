@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from column_generation import ColumnGeneration, cutting_stock, enumerate_patterns, knapsack_pricing
+from lp_model import LinearProgrammingModel
+
+INSTANCES = [
+    ([3, 5, 9], [25, 20, 15], 20),
+    ([45, 36, 31, 14], [97, 610, 395, 211], 100),
+    ([2, 3, 7, 11], [40, 33, 12, 9], 23),
+]
+
+
+@pytest.mark.parametrize("widths, demands, roll_width", INSTANCES)
+def test_cutting_stock_matches_every_pattern(widths, demands, roll_width):
+    patterns = enumerate_patterns(widths, roll_width)
+    full = LinearProgrammingModel(np.ones(patterns.shape[1]), patterns, demands, [">="] * len(widths),
+                                  [">=0"] * patterns.shape[1], type="min").solve()
+    result = cutting_stock(widths, demands, roll_width)
+    assert result["optimal_value"] == pytest.approx(full["optimal_value"], rel=1e-9)
+    # Every generated column is a pattern that fits on a roll
+    columns = np.array(result["columns"])
+    assert np.all(np.array(widths) @ columns <= roll_width + 1e-9)
+    history = result["objective_history"]
+    assert all(later <= earlier + 1e-9 for earlier, later in zip(history, history[1:]))
+
+
+def test_knapsack_pricing_returns_the_best_pattern():
+    widths, duals = [3, 5, 9], [0.2, 0.3, 0.5]
+    pricing = knapsack_pricing(widths, 20)
+    [(cost, pattern)] = pricing(duals)
+    assert cost == 1.0
+    assert np.dot(pattern, widths) <= 20
+    best = np.max(np.array(duals) @ enumerate_patterns(widths, 20))
+    assert np.dot(pattern, duals) == pytest.approx(best)
+    assert pricing([0.1, 0.1, 0.1]) == []
+
+
+def test_stops_when_no_column_prices_out():
+    result = ColumnGeneration([2.0], [[1.0]], [4.0], [">="], lambda duals: [(1.0, [1.0])]).solve()
+    assert result["optimal_value"] == pytest.approx(4.0)
+    assert result["pricing_rounds"] == 2
+    assert result["objective_history"] == pytest.approx([8.0, 4.0])
+
+
+def test_max_iterations_stops_the_loop():
+    costs = iter([1.0, 0.5, 0.25, 0.125])
+    result = ColumnGeneration([2.0], [[1.0]], [4.0], [">="], lambda duals: [(next(costs), [1.0])],
+                              max_iterations=3).solve()
+    assert result["pricing_rounds"] == 3
+    assert result["optimal_value"] == pytest.approx(1.0)
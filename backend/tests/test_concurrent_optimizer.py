@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+import concurrent_optimizer
+from concurrent_optimizer import candidate_methods, model_signature, race_solve
+
+
+@pytest.fixture(autouse=True)
+def forget_winners():
+    concurrent_optimizer.winning_methods.clear()
+    yield
+    concurrent_optimizer.winning_methods.clear()
+
+
+def test_candidate_methods():
+    assert candidate_methods(["<=", "<="], [">=0", "unrestricted"]) == ["simplex"]
+    assert candidate_methods(["<=", ">="], [">=0", ">=0"]) == ["big-m", "two-phase"]
+    assert candidate_methods(["<=", "="], [">=0", "unrestricted"]) == []
+
+
+def test_unrestricted_standard_form_is_solved_by_simplex():
+    # max 2 x1 + x2  s.t.  x1 <= 4, x1 + x2 <= 2 with x2 unrestricted: the optimum has x2 < 0
+    result = race_solve([2.0, 1.0], [[1.0, 0.0], [1.0, 1.0]], [4.0, 2.0], ["<=", "<="], [">=0", "unrestricted"])
+    assert result["method"] == "simplex"
+    assert result["optimal_value"] == pytest.approx(6.0)
+    assert result["solution"] == pytest.approx([4.0, -2.0])
+
+
+def test_unrestricted_with_other_rows_is_not_raced():
+    # Big-M and two-phase would treat x2 as non-negative and report a wrong optimum
+    result = race_solve([2.0, 1.0], [[1.0, 0.0], [1.0, 1.0]], [4.0, 2.0], ["<=", "="], [">=0", "unrestricted"],
+                        methods=["big-m", "two-phase"])
+    assert result["solution"] is None
+    assert "unrestricted" in result["error"]
+
+
+def test_methods_that_do_not_apply_are_dropped():
+    result = race_solve([3.0, 2.0], [[1.0, 1.0], [1.0, 0.0]], [4.0, 3.0], ["<=", "<="], [">=0", ">=0"],
+                        methods=["simplex", "big-m"])
+    assert result["method"] == "simplex"
+    assert result["optimal_value"] == pytest.approx(11.0)
+
+
+def test_race_returns_a_correct_result_and_remembers_the_winner():
+    args = ([3.0, 2.0], [[1.0, 1.0], [1.0, 0.0]], [4.0, 1.0], ["<=", ">="], [">=0", ">=0"])
+    result = race_solve(*args)
+    assert result["method"] in ("big-m", "two-phase")
+    assert result["optimal_value"] == pytest.approx(12.0)
+    signature = model_signature(args[1], args[3], args[4], "max")
+    assert concurrent_optimizer.winning_methods[signature] == result["method"]
+    assert race_solve(*args)["method"] == result["method"]
+
+
+def test_winner_memory_is_bounded(monkeypatch):
+    monkeypatch.setattr(concurrent_optimizer, "RACE_MEMORY_SIZE", 2)
+    for method, size in [("big-m", 1), ("two-phase", 2), ("big-m", 3)]:
+        concurrent_optimizer.remember_method((size,), method)
+    assert list(concurrent_optimizer.winning_methods) == [(2,), (3,)]
+    assert concurrent_optimizer.remembered_method((2,)) == "two-phase"
+    concurrent_optimizer.remember_method((4,), "big-m")
+    assert list(concurrent_optimizer.winning_methods) == [(2,), (4,)]
+
+
+def test_remembered_winner_is_only_used_when_allowed():
+    args = ([3.0, 2.0], [[1.0, 1.0], [1.0, 0.0]], [4.0, 1.0], ["<=", ">="], [">=0", ">=0"])
+    concurrent_optimizer.remember_method(model_signature(args[1], args[3], args[4], "max"), "two-phase")
+    assert race_solve(*args)["method"] == "two-phase"
+    result = race_solve(*args, methods=["big-m"])
+    assert result["method"] == "big-m"
+    assert result["optimal_value"] == pytest.approx(12.0)
+
+
+def die(*args):
+    os._exit(1)
+
+
+def test_race_times_out_when_every_process_dies(monkeypatch):
+    monkeypatch.setattr(concurrent_optimizer, "run_method", die)
+    args = ([3.0, 2.0], [[1.0, 1.0], [1.0, 0.0]], [4.0, 1.0], ["<=", ">="], [">=0", ">=0"])
+    assert race_solve(*args, timeout=0.5)["error"] == "Solve timed out"
+
+
+def test_app_answers_a_timed_out_race_as_a_timeout(monkeypatch):
+    import app
+    from request_schema import parse_request
+
+    monkeypatch.setattr(concurrent_optimizer, "run_method", die)
+    monkeypatch.setattr(app, "SOLVE_TIMEOUT", 0.5)
+    model = parse_request({"method": "auto-race", "optimization": "max", "objective": [3, 2],
+                           "constraints": [[1, 1], [1, 0]], "rhs": [4, 1], "constraint_types": ["<=", ">="],
+                           "var_restrictions": [">=0", ">=0"]})
+    assert app.solve_request(model) is None
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from decomposition import DecompositionSolver, detect_blocks
+from exact_arithmetic import ExactSimplex
+
+
+def block_angular_model(rng, num_blocks, type):
+    """Bounded blocks of '<=' rows with positive coefficients, tied together by one or two linking rows."""
+    block_rows, block_vars = 3, 3
+    num_rows, num_vars = num_blocks * block_rows, num_blocks * block_vars
+    constraints = np.zeros((num_rows, num_vars))
+    for block in range(num_blocks):
+        rows = slice(block * block_rows, (block + 1) * block_rows)
+        columns = slice(block * block_vars, (block + 1) * block_vars)
+        constraints[rows, columns] = rng.integers(1, 8, (block_rows, block_vars))
+    linking = rng.integers(1, 5, (rng.integers(1, 3), num_vars))
+    linking_types = [str(c_type) for c_type in rng.choice(["<=", ">="], len(linking))]
+    linking_rhs = [rng.integers(20, 40) if c_type == "<=" else rng.integers(1, 5) for c_type in linking_types]
+    return {
+        "objective": rng.integers(-3, 8, num_vars).astype(float),
+        "constraints": np.vstack((constraints, linking)),
+        "rhs": np.concatenate((rng.integers(10, 30, num_rows), linking_rhs)).astype(float),
+        "constraint_types": ["<="] * num_rows + linking_types,
+        "var_restrictions": [">=0"] * num_vars,
+        "type": type,
+        "linking_rows": list(range(num_rows, num_rows + len(linking))),
+    }
+
+
+def exact_optimum(model):
+    sign = 1.0 if model["type"] == "max" else -1.0
+    exact = ExactSimplex(sign * model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                         model["var_restrictions"]).solve()
+    return exact["status"], sign * float(exact["optimal_value"]) if exact["status"] == "optimal" else None
+
+
+def solve(model, **options):
+    return DecompositionSolver(model["objective"], model["constraints"], model["rhs"], model["constraint_types"],
+                               model["var_restrictions"], type=model["type"], linking_rows=model["linking_rows"],
+                               **options).solve()
+
+
+def test_detect_blocks_finds_the_linking_row():
+    constraints = [[1, 1, 0, 0], [0, 0, 1, 1], [1, 1, 1, 1]]
+    linking_rows, blocks = detect_blocks(constraints, max_linking_fraction=0.5)
+    assert linking_rows == [2]
+    assert sorted(blocks) == [([0], [0, 1]), ([1], [2, 3])]
+
+
+def test_detect_blocks_without_structure():
+    linking_rows, blocks = detect_blocks([[1, 1], [1, 1]])
+    assert linking_rows == []
+    assert len(blocks) == 1
+
+
+@pytest.mark.parametrize("type", ["max", "min"])
+def test_matches_exact_arithmetic(type):
+    rng = np.random.default_rng(0 if type == "max" else 1)
+    for _ in range(15):
+        model = block_angular_model(rng, rng.integers(2, 4), type)
+        status, value = exact_optimum(model)
+        result = solve(model)
+        if status == "infeasible":
+            assert result["error"] == "Infeasible solution"
+            continue
+        assert result["blocks"] >= 2
+        assert result["optimal_value"] == pytest.approx(value, rel=1e-6, abs=1e-6)
+        lhs = model["constraints"] @ np.array(result["solution"])
+        for i, c_type in enumerate(model["constraint_types"]):
+            slack = lhs[i] - model["rhs"][i]
+            assert (slack <= 1e-6) if c_type == "<=" else (slack >= -1e-6)
+
+
+def test_workers_give_the_same_optimum():
+    model = block_angular_model(np.random.default_rng(2), 3, "max")
+    assert solve(model, workers=2)["optimal_value"] == pytest.approx(solve(model)["optimal_value"])
+
+
+def test_falls_back_to_a_monolithic_solve():
+    result = DecompositionSolver([3.0, 2.0], [[1.0, 1.0], [1.0, 0.0]], [4.0, 3.0], ["<=", "<="],
+                                 [">=0", ">=0"]).solve()
+    assert result["blocks"] == 1
+    assert result["optimal_value"] == pytest.approx(11.0)
+
+
+@pytest.mark.parametrize("linking_type", ["<=", ">=", "="])
+def test_unrestricted_variables_are_split(linking_type):
+    # min x1 + x2 + x3 - x4 with x1 + x3 linking; x1 is unrestricted, bounded by -2 <= x1 <= 5 in its block
+    model = {
+        "objective": np.array([1.0, 1.0, 1.0, -1.0]),
+        "constraints": np.array([[1, 0, 0, 0], [1, 0, 0, 0], [1, 1, 0, 0], [0, 0, 1, 1], [0, 0, 1, 0], [0, 0, 0, 1],
+                                 [1, 0, 1, 0]], dtype=float),
+        "rhs": np.array([-2.0, 5.0, -1.0, 1.0, 4.0, 3.0, -1.0]),
+        "constraint_types": [">=", "<=", ">=", ">=", "<=", "<=", linking_type],
+        "var_restrictions": ["unrestricted", ">=0", ">=0", ">=0"],
+        "type": "min",
+        "linking_rows": [6],
+    }
+    status, value = exact_optimum(model)
+    assert status == "optimal"
+    result = solve(model)
+    assert result["blocks"] == 2
+    assert result["optimal_value"] == pytest.approx(value)
+    assert result["solution"][0] < 0
+    assert model["objective"] @ result["solution"] == pytest.approx(value)
+
+
+def test_unrestricted_variables_in_the_monolithic_fallback():
+    # max -x1 - x2  s.t.  x1 - x2 = -3 with x1 unrestricted: x1 = -3, x2 = 0
+    result = DecompositionSolver([-1.0, -1.0], [[1.0, -1.0]], [-3.0], ["="], ["unrestricted", ">=0"]).solve()
+    assert result["blocks"] == 1
+    assert result["solution"] == pytest.approx([-3.0, 0.0])
+    assert result["optimal_value"] == pytest.approx(3.0)
@@ -0,0 +1,161 @@
+"""
+Every solver method agrees with exact arithmetic on the random models of solver_harness.py.
+
+LP methods are checked on status (optimal / infeasible / unbounded), objective value and
+feasibility of the returned solution against ExactSimplex in rational arithmetic. Goal models
+are checked against preemptive goal programming done exactly: one exact LP per priority level,
+each fixing the deviations of the levels above. Timings stay in solver_harness.py.
+"""
+import numpy as np
+import pytest
+
+from exact_arithmetic import ExactSimplex
+from solver_harness import GOAL_METHODS, LP_METHODS, random_goal_model, random_lp
+
+# Seeds 3, 5, 6 and 7 have models where a fixed big-M penalty used to hide infeasibility behind a ray
+SEEDS = range(9)
+MODELS = 150
+
+
+def reference_lp(model):
+    """Status and objective value of the model in exact arithmetic."""
+    sign = -1 if model["type"] == "min" else 1
+    exact = ExactSimplex([sign * c for c in model["objective"]], model["constraints"], model["rhs"],
+                         model["constraint_types"], model["var_restrictions"]).solve()
+    if exact["status"] != "optimal":
+        return exact["status"], None
+    return "optimal", sign * float(exact["optimal_value"])
+
+
+def result_status(result):
+    error = result.get("error")
+    if error is None:
+        return "optimal"
+    return {"Infeasible solution": "infeasible", "Unbounded solution": "unbounded"}.get(error, error)
+
+
+def check_lp(model, result, reference, tolerance):
+    """Return a description of the disagreement with the reference, or None."""
+    status, value = reference
+    got = result_status(result)
+    if got != status:
+        return f"status {got}, expected {status}"
+    if status != "optimal":
+        return None
+    scale = max(1.0, abs(value))
+    if abs(result["optimal_value"] - value) > tolerance * scale:
+        return f"objective {result['optimal_value']!r}, expected {value!r}"
+    x = np.array(result["solution"])
+    lhs = np.array(model["constraints"]) @ x
+    rhs = np.array(model["rhs"])
+    slack_scale = tolerance * max(1.0, float(np.max(np.abs(rhs), initial=0)), float(np.max(np.abs(x), initial=0)))
+    violations = {"<=": lhs - rhs, ">=": rhs - lhs, "=": np.abs(lhs - rhs)}
+    for i, c_type in enumerate(model["constraint_types"]):
+        if violations[c_type][i] > slack_scale:
+            return f"row {i} violated by {violations[c_type][i]!r}"
+    for j, res in enumerate(model["var_restrictions"]):
+        if res == ">=0" and x[j] < -slack_scale:
+            return f"x{j + 1} = {x[j]!r} is negative"
+    return None
+
+
+def goal_deviations(model, solution):
+    """Unwanted deviation of every goal at `solution`: shortfall for '>=', excess for '<=', both for '='."""
+    achieved = np.array(model["goals_coeffs"]) @ solution - np.array(model["goals_values"])
+    deviations = []
+    for direction, difference in zip(model["goals_directions"], achieved):
+        shortfall, excess = max(-difference, 0.0), max(difference, 0.0)
+        deviations.append((shortfall if direction != "<=" else 0.0) + (excess if direction != ">=" else 0.0))
+    return deviations
+
+
+def reference_goal(model):
+    """Optimal deviation of every priority level, from one exact LP per level over x, shortfalls and excesses."""
+    goals = model["goals_coeffs"]
+    num_goals, num_vars = len(goals), len(goals[0])
+    width = num_vars + 2 * num_goals
+    rows, rhs, types = [], [], []
+    for i, coeffs in enumerate(goals):
+        row = [0.0] * width
+        row[:num_vars] = coeffs
+        row[num_vars + i] = 1.0
+        row[num_vars + num_goals + i] = -1.0
+        rows.append(row)
+        rhs.append(model["goals_values"][i])
+        types.append("=")
+    for coeffs, value in zip(model["constraints_coeffs"], model["constraints_values"]):
+        rows.append(list(coeffs) + [0.0] * 2 * num_goals)
+        rhs.append(value)
+        types.append("<=")
+
+    deviations = []
+    for i, direction in enumerate(model["goals_directions"]):
+        penalty = [0.0] * width
+        if direction != "<=":
+            penalty[num_vars + i] = 1.0
+        if direction != ">=":
+            penalty[num_vars + num_goals + i] = 1.0
+        exact = ExactSimplex([-p for p in penalty], rows, rhs, types, [">=0"] * width).solve()
+        best = -exact["optimal_value"]
+        deviations.append(float(best))
+        # Later levels may not give up any of this level's achievement
+        rows.append(penalty)
+        rhs.append(best)
+        types.append("<=")
+    return deviations
+
+
+def check_goal(model, result, reference, tolerance=1e-7):
+    solution = np.array(result["optimal_solution"])
+    lhs = np.array(model["constraints_coeffs"]) @ solution
+    if np.any(lhs > np.array(model["constraints_values"]) + tolerance) or np.any(solution < -tolerance):
+        return "solution violates the constraints"
+    deviations = goal_deviations(model, solution)
+    if not np.allclose(deviations, reference, atol=tolerance, rtol=tolerance):
+        return f"deviations {deviations}, expected {reference}"
+    return None
+
+
+@pytest.fixture(scope="module", params=SEEDS, ids=lambda seed: f"seed{seed}")
+def models(request):
+    """The models of `python solver_harness.py --seed SEED --models MODELS`, drawn in the same order."""
+    rng = np.random.default_rng(request.param)
+    lp_models, goal_models = [], []
+    for _ in range(MODELS):
+        lp_models.append(random_lp(rng))
+        goal_models.append(random_goal_model(rng))
+    return lp_models, goal_models
+
+
+@pytest.fixture(scope="module")
+def lp_models(models):
+    return [(model, reference_lp(model)) for model in models[0]]
+
+
+@pytest.fixture(scope="module")
+def goal_models(models):
+    return [(model, reference_goal(model)) for model in models[1]]
+
+
+@pytest.mark.parametrize("name", LP_METHODS)
+def test_lp_method_matches_exact_arithmetic(name, lp_models):
+    applies, run, tolerance = LP_METHODS[name]
+    failures = []
+    for index, (model, reference) in enumerate(lp_models):
+        if not applies(model):
+            continue
+        problem = check_lp(model, run(model), reference, tolerance)
+        if problem:
+            failures.append(f"lp {index}: {problem}")
+    assert not failures, failures
+
+
+@pytest.mark.parametrize("name", GOAL_METHODS)
+def test_goal_method_matches_exact_arithmetic(name, goal_models):
+    failures = []
+    for index, (model, reference) in enumerate(goal_models):
+        result = GOAL_METHODS[name](model)
+        problem = result.get("error") or check_goal(model, result, reference)
+        if problem:
+            failures.append(f"goal {index}: {problem}")
+    assert not failures, failures
@@ -0,0 +1,80 @@
+from fractions import Fraction
+
+import pytest
+
+from exact_arithmetic import ExactSimplex, to_fraction
+from linear_programing_solver import LinearProgrammingSolver
+
+
+def test_to_fraction_uses_the_decimal_value():
+    assert to_fraction(0.1) == Fraction(1, 10)
+    assert to_fraction(3) == Fraction(3)
+    assert to_fraction(Fraction(2, 7)) == Fraction(2, 7)
+
+
+def test_optimum_is_exact():
+    # max x1 + x2  s.t.  3 x1 + x2 <= 1, x1 + 3 x2 <= 1: x1 = x2 = 1/4
+    result = ExactSimplex([1, 1], [[3, 1], [1, 3]], [1, 1], ["<=", "<="], [">=0", ">=0"]).solve()
+    assert result["status"] == "optimal"
+    assert result["solution"] == [Fraction(1, 4), Fraction(1, 4)]
+    assert result["optimal_value"] == Fraction(1, 2)
+    assert not result["verified"]
+
+
+def test_status_of_infeasible_and_unbounded_models():
+    assert ExactSimplex([1], [[1], [1]], [1, 2], ["<=", ">="], [">=0"]).solve()["status"] == "infeasible"
+    assert ExactSimplex([1, 0], [[1, -1]], [1], ["<="], [">=0", ">=0"]).solve()["status"] == "unbounded"
+
+
+def test_unrestricted_and_equality_rows():
+    # max -x1 - x2  s.t.  x1 - x2 = -3 with x1 unrestricted: x1 = -3, x2 = 0
+    result = ExactSimplex([-1, -1], [[1, -1]], [-3], ["="], ["unrestricted", ">=0"]).solve()
+    assert result["solution"] == [Fraction(-3), Fraction(0)]
+    assert result["optimal_value"] == Fraction(3)
+
+
+def test_optimal_hint_is_verified_without_pivoting():
+    model = ([1, 1], [[3, 1], [1, 3]], [1, 1], ["<=", "<="], [">=0", ">=0"])
+    result = ExactSimplex(*model).solve(solution_hint=[0.25000000001, 0.2499999999])
+    assert result["verified"]
+    assert result["solution"] == [Fraction(1, 4), Fraction(1, 4)]
+    # A wrong hint is repaired rather than trusted
+    result = ExactSimplex(*model).solve(solution_hint=[0.0, 1 / 3])
+    assert result["solution"] == [Fraction(1, 4), Fraction(1, 4)]
+
+
+def test_exact_precision_of_the_float_solver():
+    result = LinearProgrammingSolver([1, 1], [[0.1, 0.2], [0.3, 0.1]], [0.3, 0.4], ["<=", "<="], [">=0", ">=0"],
+                                     method="two-phase", type="max", precision="exact").solve()
+    assert result["exact_solution"] == ["1", "1"]
+    assert result["exact_optimal_value"] == "2"
+    assert result["verified"]
+
+
+def test_basis_hint_is_factored_and_infeasible_hints_fall_back():
+    # Columns: x1, x2, s1, s2; the optimum has x1 and x2 basic
+    model = ([1, 1], [[3, 1], [1, 3]], [1, 1], ["<=", "<="], [">=0", ">=0"])
+    result = ExactSimplex(*model).solve(basis_hint=[0, 1])
+    assert result["verified"]
+    assert result["solution"] == [Fraction(1, 4), Fraction(1, 4)]
+    # x1 with s2 puts s2 at -2, so it is not primal feasible and a cold solve answers instead
+    result = ExactSimplex(*model).solve(basis_hint=[0, 3])
+    assert not result["verified"]
+    assert result["solution"] == [Fraction(1, 4), Fraction(1, 4)]
+
+
+def test_exact_duals_and_slacks():
+    # max 3 x1 + 2 x2  s.t.  x1 + x2 <= 4, x1 + 3 x2 >= 2, x1 <= 3: x1 = 3, x2 = 1
+    result = ExactSimplex([3, 2], [[1, 1], [1, 3], [1, 0]], [4, 2, 3], ["<=", ">=", "<="], [">=0", ">=0"]).solve()
+    assert result["duals"] == [Fraction(2), Fraction(0), Fraction(1)]
+    assert result["slacks"] == [Fraction(0), Fraction(4), Fraction(0)]
+
+
+def test_exact_precision_keeps_duals_and_slacks():
+    model = ([3, 2], [[1, 1], [1, 3], [1, 0]], [4, 2, 3], ["<=", ">=", "<="], [">=0", ">=0"])
+    for type in ("max", "min"):
+        expected = LinearProgrammingSolver(*model, method="two-phase", type=type).solve()
+        result = LinearProgrammingSolver(*model, method="two-phase", type=type, precision="exact").solve()
+        assert result["verified"]
+        assert result["duals"] == pytest.approx(expected["duals"])
+        assert result["slacks"] == pytest.approx(expected["slacks"])
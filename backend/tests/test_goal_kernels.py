@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import goal_kernels
+from goal_kernels import goal_kernel, optimize_goal_loops, optimize_goal_numpy
+from goal_programing import PreemptiveGoalProgramming
+from solver_harness import random_goal_model
+
+
+def goal_solver(model, dtype=np.float64):
+    num_vars = len(model["goals_coeffs"][0])
+    return PreemptiveGoalProgramming(model["goals_coeffs"], model["goals_values"], model["constraints_coeffs"],
+                                     model["constraints_values"], [0] * num_vars, model["goals_directions"],
+                                     dtype=dtype, kernel="numpy")
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_loop_kernel_matches_the_numpy_kernel(dtype):
+    # The scalar loops are what Numba compiles; run uncompiled they must give the same steps and solution
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        model = random_goal_model(rng)
+        expected = goal_solver(model, dtype).solve()
+        solver = goal_solver(model, dtype)
+        solver.goal_kernel = optimize_goal_loops
+        assert solver.solve() == expected
+
+
+def test_kernel_selection(monkeypatch):
+    assert goal_kernel("numpy") is optimize_goal_numpy
+    with pytest.raises(ValueError, match="Unknown goal kernel"):
+        goal_kernel("cuda")
+    monkeypatch.setattr(goal_kernels, "optimize_goal_numba", None)
+    assert goal_kernel("auto") is optimize_goal_numpy
+    with pytest.raises(ValueError, match="needs Numba"):
+        goal_kernel("numba")
+
+
+def test_numba_kernel_matches_the_numpy_kernel():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        model = random_goal_model(rng)
+        expected = goal_solver(model).solve()
+        solver = goal_solver(model)
+        solver.goal_kernel = goal_kernel("numba")
+        assert solver.solve() == expected
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = os.environ.get("LP_IMPORT_BUDGET_MS", "400")
+
+
+def run_budget_check(*args):
+    return subprocess.run([sys.executable, "import_budget.py", *args], cwd=BACKEND_DIR, capture_output=True,
+                          text=True)
+
+
+def test_app_import_is_within_budget():
+    # Also fails when a module in LAZY_MODULES is imported at startup
+    check = run_budget_check("--budget-ms", BUDGET_MS, "--runs", "3")
+    assert check.returncode == 0, check.stdout + check.stderr
+
+
+def test_budget_check_fails_over_budget():
+    check = run_budget_check("--budget-ms", "0", "--runs", "1")
+    assert check.returncode == 1
+    assert "over the 0 ms budget" in check.stdout
@@ -0,0 +1,44 @@
+import numpy as np
+
+from exact_arithmetic import ExactSimplex
+from infeasibility import find_iis
+
+
+def is_infeasible(constraints, rhs, constraint_types, var_restrictions, rows):
+    exact = ExactSimplex([0] * len(constraints[0]), [constraints[i] for i in rows], [rhs[i] for i in rows],
+                         [constraint_types[i] for i in rows], var_restrictions).solve()
+    return exact["status"] == "infeasible"
+
+
+def test_iis_of_a_small_model():
+    # x1 + x2 <= 2 and x1 >= 3 conflict (x2 >= 0); the x2 rows do not take part
+    constraints = [[1.0, 1.0], [0.0, 1.0], [1.0, 0.0], [0.0, 1.0]]
+    result = find_iis(constraints, [2.0, 5.0, 3.0, 1.0], ["<=", "<=", ">=", ">="], [">=0", ">=0"])
+    assert result["rows"] == [0, 2]
+    assert result["solves"] == 5
+
+
+def test_feasible_model_has_no_iis():
+    result = find_iis([[1.0, 1.0]], [2.0], ["<="], [">=0", ">=0"])
+    assert result["rows"] is None
+
+
+def test_random_iis_is_irreducible():
+    rng = np.random.default_rng(0)
+    found = 0
+    while found < 10:
+        num_rows, num_vars = rng.integers(3, 8), rng.integers(2, 5)
+        constraints = rng.integers(-5, 6, (num_rows, num_vars)).astype(float).tolist()
+        rhs = rng.integers(-10, 10, num_rows).astype(float).tolist()
+        constraint_types = [str(t) for t in rng.choice(["<=", ">=", "="], num_rows)]
+        var_restrictions = [str(r) for r in rng.choice([">=0", "unrestricted"], num_vars, p=[0.8, 0.2])]
+        result = find_iis(constraints, rhs, constraint_types, var_restrictions)
+        if result["rows"] is None:
+            assert not is_infeasible(constraints, rhs, constraint_types, var_restrictions, range(num_rows))
+            continue
+        found += 1
+        rows = result["rows"]
+        assert is_infeasible(constraints, rhs, constraint_types, var_restrictions, rows)
+        for row in rows:
+            rest = [other for other in rows if other != row]
+            assert not is_infeasible(constraints, rhs, constraint_types, var_restrictions, rest)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from linear_programing_solver import LinearProgrammingSolver
+from lp_model import LinearProgrammingModel
+
+
+def cold_solve(model):
+    return LinearProgrammingModel(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                  model.var_restrictions, type=model.type).solve()
+
+
+def assert_same_optimum(model, result, expected):
+    # Degenerate optima can have several optimal bases, so only the value and feasibility are compared
+    assert result["optimal_value"] == pytest.approx(expected["optimal_value"])
+    lhs = model.constraints @ np.array(result["solution"])
+    for value, c_type, rhs in zip(lhs, model.constraint_types, model.rhs):
+        assert {"<=": value <= rhs + 1e-9, ">=": value >= rhs - 1e-9, "=": abs(value - rhs) <= 1e-9}[c_type]
+
+
+def production_model(type="max"):
+    # max 3 x1 + 5 x2  s.t.  x1 <= 4, 2 x2 <= 12, 3 x1 + 2 x2 <= 18, x1 + x2 >= 1
+    return LinearProgrammingModel([3, 5], [[1, 0], [0, 2], [3, 2], [1, 1]], [4, 12, 18, 1],
+                                  ["<=", "<=", "<=", ">="], [">=0", ">=0"], type=type)
+
+
+@pytest.mark.parametrize("type", ["max", "min"])
+def test_first_solve_matches_the_solver(type):
+    model = production_model(type)
+    result = model.solve()
+    expected = LinearProgrammingSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                       model.var_restrictions, method="two-phase", type=type).solve()
+    assert result["solution"] == pytest.approx(expected["solution"])
+    assert result["optimal_value"] == pytest.approx(expected["optimal_value"])
+    assert result["duals"] == pytest.approx(expected["duals"])
+    assert result["slacks"] == pytest.approx(expected["slacks"])
+
+
+def test_edits_match_a_cold_solve():
+    model = production_model()
+    model.solve()
+    edits = [
+        lambda: model.set_objective([5, 3]),
+        lambda: model.set_rhs(2, 14),
+        lambda: model.update_rhs([3, 10, 16, 2]),
+        lambda: model.add_constraint([1, 2], "<=", 9),
+        lambda: model.add_constraint([1, -1], "=", 0),
+        lambda: model.add_variable(4, [1, 0, 1, 1, 1, 0], restriction="unrestricted"),
+        lambda: model.remove_constraint(4),
+        lambda: model.add_constraint([2, 1, 1], ">=", 3),
+    ]
+    for edit in edits:
+        edit()
+        assert_same_optimum(model, model.solve(), cold_solve(model))
+
+
+def test_tightened_rhs_reoptimizes_with_fewer_pivots():
+    rng = np.random.default_rng(0)
+    model = LinearProgrammingModel(rng.uniform(1, 2, 12), rng.uniform(0, 1, (10, 12)), rng.uniform(5, 10, 10),
+                                   ["<="] * 10, [">=0"] * 12)
+    cold_iterations = model.solve()["iterations"]
+    model.set_rhs(0, model.rhs[0] * 0.9)
+    warm_iterations = model.solve()["iterations"] - cold_iterations
+    assert warm_iterations < cold_iterations
+    assert_same_optimum(model, model.solve(), cold_solve(model))
+
+
+def test_infeasible_edit_keeps_the_model_usable():
+    model = LinearProgrammingModel([1, 1], [[1, 1]], [4], ["<="], [">=0", ">=0"])
+    model.solve()
+    model.add_constraint([1, 1], ">=", 6)
+    assert model.solve()["error"] == "Infeasible solution"
+    model.set_rhs(1, 3)
+    assert model.solve()["optimal_value"] == pytest.approx(4)
+
+
+def test_warm_start_from_basis_indices():
+    model = production_model()
+    expected = model.solve()
+    basis = model.basis_indices()
+    assert len(basis) == 4
+    # A fresh model with the same rows plus one more starts from the saved basis
+    child = production_model()
+    child.add_constraint([1, 0], "<=", 1)
+    assert child.warm_start(basis)
+    result = child.solve()
+    assert_same_optimum(child, result, cold_solve(child))
+    assert result["iterations"] < expected["iterations"]
+
+
+def test_basis_indices_before_solve_and_singular_warm_start():
+    model = production_model()
+    assert model.basis_indices() is None
+    # x1 twice is not a basis of four rows
+    assert not model.warm_start([0, 0, 2, 3])
+    assert model.solve()["optimal_value"] == pytest.approx(36)
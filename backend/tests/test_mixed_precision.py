@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from goal_programing import PreemptiveGoalProgramming
+from linear_programing_solver import LinearProgrammingSolver
+from mixed_precision import iterative_refinement, pivot_tolerance
+
+
+def test_pivot_tolerance():
+    assert pivot_tolerance(np.float64) == 1e-9
+    assert pivot_tolerance(np.float32) == pytest.approx(100 * np.finfo(np.float32).eps)
+
+
+def test_iterative_refinement_recovers_float64_accuracy():
+    rng = np.random.default_rng(0)
+    basis = rng.random((20, 20)) + 20 * np.eye(20)
+    rhs = rng.random(20) * 100
+    exact = np.linalg.solve(basis, rhs)
+    rough = np.linalg.solve(basis.astype(np.float32), rhs.astype(np.float32)).astype(np.float64)
+    assert np.max(np.abs(rough - exact)) > 1e-9
+    refined = iterative_refinement(basis, rhs, rough, np.float32)
+    assert refined == pytest.approx(exact, rel=1e-12, abs=1e-12)
+
+
+def test_singular_basis_is_left_alone():
+    values = iterative_refinement(np.zeros((2, 2)), [1.0, 1.0], [0.5, 0.5], np.float32)
+    assert values.tolist() == [0.5, 0.5]
+
+
+@pytest.mark.parametrize("method", ["simplex", "two-phase"])
+def test_float32_solves_match_float64(method):
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        constraints = rng.integers(1, 10, (8, 6)).astype(float)
+        rhs = rng.integers(20, 60, 8).astype(float)
+        objective = rng.integers(1, 10, 6).astype(float)
+        results = [LinearProgrammingSolver(objective, constraints, rhs, ["<="] * 8, [">=0"] * 6, method=method,
+                                           dtype=dtype).solve() for dtype in (np.float64, np.float32)]
+        # The float32 basis is refined in float64, so the answer is as accurate as the float64 solve
+        assert results[1]["optimal_value"] == pytest.approx(results[0]["optimal_value"], rel=1e-9)
+        assert results[1]["solution"] == pytest.approx(results[0]["solution"], rel=1e-9, abs=1e-9)
+
+
+def test_float32_goal_programming_matches_float64():
+    rng = np.random.default_rng(2)
+    for _ in range(10):
+        goals = rng.integers(0, 10, (3, 4)).astype(float)
+        values = rng.integers(1, 40, 3).astype(float)
+        constraints = rng.integers(0, 10, (2, 4)).astype(float)
+        limits = rng.integers(5, 50, 2).astype(float)
+        results = [PreemptiveGoalProgramming(goals, values, constraints, limits, [0] * 4, [">=", "<=", "="],
+                                             dtype=dtype).solve() for dtype in (np.float64, np.float32)]
+        assert results[1]["optimal_solution"] == pytest.approx(results[0]["optimal_solution"], rel=1e-6, abs=1e-6)
@@ -0,0 +1,59 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+from linear_programing_solver import IN_MEMORY_BLOCK_ROWS, LinearProgrammingSolver
+
+
+def random_model(seed, rows=12, cols=8):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 1, cols), rng.uniform(0, 1, (rows, cols)), rng.uniform(1, 10, rows)
+
+
+@pytest.mark.parametrize("method", ["simplex", "big-m", "two-phase"])
+def test_out_of_core_matches_in_memory(method, tmp_path):
+    objective, constraints, rhs = random_model(0)
+    types, restrictions = ["<="] * len(rhs), ["non-negative"] * len(objective)
+    expected = LinearProgrammingSolver(objective, constraints, rhs, types, restrictions, method=method).solve()
+    result = LinearProgrammingSolver(objective, constraints, rhs, types, restrictions, method=method,
+                                     out_of_core=True, scratch_dir=str(tmp_path), block_rows=3).solve()
+    assert result["optimal_value"] == pytest.approx(expected["optimal_value"])
+    assert np.allclose(result["solution"], expected["solution"])
+    # Steps are not kept in memory and the memmapped tableaus are removed after the solve
+    assert result["steps"] == []
+    assert "steps_file" not in result
+    assert os.listdir(tmp_path) == []
+
+
+def test_out_of_core_streams_steps_to_file(tmp_path):
+    objective, constraints, rhs = random_model(1)
+    types, restrictions = [">="] + ["<="] * (len(rhs) - 1), ["non-negative"] * len(objective)
+    rhs[0] = 0.5
+    expected = LinearProgrammingSolver(objective, constraints, rhs, types, restrictions, method="two-phase").solve()
+    steps_file = str(tmp_path / "steps.txt")
+    result = LinearProgrammingSolver(objective, constraints, rhs, types, restrictions, method="two-phase",
+                                     out_of_core=True, block_rows=5, steps_file=steps_file).solve()
+    assert result["steps_file"] == steps_file
+    with open(steps_file) as f:
+        assert f.read() == "".join(step + "\n" for step in expected["steps"])
+
+
+def test_in_memory_pivot_scratch_is_bounded():
+    objective, constraints, rhs = random_model(2, rows=3 * IN_MEMORY_BLOCK_ROWS, cols=5)
+    solver = LinearProgrammingSolver(objective, constraints, rhs, ["<="] * len(rhs), ["non-negative"] * 5)
+    assert solver.row_block(len(rhs) + 1) == IN_MEMORY_BLOCK_ROWS
+    assert solver.solve()["optimal_value"] > 0
+
+
+@pytest.mark.parametrize("restriction", ["non-negative", "unrestricted"])
+@pytest.mark.parametrize("out_of_core", [False, True])
+def test_ratio_test_skips_zero_entries_without_warnings(restriction, out_of_core):
+    # Rows with a zero entry in the entering column must not be divided
+    constraints = [[1, 0], [0, 1], [1, 1]]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = LinearProgrammingSolver([3, 2], constraints, [4, 3, 5], ["<="] * 3, [restriction] * 2,
+                                         out_of_core=out_of_core).solve()
+    assert result["optimal_value"] == pytest.approx(14)
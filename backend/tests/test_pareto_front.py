@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from linear_programing_solver import LinearProgrammingSolver
+from pareto_front import ParetoFront, non_dominated, serpentine_grid, weight_lattice
+
+OBJECTIVES = [[3.0, 1.0], [-1.0, 2.0]]
+CONSTRAINTS = [[1.0, 1.0], [1.0, 0.0], [0.0, 1.0]]
+RHS = [4.0, 3.0, 3.0]
+
+
+def front(method, **options):
+    return ParetoFront(OBJECTIVES, CONSTRAINTS, RHS, ["<="] * 3, [">=0"] * 2, method=method, **options).solve()
+
+
+def front_error(constraints, rhs):
+    result = ParetoFront(OBJECTIVES, constraints, rhs, ["<="], [">=0"] * 2).solve()
+    assert result["points"] == []
+    return result["error"]
+
+
+def test_serpentine_grid_steps_one_axis_at_a_time():
+    grid = serpentine_grid([[0, 1, 2], [0, 1], [0, 1]])
+    assert len(grid) == len(set(grid)) == 12
+    for a, b in zip(grid, grid[1:]):
+        assert sum(x != y for x, y in zip(a, b)) == 1
+
+
+def test_weight_lattice_sums_to_one():
+    weights = weight_lattice(3, 5)
+    assert len(weights) == 15
+    assert np.allclose([sum(w) for w in weights], 1.0)
+
+
+def test_non_dominated_drops_dominated_and_duplicate_points():
+    points = [{"objectives": [1, 1]}, {"objectives": [2, 2]}, {"objectives": [3, 0]}, {"objectives": [2, 2]}]
+    assert non_dominated(points, "max", 1e-9) == [points[1], points[2]]
+    assert non_dominated(points, "min", 1e-9) == [points[0], points[2]]
+
+
+@pytest.mark.parametrize("method", ["epsilon-constraint", "weighted-sum"])
+def test_front_of_a_small_model(method):
+    result = front(method, points=5)
+    # The efficient vertices are (3, 1), (1, 3) and (0, 3), with objectives (10, -1), (6, 5) and (3, 6)
+    assert result["ideal"] == pytest.approx([10.0, 6.0])
+    assert result["nadir"] == pytest.approx([3.0, -1.0])
+    values = [point["objectives"] for point in result["points"]]
+    assert values[0] == pytest.approx([10.0, -1.0])
+    assert values[-1] == pytest.approx([3.0, 6.0])
+    assert len(non_dominated(result["points"], "max", 1e-9)) == len(result["points"])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_epsilon_points_match_independent_solves(workers):
+    rng = np.random.default_rng(0)
+    objectives = rng.integers(-3, 10, (3, 8)).astype(float)
+    constraints = rng.integers(1, 10, (6, 8)).astype(float)
+    rhs = rng.integers(50, 100, 6).astype(float)
+    result = ParetoFront(objectives, constraints, rhs, ["<="] * 6, [">=0"] * 8, points=4, workers=workers).solve()
+    assert result["points"]
+    for point in result["points"]:
+        bounded = LinearProgrammingSolver(objectives[0], np.vstack((constraints, objectives[1:])),
+                                          list(rhs) + point["epsilon"], ["<="] * 6 + [">="] * 2, [">=0"] * 8,
+                                          method="two-phase").solve()
+        assert point["objectives"][0] == pytest.approx(bounded["optimal_value"], rel=1e-7)
+
+
+def test_errors_of_the_payoff_table():
+    assert front_error([[1.0, 1.0]], [-1.0]) == "Infeasible solution"
+    assert front_error([[1.0, -1.0]], [1.0]) == "Unbounded solution"
+
+
+def test_sweep_limit():
+    with pytest.raises(ValueError):
+        ParetoFront([[1.0], [1.0], [1.0]], [[1.0]], [1.0], ["<="], [">=0"], points=20, max_points=100).solve()
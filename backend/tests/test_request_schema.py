@@ -0,0 +1,142 @@
+import base64
+
+import numpy as np
+import pytest
+
+import request_schema
+from request_schema import (GoalRequest, LPRequest, SchemaError, decode_array, parse_pareto_request, parse_request,
+                            parse_stochastic_request)
+
+
+def packed(array, shape=None):
+    array = np.asarray(array, dtype="<f8")
+    return {"dtype": "float64", "shape": list(array.shape if shape is None else shape),
+            "data": base64.b64encode(array.tobytes()).decode()}
+
+
+def lp_request(**fields):
+    data = {"method": "two-phase", "optimization": "max", "objective": [3, 2],
+            "constraints": [[1, 1], [1, 0]], "rhs": [4, 3], "constraint_types": ["<=", ">="],
+            "var_restrictions": [">=0", "integer"]}
+    data.update(fields)
+    return data
+
+
+def test_lp_request():
+    model = parse_request(lp_request())
+    assert isinstance(model, LPRequest)
+    assert model.constraints.shape == (2, 2)
+    assert model.node_selection == "best-bound"
+    assert model.workers == 1
+
+
+def test_goal_request():
+    model = parse_request({"method": "goal", "goals_coeffs": [[1, 2]], "goals_values": [4],
+                           "constraints_coeffs": [[1, 1]], "constraints_values": [3], "goals_directions": [">="]})
+    assert isinstance(model, GoalRequest)
+    assert model.unrestricted_vars.tolist() == [0, 0]
+
+
+def test_packed_arrays_decode_like_lists():
+    array = np.arange(6, dtype=float).reshape(2, 3) / 7
+    assert np.array_equal(decode_array(packed(array), "constraints", 2), array)
+    model = parse_request(lp_request(constraints=packed([[1, 1], [1, 0]]), rhs=packed([4, 3])))
+    assert model.rhs.tolist() == [4.0, 3.0]
+
+
+@pytest.mark.parametrize("value", [
+    packed(np.arange(6.0), shape=[4, 2]),
+    packed(np.arange(6.0), shape=[-2, -3]),
+    packed(np.arange(6.0), shape=["a", 3]),
+    {"dtype": "float32", "shape": [1], "data": ""},
+    {"dtype": "float64", "shape": [1], "data": "not base64!"},
+    {"dtype": "float64", "data": ""},
+])
+def test_bad_packed_arrays(value):
+    with pytest.raises(SchemaError, match="constraints"):
+        decode_array(value, "constraints", 2)
+
+
+@pytest.mark.parametrize("fields, field", [
+    ({"method": "interior-point"}, "method"),
+    ({"optimization": "best"}, "optimization"),
+    ({"objective": [1, 2, 3]}, "constraints"),
+    ({"rhs": [1]}, "rhs"),
+    ({"rhs": [1, float("nan")]}, "rhs"),
+    ({"objective": [[1, 2]]}, "objective"),
+    ({"constraint_types": ["<=", "<"]}, "constraint_types"),
+    ({"var_restrictions": [">=0"]}, "var_restrictions"),
+    ({"node_selection": "breadth-first"}, "node_selection"),
+    ({"node_limit": 0}, "node_limit"),
+    ({"node_limit": "many"}, "node_limit"),
+    ({"workers": 0}, "workers"),
+    ({"precision": "double"}, "precision"),
+    ({"dtype": "float16"}, "dtype"),
+    ({"out_of_core": "false"}, "out_of_core"),
+    ({"out_of_core": 1}, "out_of_core"),
+    ({"iis": "true"}, "iis"),
+    ({"iis": None}, "iis"),
+])
+def test_invalid_lp_fields(fields, field):
+    with pytest.raises(SchemaError, match=f"^{field}:"):
+        parse_request(lp_request(**fields))
+
+
+def test_boolean_fields():
+    model = parse_request(lp_request(out_of_core=True, iis=False))
+    assert model.out_of_core is True and model.iis is False
+    model = parse_request(lp_request())
+    assert model.out_of_core is False and model.iis is False
+
+
+def test_missing_field():
+    data = lp_request()
+    del data["rhs"]
+    with pytest.raises(SchemaError, match="rhs: field is required"):
+        parse_request(data)
+    with pytest.raises(SchemaError):
+        parse_request([1, 2])
+
+
+def test_server_caps(monkeypatch):
+    monkeypatch.setattr(request_schema, "MAX_REQUEST_WORKERS", 2)
+    monkeypatch.setattr(request_schema, "MAX_NODE_LIMIT", 50)
+    assert parse_request(lp_request(workers=2, node_limit=50)).workers == 2
+    assert parse_request(lp_request()).node_limit == 50
+    with pytest.raises(SchemaError, match="workers: expected at most 2"):
+        parse_request(lp_request(workers=3))
+    with pytest.raises(SchemaError, match="node_limit: expected at most 50"):
+        parse_request(lp_request(node_limit=51))
+
+
+def test_pareto_request():
+    data = {"optimization": "max", "objectives": [[3, 1], [-1, 2]], "constraints": [[1, 1]], "rhs": [4],
+            "constraint_types": ["<="], "var_restrictions": [">=0", ">=0"]}
+    assert parse_pareto_request(data).points == 11
+    with pytest.raises(SchemaError, match="^points:"):
+        parse_pareto_request(dict(data, points=1))
+    with pytest.raises(SchemaError, match="^points:"):
+        parse_pareto_request(dict(data, objectives=[[1, 1]] * 4, points=100))
+    with pytest.raises(SchemaError, match="^var_restrictions:"):
+        parse_pareto_request(dict(data, var_restrictions=[">=0", "integer"]))
+
+
+def test_stochastic_request():
+    data = {"optimization": "max", "objective": [-1, 3], "constraints": [[-1, 1], [0, 1]], "rhs": [0, 4],
+            "constraint_types": ["<=", "<="], "var_restrictions": [">=0", ">=0"], "first_stage": [0],
+            "rhs_deltas": [[0, -2], [0, 2]]}
+    model = parse_stochastic_request(data)
+    assert model.rhs_deltas.shape == (2, 2)
+    assert model.probabilities is None
+    model = parse_stochastic_request({name: value for name, value in data.items() if name != "rhs_deltas"}
+                                     | {"cost_deltas": [[0, 1]]})
+    assert model.cost_deltas.tolist() == [[0, 1]]
+    assert model.rhs_deltas.tolist() == [[0, 0]]
+    for fields, field in [({"first_stage": [0, 0]}, "first_stage"), ({"first_stage": [2]}, "first_stage"),
+                          ({"rhs_deltas": [[0, 1, 2]]}, "rhs_deltas"), ({"probabilities": [0.5, 0.6]}, "probabilities"),
+                          ({"cost_deltas": [[0, 1]]}, "cost_deltas"), ({"method": "sampling"}, "method")]:
+        with pytest.raises(SchemaError, match=f"^{field}:"):
+            parse_stochastic_request(dict(data, **fields))
+    del data["rhs_deltas"]
+    with pytest.raises(SchemaError, match="^rhs_deltas:"):
+        parse_stochastic_request(data)
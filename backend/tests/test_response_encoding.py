@@ -0,0 +1,68 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+from flask import Flask, request
+
+import response_encoding
+from response_encoding import choose_encoding, dumps, encode_response
+
+app = Flask(__name__)
+
+
+def decode(response):
+    body = response.get_data()
+    if response.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def test_dumps_numpy_values():
+    payload = {"solution": np.array([1.5, 2.0]), "optimal_value": np.float64(3.5), "count": np.int64(2)}
+    assert json.loads(dumps(payload)) == {"solution": [1.5, 2.0], "optimal_value": 3.5, "count": 2}
+
+
+def test_dumps_rejects_unknown_objects():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("*", "gzip"),
+    ("gzip;q=bad", None),
+])
+def test_choose_encoding(header, expected, monkeypatch):
+    monkeypatch.setattr(response_encoding, "brotli", None)
+    assert choose_encoding(header) == expected
+
+
+def test_steps_are_paginated():
+    payload = {"solution": [1.0], "steps": [{"step": index} for index in range(120)]}
+    with app.test_request_context("/solve"):
+        body = decode(encode_response(payload, request))
+    assert [step["step"] for step in body["steps"]] == list(range(response_encoding.DEFAULT_STEPS_LIMIT))
+    assert body["steps_total"] == 120
+    with app.test_request_context("/solve?steps_offset=100&steps_limit=50"):
+        body = decode(encode_response(payload, request))
+    assert [step["step"] for step in body["steps"]] == list(range(100, 120))
+    with app.test_request_context("/solve?steps=all"):
+        body = decode(encode_response(payload, request))
+    assert len(body["steps"]) == 120
+
+
+def test_large_responses_are_compressed(monkeypatch):
+    monkeypatch.setattr(response_encoding, "brotli", None)
+    payload = {"solution": list(range(1000)), "steps": []}
+    with app.test_request_context("/solve", headers={"Accept-Encoding": "gzip"}):
+        response = encode_response(payload, request)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert decode(response)["solution"] == payload["solution"]
+    with app.test_request_context("/solve", headers={"Accept-Encoding": "gzip"}):
+        response = encode_response({"solution": [1.0]}, request)
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,40 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from shared_model import SharedModel, attach_model
+
+
+def column_sums(handle):
+    return attach_model(handle)["constraints"].sum(axis=0).tolist()
+
+
+def test_handle_is_small_and_views_share_the_buffers():
+    constraints = np.arange(20000, dtype=float).reshape(100, 200)
+    with SharedModel(constraints=constraints, rhs=np.ones(100), empty=np.zeros(0)) as shared:
+        handle = shared.handle()
+        assert len(pickle.dumps(handle)) < 1000
+        arrays = attach_model(handle)
+        assert np.array_equal(arrays["constraints"], constraints)
+        assert arrays["empty"].shape == (0,)
+        # A write through the owner's view is seen through the attached one
+        shared.arrays["rhs"][0] = 5.0
+        assert arrays["rhs"][0] == 5.0
+
+
+def test_workers_read_the_shared_arrays():
+    constraints = np.random.default_rng(0).random((30, 4))
+    with SharedModel(constraints=constraints) as shared, ProcessPoolExecutor(max_workers=2) as executor:
+        sums = list(executor.map(column_sums, [shared.handle()] * 3))
+    assert all(np.allclose(result, constraints.sum(axis=0)) for result in sums)
+
+
+def test_close_unlinks_the_blocks():
+    shared = SharedModel(rhs=np.ones(3))
+    name = shared.handle()["rhs"][0]
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from linear_programing_solver import LinearProgrammingSolver
+from stochastic import StochasticSolver
+
+
+def random_instance(rng, type):
+    """Random two-stage model: first-stage rows on the first-stage variables, scenario rows on all variables."""
+    num_first, num_second = rng.integers(1, 4), rng.integers(1, 5)
+    first_rows, second_rows = rng.integers(0, 3), rng.integers(1, 4)
+    num_scenarios = rng.integers(1, 6)
+    num_vars, num_rows = num_first + num_second, first_rows + second_rows
+    constraints = np.zeros((num_rows, num_vars))
+    constraints[:first_rows, :num_first] = rng.integers(1, 5, (first_rows, num_first))
+    constraints[first_rows:] = rng.integers(0, 5, (second_rows, num_vars))
+    rhs_deltas = np.zeros((num_scenarios, num_rows))
+    rhs_deltas[:, first_rows:] = rng.integers(-5, 6, (num_scenarios, second_rows))
+    cost_deltas = np.zeros((num_scenarios, num_vars))
+    cost_deltas[:, num_first:] = rng.integers(-2, 3, (num_scenarios, num_second))
+    probabilities = rng.random(num_scenarios)
+    return {
+        "objective": rng.integers(-3, 8, num_vars).astype(float),
+        "constraints": constraints,
+        "rhs": np.concatenate((rng.integers(20, 40, first_rows), rng.integers(10, 30, second_rows))).astype(float),
+        "constraint_types": ["<="] * first_rows + [str(t) for t in rng.choice(["<=", ">="], second_rows)],
+        "var_restrictions": [">=0"] * num_vars,
+        "first_stage": list(range(num_first)),
+        "rhs_deltas": rhs_deltas,
+        "cost_deltas": cost_deltas,
+        "probabilities": probabilities / probabilities.sum(),
+        "type": type,
+    }
+
+
+def solve(instance, **options):
+    return StochasticSolver(**instance, **options).solve()
+
+
+@pytest.mark.parametrize("type", ["max", "min"])
+def test_l_shaped_matches_the_extensive_form(type):
+    rng = np.random.default_rng(0 if type == "max" else 1)
+    for _ in range(30):
+        instance = random_instance(rng, type)
+        l_shaped = solve(instance)
+        extensive = solve(instance, method="extensive")
+        assert l_shaped.get("error") == extensive.get("error")
+        if extensive.get("error"):
+            continue
+        assert l_shaped["optimal_value"] == pytest.approx(extensive["optimal_value"], rel=1e-6, abs=1e-6)
+        # The first-stage decision is shared by every scenario
+        first = instance["first_stage"]
+        for scenario in l_shaped["scenarios"]:
+            assert scenario["solution"][:len(first)] == pytest.approx(l_shaped["solution"][:len(first)])
+
+
+def test_newsvendor():
+    # Buy x <= 10 at 1, sell y <= min(x, demand) at 3; demand is 2 or 6 with equal probability, so x = 6
+    result = StochasticSolver([-1.0, 3.0], [[1.0, 0.0], [-1.0, 1.0], [0.0, 1.0]], [10.0, 0.0, 4.0],
+                              ["<=", "<=", "<="], [">=0", ">=0"], first_stage=[0],
+                              rhs_deltas=[[0.0, 0.0, -2.0], [0.0, 0.0, 2.0]]).solve()
+    assert result["method"] == "l-shaped"
+    assert result["optimal_value"] == pytest.approx(6.0)
+    assert result["solution"] == pytest.approx([6.0, 4.0])
+    assert [scenario["optimal_value"] for scenario in result["scenarios"]] == pytest.approx([0.0, 12.0])
+
+
+def test_independent_scenarios_match_separate_solves():
+    rng = np.random.default_rng(2)
+    constraints = rng.integers(1, 10, (6, 5)).astype(float)
+    rhs = rng.integers(50, 100, 6).astype(float)
+    objective = rng.integers(1, 10, 5).astype(float)
+    rhs_deltas = rng.integers(-20, 20, (8, 6)).astype(float)
+    result = StochasticSolver(objective, constraints, rhs, ["<="] * 6, [">=0"] * 5, [], rhs_deltas).solve()
+    values = [LinearProgrammingSolver(objective, constraints, rhs + delta, ["<="] * 6, [">=0"] * 5).solve()
+              ["optimal_value"] for delta in rhs_deltas]
+    assert result["method"] == "independent"
+    assert result["optimal_value"] == pytest.approx(np.mean(values))
+
+
+def test_workers_give_the_same_optimum():
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        instance = random_instance(rng, "max")
+        one, two = solve(instance), solve(instance, workers=2)
+        assert one.get("error") == two.get("error")
+        assert one["optimal_value"] == pytest.approx(two["optimal_value"])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        StochasticSolver([1.0], [[1.0]], [1.0], ["<="], [">=0"], [0], [[0.0]], method="progressive-hedging")
@@ -0,0 +1,81 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+import trace_replay
+from linear_programing_solver import LinearProgrammingSolver
+from solve_trace import read_trace, write_trace
+
+REQUEST = {"method": "two-phase", "optimization": "max", "objective": [3.0, 2.0, 4.0],
+           "constraints": [[1.0, 1.0, 2.0], [2.0, 0.0, 3.0], [2.0, 1.0, 3.0]], "rhs": [4.0, 5.0, 6.0],
+           "constraint_types": ["<=", "<=", ">="], "var_restrictions": [">=0", ">=0", ">=0"]}
+
+
+def record(path, request=REQUEST):
+    trace = LinearProgrammingSolver(request["objective"], request["constraints"], request["rhs"],
+                                    request["constraint_types"], request["var_restrictions"],
+                                    method=request["method"], type=request["optimization"], trace=True).solve()["trace"]
+    write_trace(path, json.dumps(request).encode(), trace)
+    return trace
+
+
+def replay(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["trace_replay.py", *map(str, args)])
+    with pytest.raises(SystemExit) as exit_info:
+        trace_replay.main()
+    return exit_info.value.code
+
+
+def test_trace_round_trip(tmp_path):
+    path = tmp_path / "model.lptrace.npz"
+    trace = record(path)
+    request, recorded = read_trace(path)
+    assert request == REQUEST
+    assert recorded == trace
+    assert recorded["pivots"]
+    assert recorded["method"] == "two-phase"
+    assert recorded["dtype"] == "float64"
+
+
+def test_first_divergence():
+    assert trace_replay.first_divergence([[1, 2, 3], [2, 3, 4]], [[1, 2, 3], [2, 3, 4]]) is None
+    assert trace_replay.first_divergence([[1, 2, 3], [2, 3, 4]], [[1, 2, 3], [2, 4, 3]]) == 1
+    assert trace_replay.first_divergence([[1, 2, 3]], [[1, 2, 3], [2, 3, 4]]) == 1
+
+
+def test_replay_of_the_recorded_engine_passes(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "model.lptrace.npz"
+    record(path)
+    assert replay(monkeypatch, path, "--repeat", 1) == 0
+    assert "pivot path: identical" in capsys.readouterr().out
+
+
+def test_replay_with_another_engine_keeps_the_outcome(tmp_path, monkeypatch):
+    path = tmp_path / "model.lptrace.npz"
+    record(path)
+    assert replay(monkeypatch, path, "--method", "big-m", "--repeat", 1) == 0
+    assert replay(monkeypatch, path, "--dtype", "float32", "--repeat", 1) == 0
+
+
+def test_replay_fails_on_a_different_outcome(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "model.lptrace.npz"
+    trace = record(path)
+    trace["optimal_value"] += 1.0
+    trace["pivots"] = trace["pivots"][:-1]
+    trace["seconds"] = trace["seconds"][:-1]
+    write_trace(path, json.dumps(REQUEST).encode(), trace)
+    assert replay(monkeypatch, path, "--repeat", 1) == 1
+    output = capsys.readouterr().out
+    assert "FAIL: pivot path diverges" in output
+    assert "FAIL: the replayed outcome differs" in output
+
+
+def test_slowdown_limit(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "model.lptrace.npz"
+    trace = record(path)
+    trace["seconds"] = (np.array(trace["seconds"]) * 1e-6).tolist()
+    write_trace(path, json.dumps(REQUEST).encode(), trace)
+    assert replay(monkeypatch, path, "--repeat", 1, "--max-slowdown", 2) == 1
+    assert "slower than the recording" in capsys.readouterr().out
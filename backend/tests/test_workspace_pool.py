@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+
+from workspace_pool import WorkspacePool
+
+
+def test_released_buffers_are_reused_zero_filled():
+    pool = WorkspacePool()
+    array = pool.acquire((3, 4))
+    array[:] = 7
+    pool.release(array)
+    again = pool.acquire((3, 4))
+    assert again is array
+    assert not again.any()
+    assert pool.free_bytes == 0
+    # Another dtype or shape is a different key
+    assert pool.acquire((3, 4), np.float32) is not array
+    assert pool.acquire(12) is not array
+
+
+def test_free_buffers_per_key_are_capped():
+    pool = WorkspacePool(max_buffers=2)
+    arrays = [pool.acquire(10) for _ in range(3)]
+    for array in arrays:
+        pool.release(array)
+    assert len(pool.free[((10,), np.dtype(np.float64).str)]) == 2
+    assert pool.free_bytes == 2 * arrays[0].nbytes
+
+
+def test_least_recently_used_shapes_are_evicted():
+    pool = WorkspacePool(max_shapes=2)
+    first, second, third = pool.acquire(1), pool.acquire(2), pool.acquire(3)
+    pool.release(first)
+    pool.release(second)
+    # Reusing a shape refreshes it, so the next release evicts `second` instead of it
+    pool.release(pool.acquire(1))
+    pool.release(third)
+    assert pool.acquire(1) is first
+    assert pool.acquire(2) is not second
+    assert pool.acquire(3) is third
+
+
+def test_free_bytes_are_capped():
+    pool = WorkspacePool(max_bytes=3 * 800)
+    arrays = [pool.acquire((i + 1, 100)) for i in range(3)]
+    for array in arrays:
+        pool.release(array)
+    # 800 + 1600 fit, adding 2400 more evicts the oldest buffers until the total fits again
+    assert pool.free_bytes <= pool.max_bytes
+    assert pool.acquire((3, 100)) is arrays[2]
+    assert pool.acquire((1, 100)) is not arrays[0]
+
+
+def test_large_buffers_are_not_pooled():
+    pool = WorkspacePool(max_buffer_bytes=1000)
+    small, large = pool.acquire(100), pool.acquire(200)
+    pool.release(small)
+    pool.release(large)
+    assert pool.free_bytes == small.nbytes
+    assert pool.acquire(200) is not large
+
+
+def test_zero_shapes_turns_pooling_off():
+    pool = WorkspacePool(max_shapes=0)
+    array = pool.acquire(5)
+    pool.release(array)
+    assert pool.free_bytes == 0
+    assert pool.acquire(5) is not array
+
+
+def test_concurrent_acquire_and_release():
+    pool = WorkspacePool(max_bytes=10 * 800)
+
+    def work():
+        for i in range(200):
+            array = pool.acquire((i % 5 + 1, 100))
+            pool.release(array)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.free_bytes == sum(array.nbytes for buffers in pool.free.values() for array in buffers)
+    assert pool.free_bytes <= pool.max_bytes
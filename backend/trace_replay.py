@@ -0,0 +1,127 @@
+"""
+Replay a solve trace recorded with LP_TRACE_DIR.
+
+Loads a .lptrace.npz file written by the /solve route, prints its slowest pivots, then solves
+the recorded model again with tracing on and walks both pivot paths side by side. Pivot rules
+are deterministic, so the same engine must take exactly the recorded path; the first pivot that
+differs (row, entering or leaving column) is reported together with the recorded and replayed
+objective. Per-pivot timings of both runs are compared.
+
+--method and --dtype re-solve with another engine to compare it against the recording; the
+path is then expected to differ, but the outcome still has to match. The replay exits with
+status 1 when the outcome differs, when the path diverges on the recorded engine, or when it
+is more than --max-slowdown times slower, so it works with `git bisect run`:
+
+    python trace_replay.py traces/3f2a9c0d1e4b5a6f.lptrace.npz
+    python trace_replay.py traces/3f2a9c0d1e4b5a6f.lptrace.npz --dtype float32
+    git bisect run python trace_replay.py traces/3f2a9c0d1e4b5a6f.lptrace.npz --max-slowdown 2
+"""
+import argparse
+import sys
+
+from linear_programing_solver import LinearProgrammingSolver
+from request_schema import parse_request
+from solve_trace import read_trace
+
+
+def replay(model, method, dtype, precision, repeat):
+    """Solve `model` `repeat` times with tracing on and return the trace, keeping the fastest time of every pivot."""
+    best = None
+    for _ in range(repeat):
+        trace = LinearProgrammingSolver(model.objective, model.constraints, model.rhs, model.constraint_types,
+                                        model.var_restrictions, method=method, type=model.optimization,
+                                        out_of_core=model.out_of_core, precision=precision, dtype=dtype,
+                                        trace=True).solve()["trace"]
+        if best is not None and len(best["seconds"]) == len(trace["seconds"]):
+            trace["seconds"] = [min(a, b) for a, b in zip(best["seconds"], trace["seconds"])]
+        best = trace
+    return best
+
+
+def first_divergence(recorded, replayed):
+    """Index of the first pivot where the two paths differ, or None when they are identical."""
+    for index, (old, new) in enumerate(zip(recorded, replayed)):
+        if old != new:
+            return index
+    if len(recorded) != len(replayed):
+        return min(len(recorded), len(replayed))
+    return None
+
+
+def same_outcome(recorded, replayed, tolerance):
+    if recorded["error"] != replayed["error"]:
+        return False
+    if recorded["optimal_value"] is None or replayed["optimal_value"] is None:
+        return recorded["optimal_value"] == replayed["optimal_value"]
+    scale = max(1.0, abs(recorded["optimal_value"]))
+    return abs(recorded["optimal_value"] - replayed["optimal_value"]) <= tolerance * scale
+
+
+def describe_pivot(pivot):
+    row, entering, leaving = pivot
+    return f"row {row}: column {entering} enters, column {leaving} leaves"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="A .lptrace.npz file")
+    parser.add_argument("--method", help="Re-solve with this method instead of the recorded one")
+    parser.add_argument("--dtype", help="Re-solve in this dtype instead of the recorded one")
+    parser.add_argument("--repeat", type=int, default=3, help="Replays; the fastest time of every pivot is kept")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest pivots to report")
+    parser.add_argument("--tolerance", type=float, default=1e-7, help="Relative tolerance on the objective value")
+    parser.add_argument("--max-slowdown", type=float,
+                        help="Fail when the replay takes more than this many times the recorded pivot time")
+    args = parser.parse_args()
+
+    request, recorded = read_trace(args.trace)
+    model = parse_request(request)
+    method = args.method or recorded["method"]
+    dtype = args.dtype or recorded["dtype"]
+    same_engine = (method, dtype) == (recorded["method"], recorded["dtype"])
+
+    pivots, seconds = recorded["pivots"], recorded["seconds"]
+    print(f"{args.trace}: {len(model.constraints)} x {len(model.objective)} model, {recorded['method']} "
+          f"in {recorded['dtype']}, {len(pivots)} pivots in {sum(seconds) * 1000:.3f} ms")
+    slowest = sorted(range(len(pivots)), key=lambda index: -seconds[index])[:args.top]
+    for index in slowest:
+        print(f"  pivot {index:>6} {seconds[index] * 1000:>10.3f} ms  {describe_pivot(pivots[index])}")
+
+    replayed = replay(model, method, dtype, recorded["precision"], max(args.repeat, 1))
+    failures = []
+    print(f"replay: {method} in {dtype}, {len(replayed['pivots'])} pivots "
+          f"in {sum(replayed['seconds']) * 1000:.3f} ms")
+    divergence = first_divergence(pivots, replayed["pivots"])
+    if divergence is None:
+        print("pivot path: identical")
+        ratios = sorted((new / old, index) for index, (old, new) in enumerate(zip(seconds, replayed["seconds"]))
+                        if old > 0)
+        for ratio, index in ratios[::-1][:args.top]:
+            print(f"  pivot {index:>6} {seconds[index] * 1000:>10.3f} -> {replayed['seconds'][index] * 1000:.3f} ms "
+                  f"({ratio:.2f}x)")
+    else:
+        recorded_pivot = describe_pivot(pivots[divergence]) if divergence < len(pivots) else "path ended"
+        replayed_pivot = (describe_pivot(replayed["pivots"][divergence]) if divergence < len(replayed["pivots"])
+                          else "path ended")
+        print(f"pivot path: diverges at pivot {divergence}")
+        print(f"  recorded: {recorded_pivot}")
+        print(f"  replayed: {replayed_pivot}")
+        if same_engine:
+            failures.append(f"pivot path diverges from the recording at pivot {divergence}")
+
+    print(f"outcome: recorded {recorded['error'] or recorded['optimal_value']}, "
+          f"replayed {replayed['error'] or replayed['optimal_value']}")
+    if not same_outcome(recorded, replayed, args.tolerance):
+        failures.append("the replayed outcome differs from the recording")
+    if args.max_slowdown is not None and sum(seconds) > 0:
+        ratio = sum(replayed["seconds"]) / sum(seconds)
+        if ratio > args.max_slowdown:
+            failures.append(f"{ratio:.2f}x slower than the recording (limit {args.max_slowdown}x)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class WorkspacePool:
+    """
+    Free lists of preallocated NumPy buffers keyed by shape and dtype.
+
+    Solves take their tableau and scratch buffers from the pool and give them back when they
+    finish, so repeated solves of same-shaped models reuse memory instead of allocating it.
+    Buffers handed out by `acquire` are zero-filled, like np.zeros. The pool is thread-safe;
+    it keeps at most `max_buffers` free buffers per key and `max_shapes` keys, and evicts the
+    least recently used buffers once the free buffers hold more than `max_bytes`. Buffers
+    larger than `max_buffer_bytes` are never kept, so one big solve cannot pin its tableau.
+    """
+
+    def __init__(self, max_shapes=64, max_buffers=8, max_bytes=32 * 2**20, max_buffer_bytes=8 * 2**20):
+        """
+        Args:
+            max_shapes: Number of distinct (shape, dtype) keys kept
+            max_buffers: Number of free buffers kept per key
+            max_bytes: Total size of the free buffers kept
+            max_buffer_bytes: Size above which a released buffer is dropped instead of kept
+        """
+        self.max_shapes = max_shapes
+        self.max_buffers = max_buffers
+        self.max_bytes = max_bytes
+        self.max_buffer_bytes = max_buffer_bytes
+        self.free = OrderedDict()
+        self.free_bytes = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.float64):
+        """Return a zero-filled array of `shape` and `dtype`, reusing a free one when available."""
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        key = (shape, np.dtype(dtype).str)
+        with self.lock:
+            buffers = self.free.get(key)
+            array = buffers.pop() if buffers else None
+            if array is not None:
+                self.free_bytes -= array.nbytes
+                if buffers:
+                    self.free.move_to_end(key)
+                else:
+                    del self.free[key]
+        if array is None:
+            return np.zeros(shape, dtype=dtype)
+        array.fill(0)
+        return array
+
+    def release(self, array):
+        """Give an array obtained from `acquire` back to the pool."""
+        if array.nbytes > min(self.max_buffer_bytes, self.max_bytes):
+            return
+        key = (array.shape, array.dtype.str)
+        with self.lock:
+            buffers = self.free.setdefault(key, [])
+            self.free.move_to_end(key)
+            if len(buffers) < self.max_buffers:
+                buffers.append(array)
+                self.free_bytes += array.nbytes
+            # Evict from the least recently used keys until both caps hold
+            while self.free and (len(self.free) > self.max_shapes or self.free_bytes > self.max_bytes):
+                oldest_key, oldest = next(iter(self.free.items()))
+                if oldest:
+                    self.free_bytes -= oldest.pop(0).nbytes
+                if not oldest:
+                    del self.free[oldest_key]
+
+
+# Shared by every solver in the process; LP_WORKSPACE_POOL_SHAPES=0 or LP_WORKSPACE_POOL_BYTES=0 turns pooling off
+workspace_pool = WorkspacePool(max_shapes=int(os.environ.get('LP_WORKSPACE_POOL_SHAPES', 64)),
+                               max_bytes=int(os.environ.get('LP_WORKSPACE_POOL_BYTES', 32 * 2**20)),
+                               max_buffer_bytes=int(os.environ.get('LP_WORKSPACE_POOL_BUFFER_BYTES', 8 * 2**20)))
@@ -0,0 +1,168 @@
+import React, { useEffect, useMemo, useRef, useState } from "react";
+
+// Every step of a solve has the same number of rows, so each card gets the same fixed height
+const ROW_HEIGHT = 37;
+const CARD_CHROME = 96;
+const CARD_GAP = 32;
+const VIEWPORT_HEIGHT = 720;
+const OVERSCAN = 2;
+
+// Parse a step string once: header labels, basic-variable labels and the numbers as a Float64Array
+export const parseStep = (step, splitRow) => {
+  const rows = step.split("\n").filter((row) => row.trim() !== "");
+  const header = splitRow(rows[0]);
+  const bodyRows = rows.slice(1).map(splitRow);
+  const columns = header.length - 1;
+  const values = new Float64Array(bodyRows.length * columns);
+  bodyRows.forEach((row, i) => {
+    for (let j = 0; j < columns; j++) {
+      values[i * columns + j] = parseFloat(row[j + 1]);
+    }
+  });
+  return { header, labels: bodyRows.map((row) => row[0]), values, columns };
+};
+
+const StepTable = ({ parsed }) => (
+  <table className="w-full border border-gray-300 text-sm">
+    <thead className="bg-indigo-500 text-white">
+      <tr>
+        {parsed.header.map((cell, i) => (
+          <th key={i} className="px-3 py-2 border">
+            {cell}
+          </th>
+        ))}
+      </tr>
+    </thead>
+    <tbody>
+      {parsed.labels.map((label, i) => (
+        <tr
+          key={i}
+          className="border border-gray-300 odd:bg-gray-50 hover:bg-gray-200"
+        >
+          <td className="px-3 py-2 border text-center">{label}</td>
+          {Array.from(
+            parsed.values.subarray(i * parsed.columns, (i + 1) * parsed.columns),
+            (value, j) => (
+              <td key={j} className="px-3 py-2 border text-center">
+                {value.toFixed(2)}
+              </td>
+            )
+          )}
+        </tr>
+      ))}
+    </tbody>
+  </table>
+);
+
+/*
+ * Virtualized list of tableau steps.
+ *
+ * Only the cards in (or just around) the scroll viewport are mounted. `steps` is the first page
+ * returned with the solution and `total` the backend's steps_total; missing pages are requested
+ * through `loadSteps(offset, limit)` as they scroll into view, in pages the size of the first one.
+ * Each step is parsed once and cached.
+ */
+const VirtualSteps = ({ steps, total, loadSteps, splitRow }) => {
+  // Loaded steps belong to the solve whose first page they were merged into; a new solve starts over
+  const [pages, setPages] = useState({ source: steps, loaded: steps });
+  const loaded = pages.source === steps ? pages.loaded : steps;
+  const [scrollTop, setScrollTop] = useState(0);
+  const viewport = useRef(null);
+  const parsedCache = useMemo(() => new Map(), [steps]);
+  const pendingPages = useMemo(() => new Set(), [steps]);
+
+  useEffect(() => {
+    if (viewport.current) {
+      viewport.current.scrollTop = 0;
+    }
+  }, [steps]);
+
+  const parsedAt = (index) => {
+    if (loaded[index] === undefined) {
+      return null;
+    }
+    if (!parsedCache.has(index)) {
+      parsedCache.set(index, parseStep(loaded[index], splitRow));
+    }
+    return parsedCache.get(index);
+  };
+
+  const itemHeight = useMemo(() => {
+    const rows = steps.length ? parseStep(steps[0], splitRow).labels.length : 0;
+    return CARD_CHROME + (rows + 1) * ROW_HEIGHT + CARD_GAP;
+  }, [steps, splitRow]);
+
+  const start = Math.max(Math.floor(scrollTop / itemHeight) - OVERSCAN, 0);
+  const end = Math.min(
+    Math.ceil((scrollTop + VIEWPORT_HEIGHT) / itemHeight) + OVERSCAN,
+    total
+  );
+
+  useEffect(() => {
+    if (!loadSteps || !steps.length) {
+      return;
+    }
+    const pageSize = steps.length;
+    for (let page = Math.floor(start / pageSize); page * pageSize < end; page++) {
+      const offset = page * pageSize;
+      if (loaded[offset] !== undefined || pendingPages.has(page)) {
+        continue;
+      }
+      pendingPages.add(page);
+      loadSteps(offset, pageSize)
+        .then((pageSteps) => {
+          setPages((previous) => {
+            const next = (previous.source === steps ? previous.loaded : steps).slice();
+            pageSteps.forEach((step, i) => {
+              next[offset + i] = step;
+            });
+            return { source: steps, loaded: next };
+          });
+        })
+        .catch((error) => console.error("Error loading steps:", error))
+        .finally(() => pendingPages.delete(page));
+    }
+  }, [start, end, loaded, loadSteps, steps, pendingPages]);
+
+  const visible = [];
+  for (let index = start; index < end; index++) {
+    const parsed = parsedAt(index);
+    visible.push(
+      <div
+        key={index}
+        className="bg-white shadow-md rounded-lg p-4 overflow-x-auto"
+        style={{
+          position: "absolute",
+          top: index * itemHeight,
+          left: 0,
+          right: 0,
+          height: itemHeight - CARD_GAP,
+        }}
+      >
+        <h3 className="text-lg font-semibold mb-2 text-gray-700">
+          Step {index + 1}
+        </h3>
+        {parsed ? (
+          <StepTable parsed={parsed} />
+        ) : (
+          <p className="text-gray-500">Loading step...</p>
+        )}
+      </div>
+    );
+  }
+
+  return (
+    <div
+      ref={viewport}
+      className="max-w-4xl mx-auto"
+      style={{ height: Math.min(VIEWPORT_HEIGHT, total * itemHeight), overflowY: "auto" }}
+      onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+    >
+      <div style={{ position: "relative", height: total * itemHeight }}>
+        {visible}
+      </div>
+    </div>
+  );
+};
+
+export default VirtualSteps;
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import solveLinearProgramming from "../services/getSolution";
+import solveModel from "../services/solveModel";
 import GoalSolution from "../components/GoalSolution";
 import GoalSteps from "../components/GoalSteps";
 
@@ -156,6 +156,7 @@ const GoalProgrammingPage = () => {
   const [constraints, setConstraints] = useState([""]);
   const [variableTypes, setVariableTypes] = useState({});
   const [result, setResult] = useState(null);
+  const [loadSteps, setLoadSteps] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [variables, setVariables] = useState([]);
@@ -225,9 +226,11 @@ const GoalProgrammingPage = () => {
         goals_directions: goalDirections,
       };
       console.log(DataToSend);
-      const apiResult = await solveLinearProgramming(DataToSend);
+      // Small models are solved in the browser, later pages of steps come from wherever it was solved
+      const solved = await solveModel(DataToSend);
       console.log("get");
-      setResult(apiResult);
+      setLoadSteps(() => solved.loadSteps);
+      setResult(solved.result);
     } catch (error) {
       console.error("Error during submission:", error);
       setError("An error occurred while solving the problem.");
@@ -235,6 +238,7 @@ const GoalProgrammingPage = () => {
       setLoading(false);
     }
   };
+
   return (
     <div className="min-h-screen bg-gradient-to-br from-indigo-50 to-blue-100">
       <div className="max-w-4xl mx-auto">
@@ -270,7 +274,7 @@ const GoalProgrammingPage = () => {
         </button>
 
         {result && <GoalSolution data={result} />}
-        {result && <GoalSteps data={result} />}
+        {result && <GoalSteps data={result} loadSteps={loadSteps} />}
       </div>
     </div>
   );
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import solveLinearProgramming from "../services/getSolution";
+import solveModel from "../services/solveModel";
 import Solution from "../components/Solution";
 import Steps from "../components/Steps";
 
@@ -99,6 +99,8 @@ const Constraints = ({
             >
               <option value="non-negative">Non-negative</option>
               <option value="unrestricted">Unrestricted</option>
+              <option value="integer">Integer</option>
+              <option value="binary">Binary</option>
             </select>
           </div>
         ))}
@@ -118,6 +120,8 @@ const MethodSelection = ({ setMethod }) => (
     >
       <option value="big-m">Big M Method</option>
       <option value="two-phase">Two Phase Method</option>
+      <option value="auto-race">Auto (fastest method)</option>
+      <option value="decomposition">Decomposition (block-angular)</option>
     </select>
   </div>
 );
@@ -175,6 +179,7 @@ const LinearProgrammingPage = () => {
   const [variableTypes, setVariableTypes] = useState({});
   const [method, setMethod] = useState("big-m");
   const [result, setResult] = useState(null);
+  const [loadSteps, setLoadSteps] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [variables, setVariables] = useState([]);
@@ -205,7 +210,9 @@ const LinearProgrammingPage = () => {
         (c) => c.coefficients
       );
       const varRestrictions = variables.map((variable) =>
-        variableTypes[variable] === "unrestricted" ? "unrestricted" : ">=0"
+        ["unrestricted", "integer", "binary"].includes(variableTypes[variable])
+          ? variableTypes[variable]
+          : ">=0"
       );
 
       if (
@@ -228,9 +235,11 @@ const LinearProgrammingPage = () => {
         method: method,
       };
       console.log(DataToSend);
-      const apiResult = await solveLinearProgramming(DataToSend);
+      // Small models are solved in the browser, later pages of steps come from wherever it was solved
+      const solved = await solveModel(DataToSend);
       console.log("get");
-      setResult(apiResult);
+      setLoadSteps(() => solved.loadSteps);
+      setResult(solved.result);
     } catch (error) {
       console.error("Error during submission:", error);
       setError("An error occurred while solving the problem.");
@@ -282,7 +291,7 @@ const LinearProgrammingPage = () => {
         </button>
 
         {result && <Solution data={result} />}
-        {result && <Steps data={result} />}
+        {result && <Steps data={result} loadSteps={loadSteps} />}
       </div>
     </div>
   );
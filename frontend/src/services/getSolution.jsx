@@ -2,9 +2,16 @@ import axios from 'axios';
 
 const API_URL = 'http://localhost:5000/solve';
 
-const solveLinearProgramming = async (data) => {
+// Steps come back one page at a time; the step viewers request further pages as they scroll
+export const STEPS_PAGE_SIZE = 50;
+
+const solveLinearProgramming = async (data, stepsOffset = 0, stepsLimit = STEPS_PAGE_SIZE) => {
     try {
         const response = await axios.post(API_URL, data, {
+            params: {
+                steps_offset: stepsOffset,
+                steps_limit: stepsLimit
+            },
             headers: {
                 'Content-Type': 'application/json'
             }
@@ -16,4 +23,10 @@ const solveLinearProgramming = async (data) => {
     }
 };
 
-export default solveLinearProgramming;
\ No newline at end of file
+// The backend caches recent results, so fetching a later page of the same model does not re-solve it
+export const fetchSteps = async (data, offset, limit) => {
+    const result = await solveLinearProgramming(data, offset, limit);
+    return result.steps;
+};
+
+export default solveLinearProgramming;
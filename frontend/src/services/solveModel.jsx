@@ -0,0 +1,65 @@
+import solveLinearProgramming, { fetchSteps, STEPS_PAGE_SIZE } from './getSolution';
+
+// Models up to this many coefficients are solved in the browser; larger ones go to the backend
+export const LOCAL_SOLVE_MAX_CELLS = 400;
+
+const LOCAL_METHODS = ['simplex', 'big-m', 'two-phase'];
+
+// The client-side solver covers plain LP and goal programming without unrestricted variables
+const solvesLocally = (data) => {
+    if (typeof Worker === 'undefined') {
+        return false;
+    }
+    if (data.method === 'goal') {
+        const cells = data.constraints_coeffs.length + data.goals_coeffs.length;
+        const width = (data.goals_coeffs[0] || data.constraints_coeffs[0] || []).length;
+        return !(data.unrestricted_vars || []).length && cells * width <= LOCAL_SOLVE_MAX_CELLS;
+    }
+    return LOCAL_METHODS.includes(data.method) &&
+        !data.iis &&
+        data.var_restrictions.every((res) => res === '>=0' || res === 'unrestricted') &&
+        data.constraints.length * data.objective.length <= LOCAL_SOLVE_MAX_CELLS;
+};
+
+const solveInWorker = (data) => new Promise((resolve, reject) => {
+    const worker = new Worker(new URL('../solver/simplexWorker.js', import.meta.url));
+    worker.onmessage = (event) => {
+        worker.terminate();
+        if (event.data.error) {
+            reject(new Error(event.data.error));
+        } else {
+            resolve(event.data.result);
+        }
+    };
+    worker.onerror = (error) => {
+        worker.terminate();
+        reject(error);
+    };
+    worker.postMessage(data);
+});
+
+/*
+ * Solve a model, in a Web Worker when it is small enough and on the backend otherwise.
+ *
+ * Resolves to { result, loadSteps }: `result` has the same shape as the backend's response (first
+ * page of steps plus steps_total) and `loadSteps(offset, limit)` returns a later page of steps, sliced
+ * from the local result or fetched from the backend. A failing local solve falls back to the backend.
+ */
+const solveModel = async (data) => {
+    if (solvesLocally(data)) {
+        try {
+            const result = await solveInWorker(data);
+            const steps = result.steps;
+            return {
+                result: { ...result, steps: steps.slice(0, STEPS_PAGE_SIZE), steps_total: steps.length },
+                loadSteps: async (offset, limit) => steps.slice(offset, offset + limit)
+            };
+        } catch (error) {
+            console.error('Local solve failed, using the backend:', error);
+        }
+    }
+    const result = await solveLinearProgramming(data);
+    return { result, loadSteps: (offset, limit) => fetchSteps(data, offset, limit) };
+};
+
+export default solveModel;
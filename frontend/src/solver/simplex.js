@@ -0,0 +1,711 @@
+// Client-side port of backend/linear_programing_solver.py (simplex, big-M, two-phase) and the
+// preemptive goal programming solver. Results and step strings follow the backend's format, so
+// the Solution and Steps components cannot tell which side solved the model.
+
+const TOLERANCE = 1e-9;
+const BIG_M = 1e2;
+
+const argmin = (values) => {
+  let best = 0;
+  for (let i = 1; i < values.length; i++) {
+    if (values[i] < values[best]) {
+      best = i;
+    }
+  }
+  return best;
+};
+
+// Python's f"{x:.2f}": keeps the sign of negative zero and rounds exact ties to even. A double can
+// only sit exactly halfway between two cents at an odd multiple of 1/8, where toFixed would round up.
+const fixed2 = (x) => {
+  if (Object.is(x, -0)) {
+    return "-0.00";
+  }
+  if (Number.isInteger(x * 8) && !Number.isInteger(x * 4)) {
+    const floor = Math.floor(x * 100);
+    return ((floor % 2 === 0 ? floor : floor + 1) / 100).toFixed(2);
+  }
+  return x.toFixed(2);
+};
+
+const zerosTableau = (rows, columns) =>
+  Array.from({ length: rows }, () => new Float64Array(columns));
+
+const pivot = (tableau, pivotRow, pivotCol) => {
+  const pivotValues = tableau[pivotRow];
+  const pivotElement = pivotValues[pivotCol];
+  for (let k = 0; k < pivotValues.length; k++) {
+    pivotValues[k] /= pivotElement;
+  }
+  tableau.forEach((row, i) => {
+    if (i === pivotRow) {
+      return;
+    }
+    const factor = row[pivotCol];
+    for (let k = 0; k < row.length; k++) {
+      row[k] -= factor * pivotValues[k];
+    }
+  });
+};
+
+const errorResult = (error, steps) => ({
+  solution: null,
+  optimal_value: null,
+  error,
+  steps,
+});
+
+class LinearProgrammingSolver {
+  constructor(objective, constraints, rhs, constraintTypes, varRestrictions, method = "simplex", type = "max") {
+    this.type = type.toLowerCase();
+    this.objective = objective.map((value) => (this.type === "min" ? -value : value));
+    this.constraints = constraints;
+    this.rhs = rhs;
+    this.constraintTypes = constraintTypes;
+    this.varRestrictions = varRestrictions;
+    this.method = method.toLowerCase();
+    this.steps = [];
+    this.basicVars = constraints.map((_, i) => `s${i + 1}`);
+    this.unboundedColumn = null;
+  }
+
+  solve() {
+    if (this.method === "simplex") {
+      return this.varRestrictions.includes("unrestricted")
+        ? this.simplexMethodWithUnrestrictedVariables()
+        : this.simplexMethod();
+    }
+    if (this.method === "big-m") {
+      return this.bigMMethod();
+    }
+    if (this.method === "two-phase") {
+      return this.twoPhaseMethod();
+    }
+    throw new Error("Invalid method selected");
+  }
+
+  logStep(tableau, headers) {
+    let table = "Basic\t" + headers.join("\t") + "\n";
+    tableau.forEach((row, i) => {
+      let values = Array.from(row);
+      if (i === 0 && this.type === "min") {
+        values = values.map((x) => (Math.abs(x) <= 1e-10 ? x : -x));
+      }
+      const label = i === 0 ? "Z" : this.basicVars[i - 1];
+      table += label + "\t" + values.map(fixed2).join("\t") + "\n";
+    });
+    this.steps.push(table);
+  }
+
+  logActiveStep(tableau, headers, active) {
+    // Retired columns stay allocated in the tableau but are left out of the logged step
+    const keep = [...active, true];
+    const columns = keep.map((flag, j) => (flag ? j : -1)).filter((j) => j >= 0);
+    this.logStep(
+      tableau.map((row) => columns.map((j) => row[j])),
+      headers.filter((_, j) => keep[j])
+    );
+  }
+
+  setLayout(varColumns, slackColumns, dualColumns, rowSigns = null) {
+    this.varColumns = varColumns;
+    this.slackColumns = slackColumns;
+    this.dualColumns = dualColumns;
+    this.rowSigns = rowSigns || slackColumns.map(() => 1);
+  }
+
+  extractResults(tableau, basis, columnCosts) {
+    const values = new Float64Array(tableau[0].length - 1);
+    basis.forEach((col, i) => {
+      values[col] = tableau[i + 1][tableau[i + 1].length - 1];
+    });
+    const solution = this.varColumns.map((columns) =>
+      columns.reduce((sum, [col, sign]) => sum + sign * values[col], 0)
+    );
+    const slacks = this.slackColumns.map((col) => (col === null ? 0 : values[col]));
+    const duals = this.dualColumns.map(([col, coefficient], i) => {
+      const dual = ((tableau[0][col] + columnCosts[col]) / coefficient) * this.rowSigns[i];
+      return this.type === "min" ? -dual : dual;
+    });
+    return { solution, slacks, duals };
+  }
+
+  unboundedResult(tableau, basis, pivotCol) {
+    const direction = new Float64Array(tableau[0].length - 1);
+    direction[pivotCol] = 1;
+    basis.forEach((col, i) => {
+      direction[col] = -tableau[i + 1][pivotCol];
+    });
+    const ray = this.varColumns.map((columns) =>
+      columns.reduce((sum, [col, sign]) => sum + sign * direction[col], 0)
+    );
+    return { ...errorResult("Unbounded solution", this.steps), ray };
+  }
+
+  optimalValue(tableau) {
+    const value = tableau[0][tableau[0].length - 1];
+    return this.type === "min" ? -value : value;
+  }
+
+  simplexLoop(tableau, headers, basis) {
+    // Returns null when optimal, otherwise the unbounded result
+    const last = tableau[0].length - 1;
+    while (tableau[0].slice(0, last).some((x) => x < -TOLERANCE)) {
+      const pivotCol = argmin(tableau[0].slice(0, last));
+      const validRatios = tableau
+        .slice(1)
+        .map((row) => (row[pivotCol] > TOLERANCE ? row[last] / row[pivotCol] : Infinity));
+      const pivotRow = argmin(validRatios) + 1;
+      if (tableau[pivotRow][pivotCol] <= TOLERANCE) {
+        return this.unboundedResult(tableau, basis, pivotCol);
+      }
+      pivot(tableau, pivotRow, pivotCol);
+      basis[pivotRow - 1] = pivotCol;
+      this.basicVars[pivotRow - 1] = headers[pivotCol];
+      this.logStep(tableau, headers);
+    }
+    return null;
+  }
+
+  simplexMethod() {
+    const numVars = this.objective.length;
+    const numConstraints = this.constraints.length;
+    const tableau = zerosTableau(numConstraints + 1, numVars + numConstraints + 1);
+    this.constraints.forEach((row, i) => {
+      tableau[i + 1].set(row);
+      tableau[i + 1][numVars + i] = 1;
+      tableau[i + 1][numVars + numConstraints] = this.rhs[i];
+    });
+    this.objective.forEach((value, j) => {
+      tableau[0][j] = -value;
+    });
+
+    const headers = [
+      ...this.objective.map((_, i) => `x${i + 1}`),
+      ...this.constraints.map((_, i) => `s${i + 1}`),
+      "RHS",
+    ];
+    const basis = this.constraints.map((_, i) => numVars + i);
+    this.setLayout(
+      this.objective.map((_, j) => [[j, 1]]),
+      this.constraints.map((_, i) => numVars + i),
+      this.constraints.map((_, i) => [numVars + i, 1])
+    );
+    this.logStep(tableau, headers);
+
+    const unbounded = this.simplexLoop(tableau, headers, basis);
+    if (unbounded) {
+      return unbounded;
+    }
+    const costs = [...this.objective, ...new Array(numConstraints).fill(0)];
+    const { solution, slacks, duals } = this.extractResults(tableau, basis, costs);
+    return { solution, optimal_value: this.optimalValue(tableau), duals, slacks, steps: this.steps };
+  }
+
+  simplexMethodWithUnrestrictedVariables() {
+    const numVars = this.objective.length;
+    const numConstraints = this.constraints.length;
+    const varMapping = [];
+    const transformedObjective = [];
+    this.objective.forEach((value, i) => {
+      if (this.varRestrictions[i] === "unrestricted") {
+        varMapping.push([transformedObjective.length, transformedObjective.length + 1]);
+        transformedObjective.push(value, -value);
+      } else {
+        varMapping.push([transformedObjective.length]);
+        transformedObjective.push(value);
+      }
+    });
+    const numTransformed = transformedObjective.length;
+
+    const tableau = zerosTableau(numConstraints + 1, numTransformed + numConstraints + 1);
+    this.constraints.forEach((row, i) => {
+      row.forEach((value, j) => {
+        tableau[i + 1][varMapping[j][0]] = value;
+        if (varMapping[j].length > 1) {
+          tableau[i + 1][varMapping[j][1]] = -value;
+        }
+      });
+      tableau[i + 1][numTransformed + i] = 1;
+      tableau[i + 1][numTransformed + numConstraints] = this.rhs[i];
+    });
+    transformedObjective.forEach((value, j) => {
+      tableau[0][j] = -value;
+    });
+
+    const headers = [];
+    for (let i = 0; i < numVars; i++) {
+      if (varMapping[i].length > 1) {
+        headers.push(`x${i + 1}_+`, `x${i + 1}_-`);
+      } else {
+        headers.push(`x${i + 1}`);
+      }
+    }
+    this.constraints.forEach((_, i) => headers.push(`s${i + 1}`));
+    headers.push("RHS");
+    const basis = this.constraints.map((_, i) => numTransformed + i);
+    this.setLayout(
+      varMapping.map((columns) => columns.map((col, k) => [col, k === 0 ? 1 : -1])),
+      this.constraints.map((_, i) => numTransformed + i),
+      this.constraints.map((_, i) => [numTransformed + i, 1])
+    );
+    this.logStep(tableau, headers);
+
+    const unbounded = this.simplexLoop(tableau, headers, basis);
+    if (unbounded) {
+      return unbounded;
+    }
+    const costs = [...transformedObjective, ...new Array(numConstraints).fill(0)];
+    const { solution, slacks, duals } = this.extractResults(tableau, basis, costs);
+    return { solution, optimal_value: this.optimalValue(tableau), duals, slacks, steps: this.steps };
+  }
+
+  buildStandardTableau() {
+    const numVars = this.objective.length;
+    const numConstraints = this.constraints.length;
+    const constraints = this.constraints.map((row) => [...row]);
+    const rhs = [...this.rhs];
+    const constraintTypes = [...this.constraintTypes];
+
+    // Keep every rhs non-negative so the starting basis is feasible
+    for (let i = 0; i < numConstraints; i++) {
+      if (rhs[i] < 0) {
+        constraints[i] = constraints[i].map((value) => -value);
+        rhs[i] = -rhs[i];
+        constraintTypes[i] = { "<=": ">=", ">=": "<=", "=": "=" }[constraintTypes[i]];
+      }
+    }
+
+    // '<=' rows start with their slack basic; only '>=' and '=' rows need an artificial
+    const slackRows = [];
+    const artificialRows = [];
+    constraintTypes.forEach((cType, i) => {
+      if (cType === "<=" || cType === ">=") {
+        slackRows.push(i);
+      }
+      if (cType === ">=" || cType === "=") {
+        artificialRows.push(i);
+      }
+    });
+    const slackStart = numVars;
+    const artificialStart = numVars + slackRows.length;
+
+    const tableau = zerosTableau(numConstraints + 1, artificialStart + artificialRows.length + 1);
+    const last = artificialStart + artificialRows.length;
+    constraints.forEach((row, i) => {
+      tableau[i + 1].set(row);
+      tableau[i + 1][last] = rhs[i];
+    });
+    const basis = new Array(numConstraints).fill(0);
+    const slackColumns = new Array(numConstraints).fill(null);
+    slackRows.forEach((row, i) => {
+      slackColumns[row] = slackStart + i;
+      if (constraintTypes[row] === "<=") {
+        tableau[row + 1][slackStart + i] = 1;
+        basis[row] = slackStart + i;
+      } else {
+        tableau[row + 1][slackStart + i] = -1;
+      }
+    });
+    artificialRows.forEach((row, i) => {
+      tableau[row + 1][artificialStart + i] = 1;
+      basis[row] = artificialStart + i;
+    });
+
+    const headers = [
+      ...this.objective.map((_, i) => `x${i + 1}`),
+      ...slackRows.map((_, i) => `s${i + 1}`),
+      ...artificialRows.map((_, i) => `A${i + 1}`),
+      "RHS",
+    ];
+    this.basicVars = basis.map((col) => headers[col]);
+
+    const dualColumns = new Array(numConstraints).fill(null);
+    constraintTypes.forEach((cType, row) => {
+      if (cType === "<=") {
+        dualColumns[row] = [slackColumns[row], 1];
+      } else if (cType === ">=") {
+        dualColumns[row] = [slackColumns[row], -1];
+      }
+    });
+    artificialRows.forEach((row, i) => {
+      if (constraintTypes[row] === "=") {
+        dualColumns[row] = [artificialStart + i, 1];
+      }
+    });
+    this.unitColumns = [...basis];
+    this.setLayout(
+      this.objective.map((_, j) => [[j, 1]]),
+      slackColumns,
+      dualColumns,
+      this.rhs.map((value) => (value < 0 ? -1 : 1))
+    );
+    return { tableau, headers, basis, artificialStart };
+  }
+
+  standardCosts(tableau, artificialStart = null, artificialCost = 0) {
+    const costs = new Float64Array(tableau[0].length - 1);
+    costs.set(this.objective);
+    if (artificialStart !== null) {
+      costs.fill(artificialCost, artificialStart);
+    }
+    return costs;
+  }
+
+  runPivots(tableau, headers, basis, active, retireStart = null) {
+    // Returns false when the problem is unbounded; columns from retireStart on are retired once they leave the basis
+    const last = tableau[0].length - 1;
+    for (;;) {
+      const reducedCosts = active.map((flag, j) => (flag ? tableau[0][j] : 0));
+      if (!reducedCosts.some((x) => x < -TOLERANCE)) {
+        return true;
+      }
+      const pivotCol = argmin(reducedCosts);
+      const ratios = tableau
+        .slice(1)
+        .map((row) => (row[pivotCol] > TOLERANCE ? row[last] / row[pivotCol] : Infinity));
+      if (ratios.every((ratio) => ratio === Infinity)) {
+        this.unboundedColumn = pivotCol;
+        return false;
+      }
+      const pivotRow = argmin(ratios) + 1;
+      pivot(tableau, pivotRow, pivotCol);
+      const leaving = basis[pivotRow - 1];
+      basis[pivotRow - 1] = pivotCol;
+      this.basicVars[pivotRow - 1] = headers[pivotCol];
+      if (retireStart !== null && leaving >= retireStart) {
+        active[leaving] = false;
+      }
+      this.logActiveStep(tableau, headers, active);
+    }
+  }
+
+  bigMMethod() {
+    const numVars = this.objective.length;
+    const { tableau, headers, basis, artificialStart } = this.buildStandardTableau();
+    const last = tableau[0].length - 1;
+    const active = new Array(last).fill(true);
+
+    this.objective.forEach((value, j) => {
+      tableau[0][j] = -value;
+    });
+    tableau[0].fill(BIG_M, artificialStart, last);
+    this.logActiveStep(tableau, headers, active);
+
+    basis.forEach((col, row) => {
+      if (col >= artificialStart) {
+        for (let k = 0; k <= last; k++) {
+          tableau[0][k] -= BIG_M * tableau[row + 1][k];
+        }
+      }
+    });
+    this.logActiveStep(tableau, headers, active);
+
+    if (!this.runPivots(tableau, headers, basis, active, artificialStart)) {
+      return this.unboundedResult(tableau, basis, this.unboundedColumn);
+    }
+    if (basis.some((col, row) => col >= artificialStart && tableau[row + 1][last] > TOLERANCE)) {
+      return errorResult("Infeasible solution", this.steps);
+    }
+
+    // The objective row still carries the -M cost of every artificial column
+    const { solution, slacks, duals } = this.extractResults(
+      tableau,
+      basis,
+      this.standardCosts(tableau, artificialStart, -BIG_M)
+    );
+    let optimalValue = 0;
+    for (let j = 0; j < numVars; j++) {
+      optimalValue += this.objective[j] * solution[j];
+    }
+    if (this.type === "min") {
+      optimalValue = -optimalValue;
+    }
+    return { solution, optimal_value: optimalValue, duals, slacks, steps: this.steps };
+  }
+
+  farkasCertificate(tableau, artificialStart) {
+    // Phase I duals, read off each row's unit column (its slack for '<=', else its artificial)
+    return this.unitColumns.map((col, i) => {
+      const phaseOneCost = col >= artificialStart ? -1 : 0;
+      return (tableau[0][col] + phaseOneCost) * this.rowSigns[i];
+    });
+  }
+
+  twoPhaseMethod() {
+    const numVars = this.objective.length;
+    const { tableau, headers, basis, artificialStart } = this.buildStandardTableau();
+    const last = tableau[0].length - 1;
+    const active = new Array(last).fill(true);
+
+    // Phase I: minimise the sum of the artificials
+    tableau[0].fill(1, artificialStart, last);
+    this.logActiveStep(tableau, headers, active);
+    basis.forEach((col, row) => {
+      if (col >= artificialStart) {
+        for (let k = 0; k <= last; k++) {
+          tableau[0][k] -= tableau[row + 1][k];
+        }
+      }
+    });
+    this.logActiveStep(tableau, headers, active);
+
+    if (!this.runPivots(tableau, headers, basis, active, artificialStart)) {
+      return this.unboundedResult(tableau, basis, this.unboundedColumn);
+    }
+    if (Math.abs(tableau[0][last]) > TOLERANCE) {
+      return {
+        ...errorResult("Infeasible solution", this.steps),
+        farkas: this.farkasCertificate(tableau, artificialStart),
+      };
+    }
+
+    // Artificials still basic sit at zero: pivot them out, or leave them on redundant rows
+    basis.forEach((col, row) => {
+      if (col >= artificialStart) {
+        const candidate = tableau[row + 1]
+          .slice(0, artificialStart)
+          .findIndex((value) => Math.abs(value) > TOLERANCE);
+        if (candidate >= 0) {
+          pivot(tableau, row + 1, candidate);
+          basis[row] = candidate;
+          this.basicVars[row] = headers[candidate];
+        }
+      }
+    });
+    active.fill(false, artificialStart);
+
+    // Phase II: original costs, priced out against the current basis
+    tableau[0].fill(0);
+    this.objective.forEach((value, j) => {
+      tableau[0][j] = -value;
+    });
+    basis.forEach((col, row) => {
+      const factor = tableau[0][col];
+      if (factor !== 0) {
+        for (let k = 0; k <= last; k++) {
+          tableau[0][k] -= factor * tableau[row + 1][k];
+        }
+      }
+    });
+    this.logActiveStep(tableau, headers, active);
+
+    if (!this.runPivots(tableau, headers, basis, active)) {
+      return this.unboundedResult(tableau, basis, this.unboundedColumn);
+    }
+    const { solution, slacks, duals } = this.extractResults(tableau, basis, this.standardCosts(tableau));
+    return { solution, optimal_value: this.optimalValue(tableau), duals, slacks, steps: this.steps };
+  }
+}
+
+// Python's str(float), which the backend's goal steps use for every number
+const pythonFloat = (x) => {
+  if (Object.is(x, -0)) {
+    return "-0.0";
+  }
+  return Number.isInteger(x) ? x.toFixed(1) : String(x);
+};
+
+// tabulate(..., tablefmt="plain"): every column padded to its widest cell, two spaces apart
+const plainTable = (rows) => {
+  const cells = rows.map((row) => row.map((cell) => (typeof cell === "number" ? pythonFloat(cell) : cell)));
+  const widths = cells[0].map((_, j) => Math.max(...cells.map((row) => row[j].length)));
+  return cells.map((row) => row.map((cell, j) => cell.padEnd(widths[j])).join("  ").trimEnd()).join("\n");
+};
+
+class PreemptiveGoalProgramming {
+  constructor(goalCoeffs, goalValues, constraintCoeffs, constraintValues, goalDirections) {
+    this.goalCoeffs = goalCoeffs;
+    this.goalValues = goalValues;
+    this.constraintCoeffs = constraintCoeffs;
+    this.constraintValues = constraintValues;
+    this.goalDirections = goalDirections;
+    this.numGoals = goalCoeffs.length;
+    this.numConstraints = constraintCoeffs.length;
+    this.numVariables = constraintCoeffs[0].length;
+    this.basicVars = Array.from(
+      { length: this.numConstraints + this.numGoals },
+      (_, i) => i + this.numVariables + this.numGoals
+    );
+    this.tableauSteps = [];
+  }
+
+  createInitialTableau() {
+    const rows = this.numConstraints + this.numGoals;
+    const columns = this.numVariables + 2 * this.numGoals + this.numConstraints;
+    this.tableau = zerosTableau(rows, columns);
+    this.tableauRhs = new Float64Array(rows);
+    for (let i = 0; i < this.numGoals; i++) {
+      this.tableau[i].set(this.goalCoeffs[i]);
+      this.tableau[i][i + this.numVariables] = -1;
+      this.tableau[i][i + this.numVariables + this.numGoals] = 1;
+      this.tableauRhs[i] = this.goalValues[i];
+    }
+    for (let i = 0; i < this.numConstraints; i++) {
+      this.tableau[i + this.numGoals].set(this.constraintCoeffs[i]);
+      this.tableau[i + this.numGoals][i + this.numVariables + 2 * this.numGoals] = 1;
+      this.tableauRhs[i + this.numGoals] = this.constraintValues[i];
+    }
+  }
+
+  setupGoalObjectiveFunctions() {
+    const columns = this.numVariables + 2 * this.numGoals + this.numConstraints;
+    this.goalObjectives = zerosTableau(this.numGoals, columns);
+    this.goalObjectiveRhs = new Float64Array(this.numGoals);
+    for (let i = 0; i < this.numGoals; i++) {
+      const negative = i + this.numVariables;
+      const positive = i + this.numVariables + this.numGoals;
+      if (this.goalDirections[i] === ">=") {
+        this.goalObjectives[i][positive] = -1;
+      } else if (this.goalDirections[i] === "<=") {
+        this.goalObjectives[i][negative] = -1;
+      } else {
+        this.goalObjectives[i][negative] = -1;
+        this.goalObjectives[i][positive] = -1;
+      }
+    }
+  }
+
+  setupVariableNames() {
+    this.variableNames = ["basic"];
+    for (let i = 0; i < this.numVariables; i++) this.variableNames.push(`x${i + 1}`);
+    for (let i = 0; i < this.numGoals; i++) this.variableNames.push(`S${i}+`);
+    for (let i = 0; i < this.numGoals; i++) this.variableNames.push(`S${i}-`);
+    for (let i = 0; i < this.numConstraints; i++) this.variableNames.push(`S${i + this.numGoals}`);
+    this.variableNames.push("RHS");
+  }
+
+  recordTableauStep() {
+    const rows = [this.variableNames];
+    this.goalObjectives.forEach((objective, j) => {
+      rows.push([`Z${j}`, ...objective, this.goalObjectiveRhs[j]]);
+    });
+    this.tableau.forEach((row, i) => {
+      rows.push([this.variableNames[this.basicVars[i] + 1], ...row, this.tableauRhs[i]]);
+    });
+    this.tableauSteps.push(plainTable(rows));
+  }
+
+  sortedCandidates(i) {
+    const objective = this.goalObjectives[i];
+    return Array.from(objective.keys())
+      .filter((j) => objective[j] > TOLERANCE)
+      .sort((a, b) => objective[b] - objective[a]);
+  }
+
+  solve() {
+    this.recordTableauStep();
+    for (let i = 0; i < this.numGoals; i++) {
+      for (let k = 0; k < this.goalObjectives[i].length; k++) {
+        this.goalObjectives[i][k] += this.tableau[i][k];
+      }
+      this.goalObjectiveRhs[i] += this.tableauRhs[i];
+    }
+
+    const numRows = this.numConstraints + this.numGoals;
+    for (let i = 0; i < this.numGoals; i++) {
+      let sortedCols = this.sortedCandidates(i);
+      while (sortedCols.length) {
+        const pivotCol = sortedCols[0];
+        // A pivot must not worsen a higher-priority goal
+        let validPivot = true;
+        for (let j = 0; j < i; j++) {
+          if (this.goalObjectives[j][pivotCol] < 0) {
+            validPivot = false;
+            break;
+          }
+        }
+        if (!validPivot) {
+          sortedCols.shift();
+          continue;
+        }
+
+        const ratios = this.tableau.map((row, j) =>
+          row[pivotCol] > 0 ? this.tableauRhs[j] / row[pivotCol] : Infinity
+        );
+        const pivotRow = argmin(ratios);
+        const pivotRowValues = this.tableau[pivotRow];
+        const pivotElement = pivotRowValues[pivotCol];
+        for (let k = 0; k < pivotRowValues.length; k++) {
+          pivotRowValues[k] /= pivotElement;
+        }
+        this.tableauRhs[pivotRow] /= pivotElement;
+
+        for (let j = 0; j < this.numGoals; j++) {
+          const objective = this.goalObjectives[j];
+          const factor = objective[pivotCol];
+          for (let k = 0; k < objective.length; k++) {
+            objective[k] -= factor * pivotRowValues[k];
+          }
+          this.goalObjectiveRhs[j] -= factor * this.tableauRhs[pivotRow];
+          for (let k = 0; k < objective.length; k++) {
+            if (Math.abs(objective[k]) < TOLERANCE) {
+              objective[k] = 0;
+            }
+          }
+        }
+
+        for (let j = 0; j < numRows; j++) {
+          if (j === pivotRow) {
+            continue;
+          }
+          const row = this.tableau[j];
+          const factor = row[pivotCol];
+          for (let k = 0; k < row.length; k++) {
+            row[k] -= factor * pivotRowValues[k];
+            if (Math.abs(row[k]) < TOLERANCE) {
+              row[k] = 0;
+            }
+          }
+          this.tableauRhs[j] -= factor * this.tableauRhs[pivotRow];
+        }
+
+        this.basicVars[pivotRow] = pivotCol;
+        if (this.goalObjectives[i].every((x) => x <= TOLERANCE)) {
+          break;
+        }
+        sortedCols = this.sortedCandidates(i);
+      }
+      this.recordTableauStep();
+    }
+
+    const solution = new Array(this.numVariables).fill(0);
+    for (let i = 0; i < numRows; i++) {
+      if (this.basicVars[i] < this.numVariables) {
+        solution[this.basicVars[i]] = this.tableauRhs[i];
+      }
+    }
+    return solution;
+  }
+}
+
+// Same method choice as backend/app.py: plain simplex whenever every row is '<='
+export const solveModel = (model) => {
+  if (model.method === "goal") {
+    const solver = new PreemptiveGoalProgramming(
+      model.goals_coeffs,
+      model.goals_values,
+      model.constraints_coeffs,
+      model.constraints_values,
+      model.goals_directions
+    );
+    solver.createInitialTableau();
+    solver.setupGoalObjectiveFunctions();
+    solver.setupVariableNames();
+    const solution = solver.solve();
+    return { optimal_solution: solution, steps: solver.tableauSteps };
+  }
+  const hasInequality = model.constraint_types.some((cType) => cType === ">=" || cType === "=");
+  const solver = new LinearProgrammingSolver(
+    model.objective,
+    model.constraints,
+    model.rhs,
+    model.constraint_types,
+    model.var_restrictions,
+    hasInequality ? model.method : "simplex",
+    model.optimization
+  );
+  return solver.solve();
+};
+
+export { LinearProgrammingSolver, PreemptiveGoalProgramming };
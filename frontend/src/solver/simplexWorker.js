@@ -0,0 +1,13 @@
+import { solveModel } from "./simplex";
+
+// Solves one model per message off the main thread; failures are reported back instead of thrown
+// eslint-disable-next-line no-restricted-globals
+self.onmessage = (event) => {
+  try {
+    // eslint-disable-next-line no-restricted-globals
+    self.postMessage({ result: solveModel(event.data) });
+  } catch (error) {
+    // eslint-disable-next-line no-restricted-globals
+    self.postMessage({ error: error.message });
+  }
+};